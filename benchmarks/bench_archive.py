@@ -0,0 +1,81 @@
+"""
+Benchmark archiving completed tasks to the compressed cold store.
+
+Fills a manager with --tasks tasks, of which --completed-ratio are
+completed, then archives every completed task and reports the time of a
+full listing before and after, the size of the archive on disk, and
+get_task latency for archived tasks both through the LRU cache and from
+disk. --trace-memory also reports the traced memory before and after
+(tracing slows archiving several times over).
+
+Usage:
+    python -m benchmarks.bench_archive [--tasks 200000] [--completed-ratio 0.9] [--reads 2000]
+                                       [--trace-memory]
+"""
+import argparse
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from src.todo.archive import ColdStore
+from src.todo.manager import TodoManager
+
+
+def traced_mib() -> float:
+    if not tracemalloc.is_tracing():
+        return 0.0
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] / 2**20
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--completed-ratio", type=float, default=0.9)
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.trace_memory:
+            tracemalloc.start()
+        manager = TodoManager(archive=ColdStore(directory))
+        manager.add_tasks([(f"Task {i}", f"Description of task number {i}") for i in range(args.tasks)])
+        completed = int(args.tasks * args.completed_ratio)
+        manager.mark_complete_many(range(1, completed + 1))
+        before = traced_mib()
+        listing_before = timed(manager.get_all_tasks)
+
+        # Pretend a day has passed, so every completed task is past a one-hour TTL
+        elapsed = timed(lambda: manager.archive_completed(3600, now=time.time() + 86400))
+        after = traced_mib()
+        tracemalloc.stop()
+        listing_after = timed(manager.get_all_tasks)
+        disk = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+        print(f"archived {completed:,} of {args.tasks:,} tasks in {elapsed:.2f}s "
+              f"({disk / 2**20:.1f} MiB on disk)")
+        if args.trace_memory:
+            print(f"traced memory: {before:.1f} MiB -> {after:.1f} MiB")
+        print(f"get_all_tasks: {listing_before * 1e3:.1f} ms -> {listing_after * 1e3:.1f} ms")
+
+        rng = random.Random(42)
+        ids = [rng.randint(1, completed) for _ in range(args.reads)]
+        cold = timed(lambda: [manager.get_task(task_id) for task_id in ids])
+        warm = timed(lambda: [manager.get_task(task_id) for task_id in ids[-500:]])
+        print(f"archived get_task: {cold / len(ids) * 1e6:.0f} us from disk (random), "
+              f"{warm / 500 * 1e6:.1f} us from the LRU cache")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
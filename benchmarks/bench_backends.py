@@ -0,0 +1,61 @@
+"""
+Run the same workload through each storage backend and compare timings.
+
+Usage:
+    python -m benchmarks.bench_backends [--tasks 100000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.todo.manager import TodoManager
+from src.todo.sqlite_backend import SQLiteBackend
+from src.todo.storage import MemoryBackend
+
+
+def workload(manager: TodoManager, tasks: int) -> dict:
+    """Time each phase of a mixed workload; returns phase -> seconds."""
+    rng = random.Random(7)
+    timings = {}
+
+    def phase(name, fn):
+        start = time.perf_counter()
+        fn()
+        timings[name] = time.perf_counter() - start
+
+    singles = min(tasks, 10_000)
+    phase("add_tasks (bulk)", lambda: manager.add_tasks((f"Task {i}", "bulk") for i in range(tasks)))
+    phase(f"add_task x{singles}", lambda: [manager.add_task(f"Single {i}") for i in range(singles)])
+    ids = [rng.randint(1, tasks) for _ in range(singles)]
+    phase(f"get_task x{singles}", lambda: [manager.get_task(i) for i in ids])
+    phase(f"update_task x{singles}", lambda: [manager.update_task(i, description="edited") for i in ids])
+    phase("mark_complete_many (half)", lambda: manager.mark_complete_many(range(1, tasks // 2)))
+    phase("count(status) x1000", lambda: [manager.count(status="pending") for _ in range(1000)])
+    phase("get_tasks(status, limit=100) x1000",
+          lambda: [manager.get_tasks(status="pending", limit=100) for _ in range(1000)])
+    phase("full ordered scan", lambda: sum(1 for _ in manager.iter_tasks()))
+    phase("delete_many (quarter)", lambda: manager.delete_many(range(tasks // 2, tasks // 2 + tasks // 4)))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="todo-bench-") as directory:
+        results = {
+            "memory": workload(TodoManager(backend=MemoryBackend(), search_index=False), args.tasks),
+            "sqlite": workload(TodoManager(backend=SQLiteBackend(os.path.join(directory, "tasks.db")),
+                                           search_index=False), args.tasks),
+        }
+
+    print(f"{'phase':<38}{'memory':>12}{'sqlite':>12}")
+    for name in results["memory"]:
+        print(f"{name:<38}{results['memory'][name]:>11.3f}s{results['sqlite'][name]:>11.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Multi-threaded stress benchmark for ConcurrentTodoManager.
+
+Reports ops/sec as the thread count grows. Reads only scale with threads on
+a free-threaded CPython build; with the GIL, expect flat throughput. With
+--cas, reads return immutable snapshots (read_task, lock-free once made) and
+writes are compare-and-set updates that retry on a version conflict; the
+conflicts seen are reported.
+
+Usage:
+    python -m benchmarks.bench_concurrency [--tasks 100000] [--ops 200000] [--write-ratio 0.1] [--cas]
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+
+from src.todo.concurrent import ConcurrentTodoManager
+from src.todo.exceptions import TaskNotFoundError, VersionConflictError
+
+
+def worker(manager: ConcurrentTodoManager, ops: int, write_ratio: float, max_id: int, seed: int) -> None:
+    """Run a mix of reads (get_task/count) and writes (add_task/mark_complete)."""
+    rng = random.Random(seed)
+    for i in range(ops):
+        task_id = rng.randint(1, max_id)
+        if rng.random() < write_ratio:
+            if i % 2:
+                manager.add_task(f"Task {seed}-{i}")
+            else:
+                try:
+                    manager.mark_complete(task_id)
+                except TaskNotFoundError:
+                    pass
+        elif i % 10:
+            try:
+                manager.get_task(task_id)
+            except TaskNotFoundError:
+                pass
+        else:
+            manager.count(status="pending")
+
+
+def cas_worker(manager: ConcurrentTodoManager, ops: int, write_ratio: float, max_id: int, seed: int,
+               conflicts: list) -> None:
+    """Run a mix of snapshot reads (read_task) and compare-and-set title updates."""
+    rng = random.Random(seed)
+    for _ in range(ops):
+        task_id = rng.randint(1, max_id)
+        snapshot = manager.read_task(task_id)
+        if rng.random() < write_ratio:
+            while True:
+                try:
+                    manager.update_task(task_id, title=f"Task {seed}-{snapshot.version}",
+                                        expected_version=snapshot.version)
+                    break
+                except VersionConflictError:
+                    conflicts[seed] += 1
+                    snapshot = manager.read_task(task_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--ops", type=int, default=200_000, help="Total operations per run")
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--cas", action="store_true", help="Snapshot reads and compare-and-set writes")
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+
+    for thread_count in args.threads:
+        manager = ConcurrentTodoManager()
+        manager.add_tasks([(f"Task {i}", "") for i in range(args.tasks)])
+        per_thread = args.ops // thread_count
+        conflicts = [0] * thread_count
+        threads = [
+            threading.Thread(target=cas_worker, args=(manager, per_thread, args.write_ratio, args.tasks, seed,
+                                                      conflicts))
+            if args.cas else
+            threading.Thread(target=worker, args=(manager, per_thread, args.write_ratio, args.tasks, seed))
+            for seed in range(thread_count)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        line = f"{thread_count:>3} threads: {per_thread * thread_count / elapsed:,.0f} ops/s"
+        print(line + (f", {sum(conflicts):,} conflicts retried" if args.cas else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark streaming import and export throughput.
+
+Usage:
+    python -m benchmarks.bench_import [--rows 5000000] [--format jsonl]
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+
+from src.todo.manager import TodoManager
+
+
+def write_fixture(path: str, rows: int, fmt: str) -> None:
+    """Write a file of `rows` tasks to import."""
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        if fmt == "csv":
+            writer = csv.writer(handle)
+            writer.writerow(("id", "title", "description", "status"))
+            for i in range(rows):
+                writer.writerow((i, f"Task {i}", "imported", "pending"))
+        else:
+            for i in range(rows):
+                handle.write(json.dumps({"title": f"Task {i}", "description": "imported"}) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--format", choices=("csv", "jsonl"), default="jsonl")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="todo-bench-")
+    source = os.path.join(directory, f"tasks.{args.format}")
+    target = os.path.join(directory, f"export.{args.format}")
+    try:
+        write_fixture(source, args.rows, args.format)
+        manager = TodoManager()
+
+        start = time.perf_counter()
+        manager.import_tasks(source, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        print(f"import: {args.rows / elapsed:,.0f} rows/s ({elapsed:.2f}s for {args.rows:,} rows)")
+
+        start = time.perf_counter()
+        manager.export_tasks(target)
+        elapsed = time.perf_counter() - start
+        print(f"export: {args.rows / elapsed:,.0f} rows/s ({elapsed:.2f}s)")
+    finally:
+        for path in (source, target):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark opening and reading a memory-mapped task snapshot.
+
+Writes a snapshot of --tasks tasks, then reports how long it takes to
+open it as a TodoManager backend, how fast random get_task calls and an
+ordered page are served, and how much resident memory each step adds.
+For comparison, --compare-json also times recovery from a JSON-lines
+snapshot of the same tasks.
+
+Usage:
+    python -m benchmarks.bench_mapped [--tasks 10000000] [--reads 1000] [--compare-json]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.todo.journal import Journal
+from src.todo.manager import TodoManager
+from src.todo.mapped import MappedBackend, write_mapped_snapshot
+from src.todo.models import Priority, Task, TaskStatus
+
+
+def rss_mib() -> float:
+    """Resident memory of this process in MiB (Linux only; 0 elsewhere)."""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return 0.0
+
+
+def generate(count: int):
+    """Yield `count` tasks in ID order without keeping them."""
+    for i in range(1, count + 1):
+        status = TaskStatus.COMPLETED if i % 3 == 0 else TaskStatus.PENDING
+        yield Task.unchecked(i, f"Task {i}", f"Description of task number {i}", status, Priority.NONE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=10_000_000)
+    parser.add_argument("--reads", type=int, default=1000)
+    parser.add_argument("--compare-json", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.map")
+        start = time.perf_counter()
+        write_mapped_snapshot(path, generate(args.tasks), args.tasks + 1)
+        print(f"wrote {args.tasks:,} tasks ({os.path.getsize(path) / 2**20:,.0f} MiB) "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        before = rss_mib()
+        start = time.perf_counter()
+        manager = TodoManager(backend=MappedBackend.open(path), lazy_indexes=True)
+        print(f"open: {(time.perf_counter() - start) * 1e3:.2f} ms, +{rss_mib() - before:.1f} MiB resident")
+
+        rng = random.Random(42)
+        ids = [rng.randint(1, args.tasks) for _ in range(args.reads)]
+        before = rss_mib()
+        start = time.perf_counter()
+        for task_id in ids:
+            manager.get_task(task_id)
+        elapsed = time.perf_counter() - start
+        print(f"get_task: {elapsed / args.reads * 1e6:.1f} us each, "
+              f"+{rss_mib() - before:.1f} MiB resident after {args.reads:,} reads")
+
+        start = time.perf_counter()
+        page = manager.get_tasks(status="completed", after_id=args.tasks // 2, limit=100)
+        print(f"page of {len(page)} completed tasks mid-file: {(time.perf_counter() - start) * 1e3:.2f} ms")
+        manager.close()
+
+        if args.compare_json:
+            journal_dir = os.path.join(directory, "journal")
+            Journal(journal_dir).write_snapshot(generate(args.tasks), args.tasks + 1)
+            start = time.perf_counter()
+            TodoManager(journal=Journal(journal_dir)).close()
+            print(f"JSON snapshot recovery: {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
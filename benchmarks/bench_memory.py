@@ -0,0 +1,74 @@
+"""
+Benchmark memory per task (tracemalloc bytes) for different task layouts.
+
+Usage:
+    python -m benchmarks.bench_memory [--tasks 200000]
+"""
+import argparse
+import json
+import tracemalloc
+from dataclasses import dataclass
+
+from src.todo.manager import TodoManager
+from src.todo.models import Task
+
+
+@dataclass
+class LegacyTask:
+    """The original Task layout: a plain dataclass with a per-instance __dict__."""
+    id: int
+    title: str
+    description: str
+    status: str = "pending"
+
+
+def rows(count: int):
+    """Yield task dicts as decoded from JSON, so every string is a fresh object."""
+    for i in range(count):
+        yield json.loads(json.dumps({
+            "id": i,
+            "title": f"Task {i % 1000}",
+            "description": "imported from backlog",
+            "status": "completed" if i % 3 == 0 else "pending",
+        }))
+
+
+def measure(label: str, count: int, build) -> None:
+    """Print the bytes per task retained by the structure `build` returns."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{label:<40} {(after - before) / count:8.1f} bytes/task")
+    del kept
+
+
+def legacy_tasks(count):
+    return {row["id"]: LegacyTask(**row) for row in rows(count)}
+
+
+def slotted_tasks(count):
+    return {row["id"]: Task.from_dict(row) for row in rows(count)}
+
+
+def manager(count, compact=False):
+    todo_manager = TodoManager(compact=compact)
+    for row in rows(count):
+        todo_manager.add_task(row["title"], row["description"])
+    return todo_manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=200_000)
+    args = parser.parse_args()
+
+    measure("dict of legacy dataclass tasks", args.tasks, legacy_tasks)
+    measure("dict of slotted tasks", args.tasks, slotted_tasks)
+    measure("TodoManager (with indexes)", args.tasks, manager)
+    measure("TodoManager(compact=True)", args.tasks, lambda n: manager(n, compact=True))
+
+
+if __name__ == "__main__":
+    main()
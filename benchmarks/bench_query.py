@@ -0,0 +1,64 @@
+"""
+Benchmark planned list queries against filtering and sorting every task.
+
+Fills a manager with --tasks tasks (half of them completed, every tenth
+about deploying), then times each query through TodoManager.query and
+the way list answered it before: get_all_tasks(), a filter over every
+task, a full sort and a slice. Prints the plan each query was run with.
+
+Usage:
+    python -m benchmarks.bench_query [--tasks 200000] [--repeat 20]
+"""
+import argparse
+import time
+
+from src.todo.manager import TodoManager
+from src.todo.search import tokenize
+
+QUERIES = [
+    ('where status=pending and title~"deploy" order by id desc limit 50',
+     lambda t: t.status == "pending" and any(w.startswith("deploy") for w in tokenize(t.title)),
+     lambda t: -t.id, 50),
+    ("order by id desc limit 50", lambda t: True, lambda t: -t.id, 50),
+    ("where id>=1000 and id<1100", lambda t: 1000 <= t.id < 1100, lambda t: t.id, None),
+    ("where tag=urgent", lambda t: "urgent" in t.tags, lambda t: t.id, None),
+    ("where status=pending order by priority desc limit 10", lambda t: t.status == "pending",
+     lambda t: (-t.priority, -t.id), 10),
+]
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    manager = TodoManager()
+    manager.add_tasks([(f"Deploy build {i}" if i % 10 == 0 else f"Write notes {i}", "")
+                       for i in range(1, args.tasks + 1)])
+    manager.mark_complete_many(range(1, args.tasks + 1, 2))
+    for task_id in range(7, args.tasks + 1, 997):
+        manager.tag_task(task_id, "urgent")
+        manager.set_priority(task_id, task_id % 4)
+
+    for text, matches, key, limit in QUERIES:
+        # Also warms up the indexes (e.g. the search vocabulary merge)
+        assert [t.id for t in manager.query(text)] == [
+            t.id for t in sorted(filter(matches, manager.get_all_tasks()), key=key)[:limit]]
+        planned = timed(lambda: list(manager.query(text)), args.repeat)
+        naive = timed(lambda: sorted(filter(matches, manager.get_all_tasks()), key=key)[:limit], args.repeat)
+        print(f"list {text}")
+        print(f"  planned {planned * 1e3:8.3f} ms   filter+sort {naive * 1e3:8.2f} ms   "
+              f"({naive / planned:,.0f}x)")
+        print("  " + manager.explain(text)[0])
+
+
+if __name__ == "__main__":
+    main()
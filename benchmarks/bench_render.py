@@ -0,0 +1,64 @@
+"""
+Benchmark repeated list output with and without the render cache.
+
+Fills a manager with --tasks tasks and runs "list" in script mode: once
+to fill the cache, again with nothing changed, and again after one task
+changes, counting the writes to the output stream. The same runs without
+a cache are the baseline.
+
+Usage:
+    python -m benchmarks.bench_render [--tasks 100000] [--repeat 10]
+"""
+import argparse
+import io
+import time
+
+from src.todo.main import run_script
+from src.todo.manager import TodoManager
+from src.todo.render import RenderCache
+
+
+class CountingStream(io.StringIO):
+    """A text stream that counts write calls."""
+
+    writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+
+def timed_list(manager: TodoManager, repeat: int) -> tuple:
+    """Return the mean seconds and stream writes of one script-mode list command."""
+    elapsed, writes = 0.0, 0
+    for _ in range(repeat):
+        stream = CountingStream()
+        start = time.perf_counter()
+        run_script(manager, ["list"], stream)
+        elapsed += time.perf_counter() - start
+        writes += stream.writes
+    return elapsed / repeat, writes / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    items = [(f"Task {i}", f"Description of task {i}") for i in range(args.tasks)]
+    for label, cache in (("no cache", None), ("render cache", RenderCache(max_lines=args.tasks))):
+        manager = TodoManager(render_cache=cache)
+        manager.add_tasks(items)
+        cold, _ = timed_list(manager, 1)
+        unchanged, writes = timed_list(manager, args.repeat)
+        changed = 0.0
+        for i in range(args.repeat):
+            manager.update_task(i + 1, title=f"Renamed {i}")
+            changed += timed_list(manager, 1)[0]
+        print(f"{label:>12}: first {cold * 1e3:7.1f} ms   unchanged {unchanged * 1e3:7.2f} ms "
+              f"({writes:.0f} writes)   after one update {changed / args.repeat * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Measure read throughput on 1..N read replicas, and their lag, under write load.
+
+Starts a primary process that preloads tasks and then writes at a steady
+rate, and N replica processes that each follow it over a local socket
+while reading from their own copy as fast as they can. Reports the
+replicas' combined reads/s, how far behind they fell while the writes
+ran (in changes and in seconds), and how long they took to catch up once
+the writes stopped. Reads can only scale up to the number of free cores,
+so run this on a machine with at least N + 1 of them.
+
+Usage:
+    python -m benchmarks.bench_replication [--replicas 1 2 4] [--tasks 20000] [--write-rate 5000] [--duration 3]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import statistics
+import time
+
+from src.todo.changes import ChangeFeed
+from src.todo.manager import TodoManager
+from src.todo.replication import Replica, ReplicationPrimary
+
+# Seconds between the lag samples each replica takes
+SAMPLE_INTERVAL = 0.05
+
+
+def run_primary(conn, tasks: int, write_rate: int, duration: float) -> None:
+    """Primary process: serve replication, write at write_rate for duration once told to."""
+    async def main():
+        loop = asyncio.get_running_loop()
+        manager = TodoManager(changes=ChangeFeed())
+        manager.add_tasks([(f"Task {i}", "preloaded") for i in range(tasks)])
+        primary = ReplicationPrimary(manager, heartbeat_interval=0.1)
+        await primary.start()
+        conn.send(primary.port)
+        await loop.run_in_executor(None, conn.recv)
+
+        rng = random.Random(1)
+        writes = 0
+        start = time.perf_counter()
+        while (elapsed := time.perf_counter() - start) < duration:
+            # Catch up with the schedule, then let the replication connections run
+            for _ in range(int(elapsed * write_rate) - writes):
+                kind = writes % 5
+                if kind < 2:
+                    manager.add_task(f"Written {writes}")
+                elif kind < 4:
+                    manager.update_task(rng.randint(1, tasks), description=f"edit {writes}")
+                else:
+                    manager.set_priority(rng.randint(1, tasks), rng.choice(["low", "medium", "high"]))
+                writes += 1
+            await asyncio.sleep(0.005)
+        conn.send((writes / (time.perf_counter() - start), manager.changes_seq()))
+        await loop.run_in_executor(None, conn.recv)
+        await primary.close()
+
+    asyncio.run(main())
+
+
+def run_replica(conn, port: int, tasks: int, seed: int) -> None:
+    """Replica process: follow the primary, then read as fast as possible and sample the lag."""
+    async def main():
+        loop = asyncio.get_running_loop()
+        replica = Replica(TodoManager(), port=port, retry_interval=0.05)
+        follower = asyncio.create_task(replica.run())
+        while replica.epoch is None:
+            await asyncio.sleep(0.01)
+        conn.send("ready")
+        duration = await loop.run_in_executor(None, conn.recv)
+
+        samples = []
+
+        async def sample():
+            while True:
+                status = replica.status()
+                samples.append((status["lag"], status["seconds_behind"]))
+                await asyncio.sleep(SAMPLE_INTERVAL)
+
+        sampler = asyncio.create_task(sample())
+        manager = replica.manager
+        rng = random.Random(seed)
+        reads = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            for i in range(100):
+                if i % 10 == 0:
+                    manager.get_tasks(status="pending", limit=20)
+                elif i % 10 == 1:
+                    manager.count("pending")
+                else:
+                    manager.get_task(rng.randint(1, tasks))
+            reads += 100
+            # Let the replica apply what has arrived
+            await asyncio.sleep(0)
+        throughput = reads / (time.perf_counter() - start)
+        sampler.cancel()
+
+        final_seq = await loop.run_in_executor(None, conn.recv)
+        start = time.perf_counter()
+        while replica.applied < final_seq:
+            await asyncio.sleep(0.001)
+        catch_up = time.perf_counter() - start
+        follower.cancel()
+        conn.send((throughput, samples, catch_up))
+
+    asyncio.run(main())
+
+
+def measure(replicas: int, tasks: int, write_rate: int, duration: float) -> tuple:
+    """Run one primary and `replicas` replicas; return (writes/s, reads/s, lag samples, catch-up times)."""
+    primary_conn, child = multiprocessing.Pipe()
+    primary = multiprocessing.Process(target=run_primary, args=(child, tasks, write_rate, duration))
+    primary.start()
+    port = primary_conn.recv()
+
+    conns, processes = [], []
+    for i in range(replicas):
+        conn, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=run_replica, args=(child, port, tasks, i))
+        process.start()
+        conns.append(conn)
+        processes.append(process)
+    try:
+        for conn in conns:
+            conn.recv()
+        primary_conn.send("go")
+        for conn in conns:
+            conn.send(duration)
+        writes, final_seq = primary_conn.recv()
+        for conn in conns:
+            conn.send(final_seq)
+        results = [conn.recv() for conn in conns]
+        primary_conn.send("stop")
+    finally:
+        for process in processes + [primary]:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+
+    reads = sum(result[0] for result in results)
+    samples = [sample for result in results for sample in result[1]]
+    return writes, reads, samples, [result[2] for result in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--replicas", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--tasks", type=int, default=20_000, help="Tasks preloaded on the primary")
+    parser.add_argument("--write-rate", type=int, default=5000, help="Writes per second on the primary")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds of reads and writes per run")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.tasks:,} tasks, {args.write_rate:,} writes/s target")
+    baseline = None
+    for replicas in args.replicas:
+        writes, reads, samples, catch_up = measure(replicas, args.tasks, args.write_rate, args.duration)
+        baseline = baseline or reads
+        lags = [lag for lag, _ in samples] or [0]
+        behind = max((seconds for _, seconds in samples), default=0.0)
+        print(f"{replicas:>3} replicas: {reads:>12,.0f} reads/s  speedup {reads / baseline:.2f}x  "
+              f"writes {writes:,.0f}/s  lag p50 {statistics.median(lags):,.0f} max {max(lags):,} changes, "
+              f"max {behind:.3f} s behind  caught up {max(catch_up) * 1000:.1f} ms after writes stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark full-text search latency.
+
+Usage:
+    python -m benchmarks.bench_search [--tasks 1000000] [--queries 1000]
+"""
+import argparse
+import random
+import time
+
+from src.todo.manager import TodoManager
+
+WORDS = [f"word{i}" for i in range(20_000)] + ["deploy", "release", "backend", "frontend", "bug"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    manager = TodoManager()
+    start = time.perf_counter()
+    for _ in range(args.tasks):
+        manager.add_task(" ".join(rng.sample(WORDS, 3)), " ".join(rng.sample(WORDS, 5)))
+    print(f"indexed {args.tasks:,} tasks in {time.perf_counter() - start:.2f}s")
+
+    queries = [f"{rng.choice(WORDS)} {rng.choice(WORDS)[:5]}" for _ in range(args.queries)]
+    queries += [rng.choice(WORDS) for _ in range(args.queries)]
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        manager.search(query, limit=args.limit)
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    for label, q in (("p50", 0.50), ("p99", 0.99)):
+        print(f"{label}: {latencies[int(q * (len(latencies) - 1))] * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
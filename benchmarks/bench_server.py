@@ -0,0 +1,103 @@
+"""
+Load generator for the HTTP/JSON service.
+
+Starts `python -m src.todo.server` in a subprocess and drives it over
+keep-alive connections, reporting requests/sec and p50/p99 latency.
+
+Usage:
+    python -m benchmarks.bench_server [--connections 16] [--requests 50000] [--pipeline 1]
+"""
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def build_request(i: int) -> bytes:
+    """Alternate between adds, lookups, and counts."""
+    if i % 4 == 0:
+        body = json.dumps({"title": f"Task {i}", "description": "load test"}).encode()
+        return b"POST /tasks HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+    if i % 4 == 3:
+        return b"GET /stats HTTP/1.1\r\n\r\n"
+    return b"GET /tasks/%d HTTP/1.1\r\n\r\n" % (i // 4 + 1)
+
+
+async def read_response(reader: asyncio.StreamReader) -> None:
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = int(head.lower().split(b"content-length: ")[1].split(b"\r\n")[0])
+    await reader.readexactly(length)
+
+
+async def client(port: int, start: int, count: int, pipeline: int, latencies: list) -> None:
+    """Send `count` requests, `pipeline` at a time, on one keep-alive connection."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for offset in range(0, count, pipeline):
+        batch = range(start + offset, start + min(offset + pipeline, count))
+        sent = time.perf_counter()
+        writer.write(b"".join(build_request(i) for i in batch))
+        for _ in batch:
+            await read_response(reader)
+            latencies.append(time.perf_counter() - sent)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_load(port: int, connections: int, requests: int, pipeline: int) -> tuple:
+    latencies: list = []
+    per_client = requests // connections
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, n * per_client, per_client, pipeline, latencies) for n in range(connections)
+    ))
+    return time.perf_counter() - start, latencies
+
+
+async def wait_until_listening(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--pipeline", type=int, default=1, help="Requests in flight per connection")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen([sys.executable, "-m", "src.todo.server", "--port", str(port)])
+    try:
+        asyncio.run(wait_until_listening(port))
+        elapsed, latencies = asyncio.run(run_load(port, args.connections, args.requests, args.pipeline))
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    print(f"{len(latencies):,} requests over {args.connections} connections "
+          f"(pipeline depth {args.pipeline}) in {elapsed:.2f}s")
+    print(f"throughput: {len(latencies) / elapsed:,.0f} req/s")
+    for label, q in (("p50", 0.50), ("p99", 0.99)):
+        print(f"{label}: {latencies[int(q * (len(latencies) - 1))] * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
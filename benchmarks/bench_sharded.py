@@ -0,0 +1,70 @@
+"""
+Benchmark ShardedTodoManager throughput as the number of worker processes grows.
+
+Each run spreads the same tenants over 1..N shards and pushes a mixed
+workload through batch(). Throughput can only scale up to the number of
+free cores, so run this on a machine with at least N of them.
+
+Usage:
+    python -m benchmarks.bench_sharded [--shards 1 2 4 8] [--tenants 64] [--tasks 2000] [--ops 100000]
+"""
+import argparse
+import os
+import random
+import time
+
+from src.todo.sharded import ShardedTodoManager
+
+WORDS = ["deploy", "release", "backend", "frontend", "bug", "docs", "review", "meeting"]
+
+
+def workload(tenants: list, tasks: int, ops: int, seed: int) -> list:
+    """A request mix dominated by per-tenant queries, with some writes."""
+    rng = random.Random(seed)
+    requests = []
+    for i in range(ops):
+        tenant = rng.choice(tenants)
+        kind = i % 10
+        if kind < 5:
+            requests.append((tenant, "search", (rng.choice(WORDS),), {"limit": 20}))
+        elif kind < 7:
+            requests.append((tenant, "get_tasks", (), {"status": "pending", "limit": 20}))
+        elif kind < 9:
+            requests.append((tenant, "add_task", (f"{rng.choice(WORDS)} {i}",)))
+        else:
+            requests.append((tenant, "mark_complete", (rng.randint(1, tasks),)))
+    return requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--tenants", type=int, default=64)
+    parser.add_argument("--tasks", type=int, default=2000, help="Tasks preloaded per tenant")
+    parser.add_argument("--ops", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=1000, help="Requests per batch() call")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs")
+    tenants = [f"tenant{i}" for i in range(args.tenants)]
+    requests = workload(tenants, args.tasks, args.ops, seed=42)
+    baseline = None
+    for shards in args.shards:
+        manager = ShardedTodoManager(shards=shards)
+        try:
+            manager.batch([(tenant, "add_tasks", ([(f"{WORDS[i % len(WORDS)]} task {i}", "")
+                                                   for i in range(args.tasks)],))
+                           for tenant in tenants])
+            start = time.perf_counter()
+            for i in range(0, len(requests), args.batch):
+                manager.batch(requests[i:i + args.batch])
+            elapsed = time.perf_counter() - start
+        finally:
+            manager.close()
+        throughput = len(requests) / elapsed
+        baseline = baseline or throughput
+        print(f"{shards:>3} shards: {throughput:>12,.0f} ops/s  speedup {throughput / baseline:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
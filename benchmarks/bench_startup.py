@@ -0,0 +1,71 @@
+"""
+Benchmark CLI cold start and per-command dispatch latency.
+
+Cold start is the wall time of `python -m src.todo.main --script -` running
+a single quit command, best of several runs, next to a bare interpreter for
+reference. With --importtime, the slowest imports reported by
+`python -X importtime` are listed as well.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 20] [--commands 100000] [--importtime]
+"""
+import argparse
+import io
+import subprocess
+import sys
+import time
+
+from src.todo.main import execute_command
+from src.todo.manager import TodoManager
+
+
+def best_wall_time(argv: list, stdin: str, runs: int) -> float:
+    """Return the fastest of `runs` executions of a command, in milliseconds."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, input=stdin, capture_output=True, text=True, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def slowest_imports(count: int) -> list:
+    """Return (cumulative us, module) for the slowest imports of the CLI."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-m", "src.todo.main", "--script", "-"],
+                            input="quit\n", capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            rows.append((int(fields[1]), fields[2].rstrip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--commands", type=int, default=100_000, help="Commands timed for dispatch latency")
+    parser.add_argument("--importtime", action="store_true", help="List the slowest imports")
+    args = parser.parse_args()
+
+    bare = best_wall_time([sys.executable, "-c", "pass"], "", args.runs)
+    cli = best_wall_time([sys.executable, "-m", "src.todo.main", "--script", "-"], "quit\n", args.runs)
+    print(f"bare interpreter: {bare:6.1f} ms")
+    print(f"cli cold start:   {cli:6.1f} ms  (+{cli - bare:.1f} ms)")
+    if args.importtime:
+        for cumulative, module in slowest_imports(15):
+            print(f"  {cumulative / 1e3:6.1f} ms  {module}")
+
+    # Dispatch only: commands that do no work, so parsing and lookup dominate
+    manager = TodoManager()
+    sink = io.StringIO()
+    lines = ["undo", "next x", "frobnicate", "priority x"] * (args.commands // 4)
+    start = time.perf_counter()
+    for line in lines:
+        execute_command(manager, line, sink.write)
+    elapsed = time.perf_counter() - start
+    print(f"dispatch: {elapsed / len(lines) * 1e6:.2f} us per command")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark bitmap-indexed tag filters against a per-task scan.
+
+Usage:
+    python -m benchmarks.bench_tags [--tasks 1000000] [--tags 300] [--queries 50]
+"""
+import argparse
+import random
+import time
+
+from src.todo.manager import TodoManager
+
+
+def make_queries(rng: random.Random, tags: list, projects: int, count: int) -> list:
+    """Build (filter, equivalent predicate) pairs over common and rare tags."""
+    queries = []
+    for _ in range(count):
+        a, b = rng.sample(tags[:30], 2)
+        rare = rng.choice(tags)
+        project = f"p{rng.randrange(projects)}"
+        queries.append((f"pending AND tag:{a} AND NOT tag:{b}",
+                        lambda t, a=a, b=b: t.status == "pending" and a in t.tags and b not in t.tags))
+        queries.append((f"project:{project} (tag:{a} OR tag:{rare})",
+                        lambda t, p=project, a=a, r=rare: t.project == p and (a in t.tags or r in t.tags)))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--tags", type=int, default=300)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    tags = [f"t{i}" for i in range(args.tags)]
+    # A few common tags and a long tail
+    weights = [1 / (rank + 1) for rank in range(args.tags)]
+    manager = TodoManager()
+    start = time.perf_counter()
+    for i in range(args.tasks):
+        task_id = manager.add_task(f"Task {i}", tags=rng.choices(tags, weights, k=rng.randint(0, 4)),
+                                   project=f"p{i % args.projects}")
+        if i % 3 == 0:
+            manager.mark_complete(task_id)
+    print(f"added {args.tasks:,} tasks with {args.tags} tags in {time.perf_counter() - start:.2f}s")
+
+    queries = make_queries(rng, tags, args.projects, args.queries)
+    for label, run in (
+        ("bitmap", lambda query, _: manager.filter_tasks(query)),
+        ("scan", lambda _, predicate: [t for t in manager.get_all_tasks() if predicate(t)]),
+    ):
+        latencies = []
+        for query, predicate in queries:
+            start = time.perf_counter()
+            run(query, predicate)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1e3
+        p99 = latencies[int(0.99 * (len(latencies) - 1))] * 1e3
+        print(f"{label:<8} p50: {p50:.2f} ms  p99: {p99:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
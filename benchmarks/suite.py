@@ -0,0 +1,221 @@
+"""
+Benchmark suite and performance-regression gate for TodoManager and the CLI.
+
+Measures throughput and latency percentiles of add/get/update/complete/
+delete/list at several store sizes, plus end-to-end command throughput
+through main() with commands fed on stdin. Results are written as JSON;
+given a baseline, any case whose throughput dropped by more than the
+threshold is reported and the run exits with status 1.
+
+Usage:
+    python -m benchmarks.suite [--sizes 1000,10000,100000,1000000]
+        [--output results.json] [--baseline benchmarks/baseline.json]
+        [--threshold 0.25] [--save-baseline] [--repeat 3]
+
+Baselines are machine-specific: record one with --save-baseline on the
+machine that runs the gate, then compare later runs against it.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import time
+from typing import Callable, Iterable
+
+from src.todo import main as cli
+from src.todo.manager import TodoManager
+
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+
+
+def summarize(latencies: list, elapsed: float) -> dict:
+    """Turn per-call latencies (seconds) into throughput and percentiles."""
+    latencies.sort()
+
+    def percentile(q):
+        return latencies[int(q * (len(latencies) - 1))] * 1e6
+
+    return {
+        "ops_per_sec": len(latencies) / elapsed,
+        "p50_us": percentile(0.50),
+        "p99_us": percentile(0.99),
+    }
+
+
+def timed(calls: Iterable, fn: Callable) -> dict:
+    """Call fn(*args) for each args tuple, timing every call."""
+    latencies = []
+    clock = time.perf_counter
+    start = clock()
+    for args in calls:
+        t0 = clock()
+        fn(*args)
+        latencies.append(clock() - t0)
+    return summarize(latencies, clock() - start)
+
+
+def bench_manager(size: int, ops: int, rng: random.Random) -> dict:
+    """Benchmark single-task operations against a store of `size` tasks."""
+    manager = TodoManager()
+    manager.add_tasks((f"Task {i}", f"Description {i}") for i in range(size))
+    ops = min(ops, size)
+    results = {}
+
+    results["add"] = timed(((f"New {i}", "added") for i in range(ops)), manager.add_task)
+    ids = [rng.randint(1, size) for _ in range(ops)]
+    results["get"] = timed(((i,) for i in ids), manager.get_task)
+    results["update"] = timed(((i, f"Updated {i}") for i in ids), manager.update_task)
+    targets = rng.sample(range(1, size + 1), ops)
+    results["complete"] = timed(((i,) for i in targets), manager.mark_complete)
+    # Each listing touches the whole store; keep the total work bounded.
+    rounds = max(3, min(100, 1_000_000 // size))
+    results["list"] = timed((() for _ in range(rounds)), manager.get_all_tasks)
+    results["list_page"] = timed(((None, 0, 100, i) for i in ids[:rounds * 10]), manager.get_tasks)
+    results["delete"] = timed(((i,) for i in targets), manager.delete_task)
+    return results
+
+
+def cli_commands(count: int) -> list:
+    """A mixed CLI session of roughly `count` commands ending in quit."""
+    adds = count // 2
+    lines = [f'add "Task {i}" "Description {i}"' for i in range(adds)]
+    rest = count - adds
+    for i in range(rest):
+        task_id = i % adds + 1
+        kind = i % 4
+        if kind == 0:
+            lines.append(f"complete {task_id}")
+        elif kind == 1:
+            lines.append(f'update {task_id} "Renamed {i}"')
+        elif kind == 2:
+            lines.append(f"search task {task_id}")
+        else:
+            lines.append(f"delete {task_id}")
+    lines.append("quit")
+    return lines
+
+
+def bench_cli(count: int) -> dict:
+    """Measure end-to-end command throughput through main() with stdin fed in."""
+    lines = cli_commands(count)
+    script = "\n".join(lines) + "\n"
+    results = {}
+    for name, argv in (("cli_script", ["--script", "-"]), ("cli_interactive", [])):
+        stdin, sink = io.StringIO(script), io.StringIO()
+        saved_stdin = sys.stdin
+        sys.stdin = stdin
+        try:
+            with contextlib.redirect_stdout(sink):
+                start = time.perf_counter()
+                cli.main(argv)
+                elapsed = time.perf_counter() - start
+        finally:
+            sys.stdin = saved_stdin
+        results[name] = {"ops_per_sec": len(lines) / elapsed}
+    return results
+
+
+def run(sizes: list, ops: int, commands: int, repeat: int) -> dict:
+    """Run every case `repeat` times and keep the best throughput of each."""
+    best = {}
+
+    def record(key, metrics):
+        if key not in best or metrics["ops_per_sec"] > best[key]["ops_per_sec"]:
+            best[key] = metrics
+
+    for _ in range(repeat):
+        rng = random.Random(42)
+        for size in sizes:
+            for op, metrics in bench_manager(size, ops, rng).items():
+                record(f"{op}@{size}", metrics)
+        for name, metrics in bench_cli(commands).items():
+            record(f"{name}@{commands}", metrics)
+    return best
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compare throughput against a baseline.
+
+    Args:
+        results: Case name -> metrics from this run
+        baseline: Case name -> metrics from the baseline run
+        threshold: Allowed relative throughput drop, e.g. 0.25 for 25%
+
+    Returns:
+        (case, baseline ops/s, current ops/s) for every regressed case
+    """
+    regressions = []
+    for case, metrics in results.items():
+        reference = baseline.get(case)
+        if reference is None:
+            continue
+        if metrics["ops_per_sec"] < reference["ops_per_sec"] * (1 - threshold):
+            regressions.append((case, reference["ops_per_sec"], metrics["ops_per_sec"]))
+    return regressions
+
+
+def print_table(results: dict, baseline: dict) -> None:
+    print(f"{'case':<26}{'ops/s':>14}{'p50 us':>10}{'p99 us':>10}{'vs base':>10}")
+    for case, metrics in results.items():
+        reference = baseline.get(case)
+        change = f"{metrics['ops_per_sec'] / reference['ops_per_sec'] - 1:+.0%}" if reference else "-"
+        p50 = f"{metrics['p50_us']:.1f}" if "p50_us" in metrics else "-"
+        p99 = f"{metrics['p99_us']:.1f}" if "p99_us" in metrics else "-"
+        print(f"{case:<26}{metrics['ops_per_sec']:>14,.0f}{p50:>10}{p99:>10}{change:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Comma-separated store sizes (default: 1000,10000,100000)")
+    parser.add_argument("--ops", type=int, default=10_000, help="Timed calls per operation and size")
+    parser.add_argument("--commands", type=int, default=20_000, help="Commands per CLI run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the best is kept")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Fail if throughput drops by more than this fraction (default: 0.25)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = run(sizes, args.ops, args.commands, args.repeat)
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(document, handle, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(document, handle, indent=2)
+        print_table(results, {})
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)["results"]
+    except FileNotFoundError:
+        baseline = {}
+    print_table(results, baseline)
+    if not baseline:
+        print(f"no baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for case, before, after in regressions:
+        print(f"REGRESSION {case}: {before:,.0f} -> {after:,.0f} ops/s ({after / before - 1:+.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
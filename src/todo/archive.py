@@ -0,0 +1,221 @@
+"""Compressed cold store for archived tasks, with an LRU cache for lookups."""
+import json
+import os
+import re
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from .models import Task
+
+# Segment file layout:
+#
+#   header   magic and task count (little-endian)
+#   ids      int64 per task, ascending, little-endian
+#   data     zlib-compressed JSON lines, one task per line in ID order
+#
+# Opening the store reads only the ID lists, so a lookup knows which
+# segment and line hold a task without decompressing anything; the store
+# costs 8 bytes of memory per archived task.
+_MAGIC = b"TODOSEG\x00"
+_HEADER = struct.Struct("<8sI")
+_SEGMENT_RE = re.compile(r"^segment-(\d+)\.z$")
+# One encoder for every line, rather than json.dumps setting one up per call
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _find(ids: array, task_id: int) -> Optional[int]:
+    """Return the position of an ID in an ascending array, or None."""
+    if not ids or not ids[0] <= task_id <= ids[-1]:
+        return None
+    position = bisect_left(ids, task_id)
+    return position if ids[position] == task_id else None
+
+
+class ColdStore:
+    """
+    Archived tasks in zlib-compressed JSON Lines segments on disk.
+
+    Each call to add() writes new segments of at most segment_size tasks.
+    Looking a task up finds its segment from the in-memory ID lists,
+    decompresses the segment and decodes just that task's line; recently
+    read tasks are kept in a small LRU cache, and the lines of the last
+    segment read are kept too, so neighbouring lookups skip decompression.
+    Removing tasks rewrites the segments that held them. Safe to read
+    from several threads.
+
+    Attributes:
+        directory: Where the segments are stored
+    """
+
+    def __init__(self, directory: str, cache_size: int = 1024, segment_size: int = 1024):
+        """
+        Open (or create) a cold store.
+
+        Args:
+            directory: Directory for the segment files (created if missing)
+            cache_size: Most tasks kept in the LRU cache
+            segment_size: Most tasks written per segment
+
+        Raises:
+            ValueError: If a size is not positive, or a segment file is corrupt
+        """
+        if cache_size < 1 or segment_size < 1:
+            raise ValueError("Cache and segment sizes must be at least 1")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._cache_size = cache_size
+        self._segment_size = segment_size
+        self._lock = threading.Lock()
+        # Segment number -> ascending task IDs, oldest segment first
+        self._segments: dict[int, array] = {}
+        self._cache: OrderedDict[int, Task] = OrderedDict()
+        # (segment number, lines) of the segment decompressed last
+        self._lines: Optional[Tuple[int, List[bytes]]] = None
+        self._count = 0
+        self._next_segment = 1
+        for name in sorted(os.listdir(directory)):
+            match = _SEGMENT_RE.match(name)
+            if match:
+                number = int(match.group(1))
+                self._segments[number] = self._read_ids(number)
+                self._count += len(self._segments[number])
+                self._next_segment = number + 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, task_id: object) -> bool:
+        if not isinstance(task_id, int):
+            return False
+        with self._lock:
+            return self._locate(task_id) is not None
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """
+        Return an archived task, or None.
+
+        The same Task object is returned while it stays in the cache.
+        """
+        if not isinstance(task_id, int):
+            return None
+        with self._lock:
+            task = self._cache.get(task_id)
+            if task is not None:
+                self._cache.move_to_end(task_id)
+                return task
+            location = self._locate(task_id)
+            if location is None:
+                return None
+            number, position = location
+            task = Task.from_dict(json.loads(self._segment_lines(number)[position]))
+            self._cache[task_id] = task
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+            return task
+
+    def add(self, tasks: Iterable[Task]) -> int:
+        """
+        Archive tasks, writing them to new segments before returning.
+
+        Returns:
+            The number of tasks archived
+        """
+        tasks = sorted(tasks, key=lambda task: task.id)
+        with self._lock:
+            for start in range(0, len(tasks), self._segment_size):
+                chunk = tasks[start:start + self._segment_size]
+                lines = [_encode(task.to_dict()).encode("utf-8") for task in chunk]
+                self._write_segment(self._next_segment, array("q", [task.id for task in chunk]), lines)
+                self._next_segment += 1
+                self._count += len(chunk)
+        return len(tasks)
+
+    def remove(self, task_ids: Iterable[int]) -> int:
+        """
+        Remove tasks from the archive, rewriting the segments that held them.
+
+        Returns:
+            The number of tasks removed (unknown IDs are ignored)
+        """
+        with self._lock:
+            doomed: dict[int, set] = {}
+            for task_id in set(task_ids):
+                self._cache.pop(task_id, None)
+                for number, ids in self._segments.items():
+                    position = _find(ids, task_id)
+                    if position is not None:
+                        doomed.setdefault(number, set()).add(position)
+            removed = 0
+            for number, positions in doomed.items():
+                ids, lines = self._segments[number], self._segment_lines(number)
+                keep = [position for position in range(len(ids)) if position not in positions]
+                if keep:
+                    self._write_segment(number, array("q", [ids[i] for i in keep]), [lines[i] for i in keep])
+                else:
+                    os.remove(self._path(number))
+                    del self._segments[number]
+                    self._lines = None
+                removed += len(positions)
+            self._count -= removed
+            return removed
+
+    def close(self) -> None:
+        """Drop the cached tasks."""
+        with self._lock:
+            self._cache.clear()
+            self._lines = None
+
+    def _path(self, number: int) -> str:
+        return os.path.join(self.directory, f"segment-{number:08d}.z")
+
+    def _locate(self, task_id: int) -> Optional[Tuple[int, int]]:
+        """Return (segment number, position) of an archived task, newest copy first."""
+        for number, ids in reversed(self._segments.items()):
+            position = _find(ids, task_id)
+            if position is not None:
+                return number, position
+        return None
+
+    def _segment_lines(self, number: int) -> List[bytes]:
+        """Decompress a segment (or reuse the last one) and split it into lines."""
+        if self._lines is not None and self._lines[0] == number:
+            return self._lines[1]
+        with open(self._path(number), "rb") as handle:
+            _, count = _HEADER.unpack(handle.read(_HEADER.size))
+            handle.seek(_HEADER.size + 8 * count)
+            lines = zlib.decompress(handle.read()).split(b"\n")
+        self._lines = (number, lines)
+        return lines
+
+    def _read_ids(self, number: int) -> array:
+        with open(self._path(number), "rb") as handle:
+            magic, count = _HEADER.unpack(handle.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{self._path(number)} is not an archive segment")
+            ids = array("q")
+            ids.fromfile(handle, count)
+        if sys.byteorder == "big":
+            ids.byteswap()
+        return ids
+
+    def _write_segment(self, number: int, ids: array, lines: List[bytes]) -> None:
+        """Write a segment atomically (via a temporary file and rename)."""
+        path = self._path(number)
+        stored = array("q", ids)
+        if sys.byteorder == "big":
+            stored.byteswap()
+        with open(path + ".tmp", "wb") as handle:
+            handle.write(_HEADER.pack(_MAGIC, len(ids)))
+            handle.write(stored.tobytes())
+            handle.write(zlib.compress(b"\n".join(lines)))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(path + ".tmp", path)
+        self._segments[number] = ids
+        self._lines = (number, lines)
@@ -0,0 +1,201 @@
+"""Bitmap index over task IDs for boolean status/tag/project filters."""
+import re
+from typing import Iterable, List, Optional
+
+from .models import STATUSES
+
+# Bit positions set in each possible byte value
+_BIT_POSITIONS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+_NONZERO_RUN = re.compile(rb"[^\x00]+")
+_TOKEN_RE = re.compile(r"\(|\)|[^\s()]+")
+_FIELDS = ("status", "tag", "project")
+
+
+def _set_bit(bitmap: bytearray, task_id: int) -> None:
+    index = task_id >> 3
+    if index >= len(bitmap):
+        bitmap.extend(bytes(index + 1 - len(bitmap)))
+    bitmap[index] |= 1 << (task_id & 7)
+
+
+def _clear_bit(bitmap: bytearray, task_id: int) -> None:
+    index = task_id >> 3
+    if index < len(bitmap):
+        bitmap[index] &= ~(1 << (task_id & 7)) & 0xFF
+
+
+def decode(bits: int, limit: Optional[int] = None) -> List[int]:
+    """
+    Return the positions of the set bits of an int, in ascending order.
+
+    Runs of zero bytes are skipped by a regular expression scan, so the
+    cost depends on the number of IDs found more than on the ID range.
+    """
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    ids: List[int] = []
+    for run in _NONZERO_RUN.finditer(data):
+        start = run.start()
+        for offset, byte in enumerate(run.group(), start):
+            base = offset << 3
+            ids.extend(base + bit for bit in _BIT_POSITIONS[byte])
+        if limit is not None and len(ids) >= limit:
+            return ids[:limit]
+    return ids
+
+
+class BitmapIndex:
+    """
+    Maps keys such as "tag:urgent" or "status:pending" to bitsets of task IDs.
+
+    Each bitset is a bytearray in which bit i is set when task i has the
+    key, so updating a task flips one bit per key. A query converts the
+    bitsets it needs to Python ints and combines them with &, | and ~,
+    which run in C over whole machine words, instead of testing tasks one
+    by one. Memory is one bit per ID in the range for each key.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._bitmaps: dict[str, bytearray] = {}
+        self._counts: dict[str, int] = {}
+        # Every live task, the universe for NOT
+        self._all = bytearray()
+
+    def add(self, task_id: int, keys: Iterable[str]) -> None:
+        """Index a new task under the given keys."""
+        _set_bit(self._all, task_id)
+        self._set(task_id, keys)
+
+    def remove(self, task_id: int, keys: Iterable[str]) -> None:
+        """Remove a task indexed under the given keys."""
+        _clear_bit(self._all, task_id)
+        self._clear(task_id, keys)
+
+    def replace(self, task_id: int, old_keys: Iterable[str], new_keys: Iterable[str]) -> None:
+        """Move a task from one set of keys to another."""
+        old_keys, new_keys = set(old_keys), set(new_keys)
+        self._clear(task_id, old_keys - new_keys)
+        self._set(task_id, new_keys - old_keys)
+
+    def count(self, key: str) -> int:
+        """Return the number of tasks indexed under a key."""
+        return self._counts.get(key, 0)
+
+    def _set(self, task_id: int, keys: Iterable[str]) -> None:
+        bitmaps, counts = self._bitmaps, self._counts
+        for key in keys:
+            bitmap = bitmaps.get(key)
+            if bitmap is None:
+                bitmap = bitmaps[key] = bytearray()
+                counts[key] = 0
+            _set_bit(bitmap, task_id)
+            counts[key] += 1
+
+    def _clear(self, task_id: int, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._counts[key] -= 1
+            if self._counts[key]:
+                _clear_bit(self._bitmaps[key], task_id)
+            else:
+                # Drop keys no task has any more, e.g. a retired tag
+                del self._counts[key]
+                del self._bitmaps[key]
+
+    def evaluate(self, node: tuple) -> int:
+        """Evaluate a parsed filter (see parse_filter) to a bitset of matching IDs."""
+        kind = node[0]
+        if kind == "key":
+            bitmap = self._bitmaps.get(node[1])
+            return int.from_bytes(bitmap, "little") if bitmap else 0
+        if kind == "and":
+            left, right = node[1], node[2]
+            # a AND NOT b needs no universe: a & ~b is exact for non-negative a
+            if right[0] == "not":
+                return self.evaluate(left) & ~self.evaluate(right[1])
+            if left[0] == "not":
+                return self.evaluate(right) & ~self.evaluate(left[1])
+            return self.evaluate(left) & self.evaluate(right)
+        if kind == "or":
+            return self.evaluate(node[1]) | self.evaluate(node[2])
+        if kind == "not":
+            return int.from_bytes(self._all, "little") & ~self.evaluate(node[1])
+        raise ValueError(f"Unknown filter node: {kind}")
+
+
+def parse_filter(text: str) -> tuple:
+    """
+    Parse a boolean filter over status, tags and projects.
+
+    Terms are "pending", "completed", "status:NAME", "tag:NAME" and
+    "project:NAME"; they combine with AND, OR, NOT and parentheses.
+    Adjacent terms are ANDed, and AND binds tighter than OR. Keywords are
+    case-insensitive, e.g. "pending tag:urgent and not tag:blocked".
+
+    Returns:
+        A tree of ("and", left, right), ("or", left, right), ("not", node)
+        and ("key", "tag:urgent") tuples
+
+    Raises:
+        ValueError: If the filter is empty or malformed
+    """
+    tokens = _TOKEN_RE.findall(text)
+    if not tokens:
+        raise ValueError("Filter cannot be empty")
+    position = 0
+
+    def peek() -> Optional[str]:
+        return tokens[position].upper() if position < len(tokens) else None
+
+    def take() -> str:
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or() -> tuple:
+        node = parse_and()
+        while peek() == "OR":
+            take()
+            node = ("or", node, parse_and())
+        return node
+
+    def parse_and() -> tuple:
+        node = parse_not()
+        while peek() not in (None, "OR", ")"):
+            if peek() == "AND":
+                take()
+            node = ("and", node, parse_not())
+        return node
+
+    def parse_not() -> tuple:
+        if peek() == "NOT":
+            take()
+            return ("not", parse_not())
+        if peek() == "(":
+            take()
+            node = parse_or()
+            if peek() != ")":
+                raise ValueError("Missing closing parenthesis")
+            take()
+            return node
+        if peek() in (None, ")", "AND", "OR"):
+            raise ValueError("Expected a term such as tag:NAME")
+        return ("key", _term_key(take()))
+
+    node = parse_or()
+    if position != len(tokens):
+        raise ValueError(f"Unexpected '{tokens[position]}'")
+    return node
+
+
+def _term_key(term: str) -> str:
+    """Translate a filter term into an index key."""
+    field, colon, value = term.lower().partition(":")
+    if not colon:
+        field, value = "status", field
+    elif not value:
+        raise ValueError(f"Missing a name after '{field}:'")
+    if field not in _FIELDS:
+        raise ValueError(f"Unknown filter field '{field}'; use one of: {', '.join(_FIELDS)}")
+    if field == "status" and value not in STATUSES:
+        raise ValueError(f"Status must be one of {', '.join(STATUSES)}")
+    return f"{field}:{value}"
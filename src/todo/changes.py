@@ -0,0 +1,152 @@
+"""Change feed: sequence-numbered task changes for incremental consumers."""
+import threading
+from typing import AsyncIterator, Callable, List, NamedTuple, Optional
+
+from .exceptions import ChangesExpiredError
+
+
+class Change(NamedTuple):
+    """
+    One change to the task collection (immutable).
+
+    Attributes:
+        seq: Position in the feed; increases by one per change
+        op: "add", "update", "complete", "status", "schedule", "labels",
+            "delete" or "archive" (moved to the archive; still readable)
+        task_id: The ID of the changed task
+        data: The new task for "add"; the changed fields ("title" and/or
+            "description", or "status") otherwise; None for "delete" and
+            "archive"
+    """
+    seq: int
+    op: str
+    task_id: int
+    data: Optional[dict] = None
+
+    def to_dict(self) -> dict:
+        """Convert the change to a JSON-serializable dictionary."""
+        return {"seq": self.seq, "op": self.op, "id": self.task_id, "data": self.data}
+
+
+class ChangeFeed:
+    """
+    Bounded, sequence-numbered log of recent changes.
+
+    Changes are kept in a fixed-size ring buffer indexed by sequence
+    number, so reading the changes since a given point costs time in
+    proportion to the number of changes returned, not to the store size.
+    Consumers that fall more than `capacity` changes behind get a
+    ChangesExpiredError and have to resynchronize from a full listing.
+    """
+
+    def __init__(self, capacity: int = 100_000):
+        """
+        Initialize an empty feed.
+
+        Args:
+            capacity: Number of most recent changes kept
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        self.capacity = capacity
+        self._buffer: List[Optional[Change]] = [None] * capacity
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[Change], None]] = []
+        self._waiters: List[tuple] = []
+
+    @property
+    def seq(self) -> int:
+        """The sequence number of the latest change (0 before the first)."""
+        return self._seq
+
+    @property
+    def oldest(self) -> int:
+        """The sequence number of the oldest buffered change."""
+        return max(1, self._seq - self.capacity + 1)
+
+    def publish(self, op: str, task_id: int, data: Optional[dict] = None) -> Change:
+        """
+        Append a change and notify subscribers.
+
+        Subscriber callbacks run synchronously; an exception raised by one
+        is reported on stderr and does not reach the code that made the
+        change.
+        """
+        with self._lock:
+            self._seq += 1
+            change = Change(self._seq, op, task_id, data)
+            self._buffer[self._seq % self.capacity] = change
+            waiters, self._waiters = self._waiters, []
+        for callback in self._subscribers:
+            try:
+                callback(change)
+            except Exception:
+                import traceback
+                traceback.print_exc()
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+        return change
+
+    def changes_since(self, seq: int, limit: Optional[int] = None) -> List[Change]:
+        """
+        Return the changes after a sequence number, oldest first.
+
+        Args:
+            seq: The last sequence number the consumer has seen (0 for all)
+            limit: Maximum number of changes to return
+
+        Raises:
+            ChangesExpiredError: If changes after seq are no longer buffered
+        """
+        with self._lock:
+            latest = self._seq
+            if seq >= latest:
+                return []
+            if seq + 1 < self.oldest:
+                raise ChangesExpiredError(seq, self.oldest)
+            end = latest if limit is None else min(latest, seq + limit)
+            buffer, capacity = self._buffer, self.capacity
+            return [buffer[i % capacity] for i in range(seq + 1, end + 1)]
+
+    def subscribe(self, callback: Callable[[Change], None]) -> Callable[[], None]:
+        """
+        Call callback with every future change.
+
+        Returns:
+            A function that cancels the subscription
+        """
+        # Copy on write, so publish() can iterate without holding the lock
+        self._subscribers = self._subscribers + [callback]
+
+        def unsubscribe():
+            self._subscribers = [s for s in self._subscribers if s is not callback]
+        return unsubscribe
+
+    async def watch(self, since: Optional[int] = None) -> AsyncIterator[Change]:
+        """
+        Asynchronously iterate over changes as they are published.
+
+        Args:
+            since: Start after this sequence number (default: the latest,
+                i.e. only future changes)
+
+        Raises:
+            ChangesExpiredError: If the iterator falls behind the buffer
+        """
+        # Imported here: asyncio is slow to import and only async consumers need it
+        import asyncio
+
+        cursor = self._seq if since is None else since
+        loop = asyncio.get_running_loop()
+        while True:
+            event = asyncio.Event()
+            with self._lock:
+                pending = self._seq > cursor
+                if not pending:
+                    self._waiters.append((loop, event))
+            if not pending:
+                await event.wait()
+            for change in self.changes_since(cursor):
+                cursor = change.seq
+                yield change
@@ -0,0 +1,240 @@
+"""Thread-safe TodoManager variant using reader-writer locking."""
+import threading
+from typing import Iterable, Iterator, List, Optional
+
+from .exceptions import VersionConflictError
+from .manager import TodoManager
+from .models import Task, TaskSnapshot
+
+
+class ReadWriteLock:
+    """
+    Writer-preferring reader-writer lock.
+
+    Any number of readers may hold the lock at once; a writer holds it
+    exclusively. Once a writer is waiting, new readers queue behind it so
+    that a steady stream of reads cannot starve writes. Not reentrant.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self) -> None:
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+
+def _reader(name: str):
+    """Build a method that calls the wrapped manager's `name` under the read lock."""
+    def method(self, *args, **kwargs):
+        lock = self._lock
+        lock.acquire_read()
+        try:
+            return getattr(self._manager, name)(*args, **kwargs)
+        finally:
+            lock.release_read()
+    method.__name__ = name
+    method.__doc__ = getattr(TodoManager, name).__doc__
+    return method
+
+
+def _writer(name: str):
+    """Build a method that calls the wrapped manager's `name` under the write lock."""
+    def method(self, *args, **kwargs):
+        lock = self._lock
+        lock.acquire_write()
+        try:
+            return getattr(self._manager, name)(*args, **kwargs)
+        finally:
+            lock.release_write()
+    method.__name__ = name
+    method.__doc__ = getattr(TodoManager, name).__doc__
+    return method
+
+
+class ConcurrentTodoManager:
+    """
+    A TodoManager that can be shared between threads.
+
+    Every call is delegated to a wrapped TodoManager while holding a
+    reader-writer lock: queries share the read lock and can run in parallel
+    (on free-threaded CPython), while mutations take the write lock, which
+    makes ID allocation in add_task and check-then-act sequences such as
+    delete_task atomic. Because the wrapped manager is only reached through
+    this wrapper, its own internal calls never re-enter the lock.
+
+    read_task takes no lock at all when the task's current snapshot has
+    already been made, and conditional writes (update_task with
+    expected_version, mark_complete_if) fail without waiting for the write
+    lock when that snapshot already shows a different version.
+    """
+
+    def __init__(self, manager: Optional[TodoManager] = None):
+        """
+        Initialize the concurrent manager.
+
+        Args:
+            manager: The manager to wrap (default: a new in-memory one).
+                It must not be used directly once wrapped.
+        """
+        self._manager = manager if manager is not None else TodoManager()
+        self._lock = ReadWriteLock()
+        # The wrapped manager's published snapshots: writers replace or drop
+        # entries while holding the write lock, readers only look them up
+        self._frozen = self._manager._frozen
+
+    @property
+    def metrics(self):
+        """The wrapped manager's Metrics, or None if it is not instrumented."""
+        return self._manager.metrics
+
+    get_task = _reader("get_task")
+    get_tasks = _reader("get_tasks")
+    count = _reader("count")
+    stats = _reader("stats")
+    search = _reader("search")
+    export_tasks = _reader("export_tasks")
+    filter_tasks = _reader("filter_tasks")
+    explain = _reader("explain")
+    next_tasks = _reader("next_tasks")
+    overdue = _reader("overdue")
+    due_between = _reader("due_between")
+    changes_since = _reader("changes_since")
+    changes_seq = _reader("changes_seq")
+
+    add_task = _writer("add_task")
+    mark_complete = _writer("mark_complete")
+    _update_task = _writer("update_task")
+    _mark_complete_if = _writer("mark_complete_if")
+    _read_task = _reader("read_task")
+    delete_task = _writer("delete_task")
+    set_priority = _writer("set_priority")
+    set_due = _writer("set_due")
+    tag_task = _writer("tag_task")
+    untag_task = _writer("untag_task")
+    set_project = _writer("set_project")
+    add_tasks = _writer("add_tasks")
+    update_many = _writer("update_many")
+    mark_complete_many = _writer("mark_complete_many")
+    delete_many = _writer("delete_many")
+    import_tasks = _writer("import_tasks")
+    archive_completed = _writer("archive_completed")
+    undo = _writer("undo")
+    redo = _writer("redo")
+    subscribe = _writer("subscribe")
+    apply_change = _writer("apply_change")
+    replace_all = _writer("replace_all")
+    snapshot = _writer("snapshot")
+    close = _writer("close")
+
+    def read_task(self, task_id: int) -> TaskSnapshot:
+        """
+        Return an immutable snapshot of a task, without locking if possible.
+
+        A snapshot already made for the task's current version is returned
+        straight away, even while another thread holds the write lock (in
+        which case it is the version from just before that write). Only
+        the first read after a change takes the read lock to make one.
+        """
+        snapshot = self._frozen.get(task_id)
+        if snapshot is not None:
+            return snapshot
+        return self._read_task(task_id)
+
+    def update_task(self, task_id: int, title: Optional[str] = None, description: Optional[str] = None,
+                    expected_version: Optional[int] = None) -> bool:
+        """Update a task's text, optionally only at expected_version (see TodoManager.update_task)."""
+        self._fail_fast(task_id, expected_version)
+        return self._update_task(task_id, title, description, expected_version)
+
+    def mark_complete_if(self, task_id: int, expected_version: int) -> bool:
+        """Mark a task as complete only at expected_version (see TodoManager.mark_complete_if)."""
+        self._fail_fast(task_id, expected_version)
+        return self._mark_complete_if(task_id, expected_version)
+
+    def _fail_fast(self, task_id: int, expected_version: Optional[int]) -> None:
+        """
+        Raise VersionConflictError if the published snapshot already conflicts.
+
+        A published snapshot is only ever older than the task while a write
+        is under way, and no caller can have seen the newer version before
+        that write finishes, so a mismatch here is always a real conflict.
+        A match, or no snapshot, is checked again under the write lock.
+        """
+        if expected_version is None:
+            return
+        snapshot = self._frozen.get(task_id)
+        if snapshot is not None and snapshot.version != expected_version:
+            raise VersionConflictError(task_id, expected_version, snapshot.version)
+
+    def get_all_tasks(self) -> List[TaskSnapshot]:
+        """
+        Return immutable snapshots of all tasks, in ID order.
+
+        Unlike TodoManager.get_all_tasks, the tasks are frozen under the
+        read lock, so the list reflects a single point in time no matter
+        what other threads do afterwards.
+        """
+        return self._frozen_list(lambda manager: manager.get_all_tasks())
+
+    def iter_tasks(self, status: Optional[str] = None, after_id: Optional[int] = None) -> Iterator[TaskSnapshot]:
+        """
+        Iterate over immutable snapshots of tasks in ID order.
+
+        Unlike TodoManager.iter_tasks, the matching tasks are frozen under
+        the read lock up front, so the iteration reflects a single point
+        in time no matter what other threads do meanwhile.
+        """
+        return iter(self._frozen_list(lambda manager: manager.get_tasks(status=status, after_id=after_id)))
+
+    def query(self, text: str) -> Iterator[TaskSnapshot]:
+        """
+        Run a list query and iterate over snapshots of the results (see TodoManager.query).
+
+        The results are frozen under the read lock, as in iter_tasks.
+        """
+        return iter(self._frozen_list(lambda manager: manager.query(text)))
+
+    def _frozen_list(self, read) -> List[TaskSnapshot]:
+        """Call read(manager) under the read lock and freeze the tasks it returns."""
+        lock = self._lock
+        lock.acquire_read()
+        try:
+            return self._freeze(read(self._manager))
+        finally:
+            lock.release_read()
+
+    def _freeze(self, tasks: Iterable[Task]) -> List[TaskSnapshot]:
+        """Snapshot tasks, reusing (and publishing, as read_task does) current snapshots."""
+        frozen = self._frozen
+        snapshots = []
+        for task in tasks:
+            snapshot = frozen.get(task.id)
+            if snapshot is None:
+                snapshot = frozen[task.id] = task.freeze()
+            snapshots.append(snapshot)
+        return snapshots
@@ -12,7 +12,78 @@ class TaskNotFoundError(Exception):
         self.task_id = task_id
         super().__init__(f"Task with ID {task_id} not found")
 
+    def __reduce__(self):
+        # Rebuild from the constructor arguments, e.g. when sent between processes
+        return type(self), (self.task_id,)
+
+
+class VersionConflictError(Exception):
+    """
+    Raised when a conditional update finds a task at a different version.
+
+    The task was changed by someone else since the caller read it; nothing
+    was applied. Re-read the task and retry if the change still makes sense.
+
+    Attributes:
+        task_id: The ID of the task
+        expected: The version the caller expected
+        actual: The task's current version
+    """
+    def __init__(self, task_id: int, expected: int, actual: int):
+        self.task_id = task_id
+        self.expected = expected
+        self.actual = actual
+        super().__init__(f"Task {task_id} is at version {actual}, not {expected}")
+
+    def __reduce__(self):
+        return type(self), (self.task_id, self.expected, self.actual)
+
 
 class InvalidTaskError(Exception):
     """Raised when a task is invalid."""
-    pass
\ No newline at end of file
+    pass
+
+
+class BulkOperationError(Exception):
+    """
+    Raised when one or more items of a bulk operation are invalid.
+
+    Bulk operations are all-or-nothing, so no item was applied, except
+    for imports, which commit a chunk at a time: `applied` counts the
+    items of earlier chunks that were added before the failing one.
+
+    Attributes:
+        errors: Maps each failed item (task ID, or input position for adds)
+            to its error message
+        total: The number of items in the batch
+        applied: The number of items applied before the failure
+    """
+    def __init__(self, errors: dict, total: int, applied: int = 0):
+        self.errors = errors
+        self.total = total
+        self.applied = applied
+        outcome = f"{applied} were already applied" if applied else "no changes were made"
+        super().__init__(f"{len(errors)} of {total} items failed; {outcome}")
+
+    def __reduce__(self):
+        return type(self), (self.errors, self.total, self.applied)
+
+
+class ChangesExpiredError(Exception):
+    """
+    Raised when changes requested from a change feed are no longer buffered.
+
+    The consumer fell further behind than the feed's capacity and must
+    resynchronize from a full listing.
+
+    Attributes:
+        since: The sequence number the consumer asked to continue from
+        oldest: The oldest sequence number still available
+    """
+    def __init__(self, since: int, oldest: int):
+        self.since = since
+        self.oldest = oldest
+        super().__init__(f"Changes after #{since} have expired; the oldest available is #{oldest}")
+
+    def __reduce__(self):
+        return type(self), (self.since, self.oldest)
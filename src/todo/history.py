@@ -0,0 +1,166 @@
+"""Bounded undo/redo history for TodoManager."""
+from array import array
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Rough per-entry and per-row costs in bytes, used to keep the history
+# within its memory budget without calling sys.getsizeof on every object.
+_ENTRY_OVERHEAD = 100
+_ROW_OVERHEAD = 90
+
+
+def pack_ids(ids) -> array:
+    """Pack task IDs into a compact array of 64-bit integers."""
+    return array("q", ids)
+
+
+def entry_size(entry: tuple) -> int:
+    """
+    Estimate the memory held by a history entry.
+
+    Entries are tuples whose first item names the reverse operation:
+        ("delete", ids)                          remove these tasks
+        ("restore", [(id, title, description, status, ..., version), ...])
+        ("text", [(id, title or None, description or None), ...])
+        ("status", status, ids)                  set these tasks' status
+        ("schedule", [(id, priority, due), ...])
+        ("labels", [(id, tags, project), ...])
+        ("group", [entry, ...])                  apply entries in order
+    """
+    kind = entry[0]
+    if kind == "delete":
+        ids = entry[1]
+        return _ENTRY_OVERHEAD + (ids.itemsize * len(ids) if isinstance(ids, array) else 0)
+    if kind == "status":
+        return _ENTRY_OVERHEAD + entry[2].itemsize * len(entry[2])
+    if kind == "group":
+        return _ENTRY_OVERHEAD + sum(entry_size(item) for item in entry[1])
+    if kind in ("schedule", "labels"):
+        return _ENTRY_OVERHEAD + _ROW_OVERHEAD * len(entry[1])
+    size = _ENTRY_OVERHEAD
+    for row in entry[1]:
+        size += _ROW_OVERHEAD + len(row[1] or "") + len(row[2] or "")
+    return size
+
+
+class History:
+    """
+    Undo and redo stacks of reverse deltas.
+
+    Each entry records only what is needed to reverse one operation: the
+    IDs of added tasks, the old text of changed fields, the previous
+    status, or the contents of deleted tasks. The oldest entries are
+    evicted once either the entry cap or the (estimated) byte budget is
+    exceeded, so memory stays bounded however many edits are made.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 16 * 1024 * 1024):
+        """
+        Initialize an empty history.
+
+        Args:
+            max_entries: Most undo plus redo entries kept
+            max_bytes: Approximate memory budget for all entries
+        """
+        if max_entries < 0 or max_bytes < 0:
+            raise ValueError("History limits cannot be negative")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # Stacks of (entry, size) pairs; the newest entry is on the right
+        self._undo: deque = deque()
+        self._redo: deque = deque()
+        self._bytes = 0
+        self._group: Optional[list] = None
+
+    def __len__(self) -> int:
+        """Return the number of undo and redo entries held."""
+        return len(self._undo) + len(self._redo)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @property
+    def size(self) -> int:
+        """Estimated bytes held by all entries."""
+        return self._bytes
+
+    def record(self, entry: tuple) -> None:
+        """Record the reverse of a new operation, discarding the redo stack."""
+        if self._group is not None:
+            self._group.append(entry)
+            return
+        while self._redo:
+            self._bytes -= self._redo.pop()[1]
+        self._push(self._undo, entry)
+
+    @contextmanager
+    def group(self) -> Iterator[None]:
+        """Coalesce everything recorded inside the context into one entry."""
+        if self._group is not None:
+            yield
+            return
+        self._group = []
+        try:
+            yield
+        finally:
+            entries, self._group = self._group, None
+            if len(entries) == 1:
+                self.record(entries[0])
+            elif entries:
+                # Undo the grouped operations newest first
+                self.record(("group", entries[::-1]))
+
+    def pop_undo(self) -> Optional[tuple]:
+        """Remove and return the newest undo entry, or None."""
+        return self._pop(self._undo)
+
+    def pop_redo(self) -> Optional[tuple]:
+        """Remove and return the newest redo entry, or None."""
+        return self._pop(self._redo)
+
+    def push_undo(self, entry: tuple) -> None:
+        """Push the reverse of a redone operation, keeping the redo stack."""
+        self._push(self._undo, entry)
+
+    def push_redo(self, entry: tuple) -> None:
+        """Push the reverse of an undone operation."""
+        self._push(self._redo, entry)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+
+    def _pop(self, stack: deque) -> Optional[tuple]:
+        if not stack:
+            return None
+        entry, size = stack.pop()
+        self._bytes -= size
+        return entry
+
+    def _push(self, stack: deque, entry: tuple) -> None:
+        size = entry_size(entry)
+        if size > self.max_bytes or not self.max_entries:
+            # Too large to keep. Nothing older than this operation can be
+            # replayed past it either, so those entries go too: the whole
+            # history for a new or redone operation, the redo stack for an
+            # undone one.
+            if stack is self._redo:
+                while self._redo:
+                    self._bytes -= self._redo.pop()[1]
+            else:
+                self.clear()
+            return
+        stack.append((entry, size))
+        self._bytes += size
+        # Evict the oldest undo entries first, then the furthest redo ones
+        while len(self) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = self._undo if self._undo else self._redo
+            self._bytes -= oldest.popleft()[1]
@@ -0,0 +1,225 @@
+"""Append-only journal with compacted snapshots for persisting a TodoManager."""
+import json
+import os
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Tuple
+
+from .models import Task
+
+if TYPE_CHECKING:
+    from .mapped import MappedSnapshot
+
+
+class Journal:
+    """
+    Durable storage for TodoManager mutations.
+
+    Every mutation is appended to a JSON-lines journal with a monotonically
+    increasing sequence number. Writes are group-committed: the file is
+    fsync'ed once every ``fsync_batch`` records instead of on every write.
+    Every ``snapshot_interval`` records the owning manager writes a compacted
+    snapshot of all tasks and the journal is truncated, so recovery only has
+    to replay the tail written after the last snapshot.
+
+    Snapshots are JSON lines by default. With snapshot_format="mapped" they
+    are binary files (see mapped.py) that a manager serves directly through
+    mmap, so a restart does not have to rebuild every task up front.
+
+    Attributes:
+        directory: Directory holding the journal and snapshot files
+        fsync_batch: Records per fsync (1 = every write, 0 = never fsync)
+        snapshot_interval: Records between snapshots (0 disables snapshots)
+        snapshot_format: "jsonl" or "mapped"
+    """
+
+    JOURNAL_FILE = "journal.jsonl"
+    SNAPSHOT_FILE = "snapshot.jsonl"
+    MAPPED_SNAPSHOT_FILE = "snapshot.map"
+    SNAPSHOT_FORMATS = ("jsonl", "mapped")
+
+    def __init__(self, directory: str, fsync_batch: int = 64, snapshot_interval: int = 100_000,
+                 snapshot_format: str = "jsonl"):
+        if fsync_batch < 0 or snapshot_interval < 0:
+            raise ValueError("fsync_batch and snapshot_interval cannot be negative")
+        if snapshot_format not in self.SNAPSHOT_FORMATS:
+            raise ValueError(f"Snapshot format must be one of: {', '.join(self.SNAPSHOT_FORMATS)}")
+        self.directory = directory
+        self.fsync_batch = fsync_batch
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_format = snapshot_format
+        self._journal_path = os.path.join(directory, self.JOURNAL_FILE)
+        self._snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self._mapped_path = os.path.join(directory, self.MAPPED_SNAPSHOT_FILE)
+        self._seq = 0
+        self._unsynced = 0
+        self._since_snapshot = 0
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the last record written or recovered."""
+        return self._seq
+
+    @property
+    def snapshot_due(self) -> bool:
+        """True once enough records were appended to warrant a new snapshot."""
+        return bool(self.snapshot_interval) and self._since_snapshot >= self.snapshot_interval
+
+    def read_snapshot(self) -> Tuple[int, Iterator[Task]]:
+        """
+        Read the last snapshot, if any.
+
+        Returns:
+            A tuple of the next task ID to allocate and an iterator over the
+            snapshot's tasks (in ID order). Returns (1, empty) if there is no
+            snapshot yet.
+        """
+        mapped = self.open_mapped_snapshot()
+        if mapped is not None:
+            def mapped_tasks() -> Iterator[Task]:
+                try:
+                    for position in range(len(mapped)):
+                        yield mapped.task_at(position)
+                finally:
+                    mapped.close()
+            return mapped.next_id, mapped_tasks()
+        if not os.path.exists(self._snapshot_path):
+            return 1, iter(())
+
+        handle = open(self._snapshot_path, "r", encoding="utf-8")
+        header = json.loads(handle.readline())
+        self._seq = header["seq"]
+
+        def tasks() -> Iterator[Task]:
+            with handle:
+                for line in handle:
+                    yield Task.from_dict(json.loads(line))
+
+        return header["next_id"], tasks()
+
+    def open_mapped_snapshot(self) -> Optional["MappedSnapshot"]:
+        """
+        Map the last snapshot, if there is one in the binary format.
+
+        Use this instead of read_snapshot() to serve tasks from the file
+        (see MappedBackend); read_tail() then replays what came after it.
+
+        Returns:
+            The mapped snapshot, which the caller must close, or None
+        """
+        if not os.path.exists(self._mapped_path):
+            return None
+        from .mapped import MappedSnapshot
+        snapshot = MappedSnapshot(self._mapped_path)
+        self._seq = snapshot.seq
+        return snapshot
+
+    def read_tail(self) -> Iterator[dict]:
+        """
+        Yield the journal records written after the last snapshot.
+
+        Must be called after read_snapshot(). A torn record at the end of the
+        journal (from a crash mid-write) is discarded and truncated away so
+        that new records are appended after the last complete one.
+        """
+        if not os.path.exists(self._journal_path):
+            return
+
+        good_offset = 0
+        with open(self._journal_path, "rb") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                good_offset += len(line)
+                if record["seq"] <= self._seq:
+                    continue
+                self._seq = record["seq"]
+                self._since_snapshot += 1
+                yield record
+
+        if good_offset < os.path.getsize(self._journal_path):
+            with open(self._journal_path, "r+b") as handle:
+                handle.truncate(good_offset)
+
+    def append(self, record: dict) -> int:
+        """
+        Append a mutation record to the journal.
+
+        Args:
+            record: A JSON-serializable dict describing the mutation
+
+        Returns:
+            The sequence number assigned to the record
+        """
+        if self._file is None:
+            self._file = open(self._journal_path, "a", encoding="utf-8")
+
+        self._seq += 1
+        record["seq"] = self._seq
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._since_snapshot += 1
+        self._unsynced += 1
+        if self.fsync_batch and self._unsynced >= self.fsync_batch:
+            self.sync()
+        return self._seq
+
+    def sync(self) -> None:
+        """Flush buffered records and fsync them to disk (group commit)."""
+        if self._file is None:
+            return
+        self._file.flush()
+        if self.fsync_batch:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def write_snapshot(self, tasks: Iterable[Task], next_id: int) -> None:
+        """
+        Write a compacted snapshot of all tasks and truncate the journal.
+
+        The snapshot is written to a temporary file and atomically renamed
+        into place, so a crash leaves either the old or the new snapshot.
+
+        Args:
+            tasks: Every live task, in ID order
+            next_id: The next task ID the manager will allocate
+        """
+        self.sync()
+        if self.snapshot_format == "mapped":
+            from .mapped import write_mapped_snapshot
+            path, stale_path = self._mapped_path, self._snapshot_path
+            tmp_path = path + ".tmp"
+            write_mapped_snapshot(tmp_path, tasks, next_id, self._seq)
+        else:
+            path, stale_path = self._snapshot_path, self._mapped_path
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                handle.write(json.dumps({"seq": self._seq, "next_id": next_id}) + "\n")
+                for task in tasks:
+                    handle.write(json.dumps(task.to_dict(), separators=(",", ":")) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+        # A mapped file that is replaced stays readable through existing maps
+        os.replace(tmp_path, path)
+        # Recovery prefers a mapped snapshot, so one left from an earlier
+        # format must not outlive the snapshot that supersedes it.
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+
+        # Records up to self._seq now live in the snapshot; any that survive a
+        # crash before this truncate are skipped on replay by sequence number.
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self._journal_path, "w", encoding="utf-8")
+        self._unsynced = 0
+        self._since_snapshot = 0
+
+    def close(self) -> None:
+        """Sync and close the journal file."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
@@ -1,132 +1,651 @@
 """Main CLI application for the todo app."""
 import sys
-import re
-from typing import List
+import time
+from collections.abc import Callable, Iterable
+from io import TextIOBase
+from types import SimpleNamespace
 from src.todo.manager import TodoManager
-from src.todo.exceptions import TaskNotFoundError
+from src.todo.exceptions import BulkOperationError, TaskNotFoundError
+from src.todo.history import History
+from src.todo.metrics import Metrics, Profiler, format_metrics
+from src.todo.render import RenderCache, format_task
 
+# Command parsers, compiled on first use rather than on every command;
+# "re" is only imported by the commands that need it
+_PATTERNS = {
+    "add": r'"([^"]*)"\s+"([^"]*)"',
+    "update": r'^(\d+)\s+"([^"]*)"\s+"([^"]*)"$',
+}
+_compiled: dict = {}
 
-def display_help():
+
+def _pattern(command: str):
+    """Return the compiled argument parser of a command."""
+    compiled = _compiled.get(command)
+    if compiled is None:
+        import re
+        compiled = _compiled[command] = re.compile(_PATTERNS[command])
+    return compiled
+
+# Default age of completed tasks moved by the archive command
+_ARCHIVE_AFTER_DAYS = 30
+
+# Command-line options: flag -> (dest, type, default, metavar, help). A type
+# of None marks an on/off switch.
+_OPTIONS = {
+    "--data-dir": ("data_dir", str, None, None,
+                   "Persist tasks to a journal in this directory (default: in-memory only)"),
+    "--db": ("db", str, None, "PATH", "Store tasks in a SQLite database at PATH instead of in memory"),
+    "--fsync-batch": ("fsync_batch", int, 64, None, "Journal records per fsync (1 = every write, 0 = never)"),
+    "--snapshot-interval": ("snapshot_interval", int, 100_000, None,
+                            "Journal records between compacted snapshots (0 = never)"),
+    "--snapshot-format": ("snapshot_format", str, "jsonl", None,
+                          "Journal snapshot format: jsonl, or mapped to restart without loading every task"),
+    "--script": ("script", str, None, "FILE", "Run commands from FILE ('-' for stdin) without prompts, then exit"),
+    "--archive-dir": ("archive_dir", str, None, None,
+                      "Archive old completed tasks to compressed segments in this directory (see 'archive')"),
+    "--render-cache": ("render_cache", int, 100_000, "LINES",
+                       "Most formatted task lines kept to speed up repeated listings (0 = no cache)"),
+    "--undo-limit": ("undo_limit", int, 1000, None, "Most changes kept for undo/redo (0 = no undo history)"),
+    "--metrics": ("metrics", None, False, None,
+                  "Record call counts and latencies of every operation (see 'stats')"),
+    "--profile": ("profile", str, None, "FILE",
+                  "Profile the run with cProfile and tracemalloc; write a report to FILE on exit"),
+}
+
+
+class BufferedOutput:
+    """
+    Output sink that collects lines and writes them to a stream in chunks.
+
+    Used in script mode, where one write per output line would dominate the
+    cost of cheap commands.
+    """
+
+    def __init__(self, stream: TextIOBase, max_lines: int = 4096):
+        self._stream = stream
+        self._lines: list[str] = []
+        self._max_lines = max_lines
+
+    def __call__(self, line: str = "") -> None:
+        """Queue a line of output, flushing once enough have accumulated."""
+        self._lines.append(line)
+        if len(self._lines) >= self._max_lines:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all queued lines to the stream."""
+        if self._lines:
+            self._stream.write("\n".join(self._lines) + "\n")
+            self._lines.clear()
+        self._stream.flush()
+
+
+def display_help(out: Callable[[str], None] = print):
     """Display available commands."""
-    print("Available commands:")
-    print("  add \"title\" \"description\"    - Add a new task")
-    print("  list                         - View all tasks")
-    print("  update id \"title\" \"description\" - Update a task")
-    print("  complete id                  - Mark a task as complete")
-    print("  delete id                    - Delete a task")
-    print("  help                         - Show this help message")
-    print("  quit                         - Exit the application")
-
-
-def display_tasks(tasks):
-    """Display tasks in a formatted list."""
-    if not tasks:
-        print("No tasks found.")
-        return
+    out("Available commands:")
+    out("  add \"title\" \"description\"    - Add a new task")
+    out("  list [query]                 - View tasks, e.g. list where status=pending order by id desc limit 50")
+    out("  search \"query\"               - Find tasks by title or description")
+    out("  update id \"title\" \"description\" - Update a task")
+    out("  complete ids                 - Mark tasks as complete (e.g. 3, 1-500, 3,7,9)")
+    out("  delete ids                   - Delete tasks (e.g. 3, 1-500, 3,7,9)")
+    out("  priority id level            - Set priority: none, low, medium, high (or 0-3)")
+    out("  due id YYYY-MM-DD            - Set a due date ('due id none' clears it)")
+    out("  next [n]                     - Show the n pending tasks to do next (default 5)")
+    out("  overdue                      - Show pending tasks past their due date")
+    out("  due-between start end        - Show pending tasks due between two dates")
+    out("  import file                  - Import tasks from a .csv or .jsonl file")
+    out("  export file                  - Export all tasks to a .csv or .jsonl file")
+    out("  tag id tag [tag ...]         - Add tags to a task")
+    out("  untag id tag [tag ...]       - Remove tags from a task")
+    out("  project id name              - Move a task to a project ('project id none' clears it)")
+    out("  filter query                 - Find tasks, e.g. filter pending tag:urgent and not tag:blocked")
+    out("  explain query                - Show how 'list query' would find its tasks")
+    out("  archive [days]               - Archive tasks completed more than days (default 30) ago")
+    out("  undo                         - Undo the last change")
+    out("  redo                         - Redo the last undone change")
+    out("  stats                        - Show task counts and operation metrics")
+    out("  help                         - Show this help message")
+    out("  quit                         - Exit the application")
 
+
+def display_tasks(tasks, page_size: int = 1000, out: Callable[[str], None] = print,
+                  cache: RenderCache | None = None):
+    """
+    Display tasks in a formatted list.
+
+    Accepts any iterable (such as TodoManager.iter_tasks()) and outputs it a
+    page at a time, so the full task list is never built in memory. With a
+    cache, only tasks whose lines are not cached are formatted.
+    """
+    render = format_task if cache is None else cache.line
+    page = []
+    shown = False
     for task in tasks:
-        status_indicator = "[x]" if task.status == "completed" else "[ ]"
-        print(f"{task.id}. {status_indicator} {task.title} - {task.description}")
+        page.append(render(task))
+        if len(page) >= page_size:
+            out("\n".join(page))
+            page.clear()
+            shown = True
+
+    if page:
+        out("\n".join(page))
+    elif not shown:
+        out("No tasks found.")
+
+
+def display_stats(todo_manager: TodoManager, out: Callable[[str], None] = print):
+    """Display task counts and, when enabled, per-operation metrics."""
+    counts = todo_manager.stats()
+    line = f"Tasks: {counts['total']} total, {counts['pending']} pending, {counts['completed']} completed"
+    out(line + (f", {counts['archived']} archived" if "archived" in counts else ""))
+    if todo_manager.metrics is None:
+        out("Operation metrics are off (start with --metrics or --profile).")
+    else:
+        out("\n".join(format_metrics(todo_manager.metrics.snapshot())))
+
+
+def parse_args(argv: list[str]) -> SimpleNamespace:
+    """
+    Parse command-line options.
+
+    Ordinary option lists are read straight from the _OPTIONS table.
+    argparse, which takes several milliseconds to import and set up, is
+    only built for --help, abbreviated options and errors.
+    """
+    values = {dest: default for dest, _, default, _, _ in _OPTIONS.values()}
+    position = 0
+    while position < len(argv):
+        option = _OPTIONS.get(argv[position])
+        if option is None:
+            return _parse_args_slow(argv)
+        dest, kind = option[0], option[1]
+        if kind is None:
+            values[dest] = True
+            position += 1
+            continue
+        if position + 1 == len(argv) or argv[position + 1].startswith("--"):
+            return _parse_args_slow(argv)
+        try:
+            values[dest] = kind(argv[position + 1])
+        except ValueError:
+            return _parse_args_slow(argv)
+        position += 2
+    if values["db"] and values["data_dir"]:
+        return _parse_args_slow(argv)
+    return SimpleNamespace(**values)
+
+
+def _parse_args_slow(argv: list[str]) -> SimpleNamespace:
+    """Parse options with argparse, for help output and error reporting."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="todo", description="Todo App")
+    for flag, (dest, kind, default, metavar, help_text) in _OPTIONS.items():
+        if kind is None:
+            parser.add_argument(flag, action="store_true", help=help_text)
+        else:
+            parser.add_argument(flag, type=kind, default=default, metavar=metavar, help=help_text)
+    args = parser.parse_args(argv)
+    if args.db and args.data_dir:
+        # A SQLite database is already durable; replaying a journal into it
+        # on the next start would add every task a second time
+        parser.error("--db and --data-dir cannot be used together")
+    return SimpleNamespace(**vars(args))
+
+
+def parse_ids(spec: str, next_id: int | None = None) -> list[int]:
+    """
+    Parse a task ID list such as "3", "1-500", "3,7,9-12" or "3 7".
+
+    IDs and ranges are separated by commas and/or whitespace.
+
+    Args:
+        spec: The ID list
+        next_id: If given, ranges must end below this ID (the next one the
+            manager would allocate), so a typo cannot expand to billions
+
+    Returns:
+        The task IDs in the order given, without duplicates
+
+    Raises:
+        ValueError: If the spec is malformed, or a range is reversed or
+            ends at or after next_id
+    """
+    import re
+
+    task_ids = {}
+    for part in re.split(r"[,\s]+", spec.strip()):
+        start, sep, end = part.partition("-")
+        try:
+            first = int(start)
+            last = int(end) if sep else first
+        except ValueError:
+            raise ValueError(f"Invalid task ID: {part!r}") from None
+        if not sep:
+            task_ids[first] = None
+            continue
+        if first > last:
+            raise ValueError(f"Invalid range: {part}")
+        if next_id is not None and last >= next_id:
+            raise ValueError(f"Range {part} goes past the last task ID ({next_id - 1})")
+        task_ids.update(dict.fromkeys(range(first, last + 1)))
+    return list(task_ids)
+
 
+def display_bulk_errors(error: BulkOperationError, max_lines: int = 10, out: Callable[[str], None] = print):
+    """Display a failed bulk operation and the first few per-item errors."""
+    out(f"Error: {error}")
+    for item, message in list(error.errors.items())[:max_lines]:
+        out(f"  {item}: {message}")
+    if len(error.errors) > max_lines:
+        out(f"  ... and {len(error.errors) - max_lines} more")
 
-def main():
+
+def main(argv: list[str] | None = None):
     """Main application loop."""
-    print("Welcome to the Todo App!")
-    print("Type 'help' for available commands or 'quit' to exit.")
+    args = parse_args(argv or [])
+
+    journal = None
+    if args.data_dir:
+        from src.todo.journal import Journal
+        journal = Journal(args.data_dir, fsync_batch=args.fsync_batch,
+                          snapshot_interval=args.snapshot_interval, snapshot_format=args.snapshot_format)
+    backend = None
+    if args.db:
+        from src.todo.sqlite_backend import SQLiteBackend
+        backend = SQLiteBackend(args.db)
+    profiler = Profiler(args.profile) if args.profile else None
+    metrics = Metrics() if args.metrics or profiler else None
+    if profiler:
+        profiler.start()
+    archive = None
+    if args.archive_dir:
+        from src.todo.archive import ColdStore
+        archive = ColdStore(args.archive_dir)
+    history = History(max_entries=args.undo_limit) if args.undo_limit > 0 else None
+    render_cache = RenderCache(max_lines=args.render_cache) if args.render_cache > 0 else None
+    todo_manager = TodoManager(journal=journal, backend=backend, metrics=metrics, history=history,
+                               lazy_indexes=args.snapshot_format == "mapped", archive=archive,
+                               render_cache=render_cache)
+    try:
+        if args.script == "-":
+            run_script(todo_manager, sys.stdin)
+        elif args.script:
+            with open(args.script, "r", encoding="utf-8") as script:
+                run_script(todo_manager, script)
+        else:
+            print("Welcome to the Todo App!")
+            print("Type 'help' for available commands or 'quit' to exit.")
+            _run_loop(todo_manager)
+    finally:
+        todo_manager.close()
+        if profiler:
+            profiler.stop(metrics)
+
+
+def execute_command(todo_manager: TodoManager, command_input: str, out: Callable[[str], None] = print) -> bool:
+    """
+    Execute a single command.
+
+    The first word is looked up in the command table, so dispatch costs
+    one dict lookup however many commands there are.
+
+    Args:
+        todo_manager: The manager to run the command against
+        command_input: The stripped, non-empty command line
+        out: Called with each line (or block of lines) of output
+
+    Returns:
+        False if the command was "quit", True otherwise
+    """
+    parts = command_input.split(maxsplit=1)
+    word = parts[0].lower() if parts else ""
+    args = parts[1] if len(parts) > 1 else ""
+    command = _COMMAND_TABLE.get(word)
+    if command is None or (command[1] != _OPTIONAL_ARGS and (command[1] == _ARGS) != bool(args)):
+        command, word = _UNKNOWN_COMMAND, parts[0] if parts else command_input
+    handler = command[0]
+    metrics = todo_manager.metrics
+    if metrics is None:
+        return handler(todo_manager, word, args, out) is not False
+    start = time.perf_counter()
+    try:
+        return handler(todo_manager, word, args, out) is not False
+    finally:
+        metrics.record(command[2], time.perf_counter() - start)
+
+
+# Whether a command takes arguments: never, always, or optionally. A command
+# line that does not fit is reported as an unknown command.
+_NO_ARGS, _ARGS, _OPTIONAL_ARGS = range(3)
+
+# Command word -> (handler, arity, metric name), filled in by @_command.
+# Handlers are called as handler(todo_manager, word, args, out), where word
+# is the lowercased command word and args the rest of the line; returning
+# False stops the session.
+_COMMAND_TABLE: dict[str, tuple] = {}
+
+
+def _command(*words: str, arity: int = _ARGS):
+    """Register the decorated function as the handler for the given command words."""
+    def register(handler):
+        for word in words:
+            _COMMAND_TABLE[word] = (handler, arity, f"cli.{word}")
+        return handler
+    return register
+
+
+def _unknown_command(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    out(f"Unknown command: {word}. Type 'help' for available commands.")
 
-    todo_manager = TodoManager()
 
+_UNKNOWN_COMMAND = (_unknown_command, _OPTIONAL_ARGS, "cli.unknown")
+
+
+@_command("add")
+def _add(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    match = _pattern("add").match(args)
+    if not match:
+        out("Invalid add command format. Use: add \"title\" \"description\"")
+        return
+    title, description = match.groups()
+    try:
+        task_id = todo_manager.add_task(title, description)
+        out(f"Added task #{task_id}: {title}")
+    except ValueError as e:
+        out(f"Error: {e}")
+
+
+@_command("list", arity=_OPTIONAL_ARGS)
+def _list(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    cache = todo_manager.render_cache
+    # A listing unchanged since the last identical command is output whole
+    text = cache.page(args) if cache is not None else None
+    if text is not None:
+        out(text)
+        return
+    try:
+        tasks = todo_manager.query(args) if args else todo_manager.iter_tasks()
+    except ValueError as e:
+        out(f"Error: {e}")
+        return
+    if cache is None:
+        display_tasks(tasks, out=out)
+        return
+    pages = []
+    display_tasks(tasks, out=pages.append, cache=cache)
+    text = "\n".join(pages)
+    cache.store_page(args, text)
+    out(text)
+
+
+@_command("explain")
+def _explain(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    # "explain list where ..." reads naturally too
+    if args.split(maxsplit=1)[0].lower() == "list":
+        args = args[4:].strip()
+    try:
+        out("\n".join(todo_manager.explain(args)))
+    except ValueError as e:
+        out(f"Error: {e}")
+
+
+@_command("search")
+def _search(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    query = args.strip().strip('"')
+    tasks = todo_manager.search(query)
+    if tasks:
+        display_tasks(tasks, out=out, cache=todo_manager.render_cache)
+    else:
+        out(f"No tasks matching \"{query}\".")
+
+
+@_command("complete")
+def _complete(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    try:
+        task_ids = parse_ids(args, todo_manager.next_id)
+    except ValueError as e:
+        out(f"Invalid complete command format ({e}). Use: complete id (or ranges/lists like 1-5,8)")
+        return
+    if len(task_ids) == 1:
+        task_id = task_ids[0]
+        try:
+            success = todo_manager.mark_complete(task_id)
+            if success:
+                out(f"Task #{task_id} marked as complete")
+            else:
+                out(f"Failed to mark task #{task_id} as complete")
+        except TaskNotFoundError:
+            out(f"Task with ID {task_id} not found")
+    else:
+        try:
+            count = todo_manager.mark_complete_many(task_ids)
+            out(f"{count} tasks marked as complete")
+        except BulkOperationError as e:
+            display_bulk_errors(e, out=out)
+
+
+@_command("update")
+def _update(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    # update id "new title" "new description"
+    update_match = _pattern("update").match(args)
+    if not update_match:
+        out("Invalid update command format. Use: update id \"new title\" \"new description\"")
+        return
+    task_id, new_title, new_description = update_match.groups()
+    try:
+        task_id = int(task_id)
+        success = todo_manager.update_task(task_id, new_title, new_description)
+        if success:
+            out(f"Task #{task_id} updated successfully")
+        else:
+            out(f"Failed to update task #{task_id}")
+    except ValueError as e:
+        out(f"Error: {e}")
+    except TaskNotFoundError:
+        out(f"Task with ID {task_id} not found")
+
+
+@_command("delete")
+def _delete(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    try:
+        task_ids = parse_ids(args, todo_manager.next_id)
+    except ValueError as e:
+        out(f"Invalid delete command format ({e}). Use: delete id (or ranges/lists like 1-5,8)")
+        return
+    if len(task_ids) == 1:
+        task_id = task_ids[0]
+        try:
+            success = todo_manager.delete_task(task_id)
+            if success:
+                out(f"Task #{task_id} deleted successfully")
+            else:
+                out(f"Failed to delete task #{task_id}")
+        except TaskNotFoundError:
+            out(f"Task with ID {task_id} not found")
+    else:
+        try:
+            count = todo_manager.delete_many(task_ids)
+            out(f"{count} tasks deleted successfully")
+        except BulkOperationError as e:
+            display_bulk_errors(e, out=out)
+
+
+@_command("import", "export")
+def _transfer(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    path = args.strip().strip('"')
+    try:
+        if word == "import":
+            count = todo_manager.import_tasks(path)
+            out(f"Imported {count} tasks from {path}")
+        else:
+            count = todo_manager.export_tasks(path)
+            out(f"Exported {count} tasks to {path}")
+    except BulkOperationError as e:
+        display_bulk_errors(e, out=out)
+    except (OSError, ValueError) as e:
+        out(f"Error: {e}")
+
+
+@_command("priority")
+def _priority(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    parts = args.split()
+    if len(parts) != 2 or not parts[0].isdigit():
+        out("Invalid priority command format. Use: priority id level")
+        return
+    task_id = int(parts[0])
+    try:
+        todo_manager.set_priority(task_id, parts[1])
+        out(f"Task #{task_id} priority set to {todo_manager.get_task(task_id).priority.name.lower()}")
+    except ValueError as e:
+        out(f"Error: {e}")
+    except TaskNotFoundError:
+        out(f"Task with ID {task_id} not found")
+
+
+@_command("due")
+def _due(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    parts = args.split()
+    if len(parts) != 2 or not parts[0].isdigit():
+        out("Invalid due command format. Use: due id YYYY-MM-DD (or none)")
+        return
+    task_id = int(parts[0])
+    due = None if parts[1].lower() == "none" else parts[1]
+    try:
+        todo_manager.set_due(task_id, due)
+        out(f"Task #{task_id} due date {'cleared' if due is None else f'set to {due}'}")
+    except ValueError as e:
+        out(f"Error: {e}")
+    except TaskNotFoundError:
+        out(f"Task with ID {task_id} not found")
+
+
+@_command("next", arity=_OPTIONAL_ARGS)
+def _next(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    parts = args.split()
+    if len(parts) > 1 or (parts and not parts[0].isdigit()):
+        out("Invalid next command format. Use: next [n]")
+        return
+    display_tasks(todo_manager.next_tasks(int(parts[0]) if parts else 5), out=out, cache=todo_manager.render_cache)
+
+
+@_command("overdue", arity=_NO_ARGS)
+def _overdue(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    display_tasks(todo_manager.overdue(), out=out, cache=todo_manager.render_cache)
+
+
+@_command("due-between")
+def _due_between(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    parts = args.split()
+    if len(parts) != 2:
+        out("Invalid due-between command format. Use: due-between YYYY-MM-DD YYYY-MM-DD")
+        return
+    try:
+        display_tasks(todo_manager.due_between(parts[0], parts[1]), out=out, cache=todo_manager.render_cache)
+    except ValueError as e:
+        out(f"Error: {e}")
+
+
+@_command("tag", "untag")
+def _tag(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    parts = args.split()
+    if len(parts) < 2 or not parts[0].isdigit():
+        out(f"Invalid {word} command format. Use: {word} id tag [tag ...]")
+        return
+    task_id = int(parts[0])
+    try:
+        if word == "tag":
+            todo_manager.tag_task(task_id, parts[1:])
+        else:
+            todo_manager.untag_task(task_id, parts[1:])
+        tags = todo_manager.get_task(task_id).tags
+        out(f"Task #{task_id} tags: {' '.join(tags) if tags else '(none)'}")
+    except ValueError as e:
+        out(f"Error: {e}")
+    except TaskNotFoundError:
+        out(f"Task with ID {task_id} not found")
+
+
+@_command("project")
+def _project(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    parts = args.split()
+    if len(parts) != 2 or not parts[0].isdigit():
+        out("Invalid project command format. Use: project id name (or none)")
+        return
+    task_id = int(parts[0])
+    project = None if parts[1].lower() == "none" else parts[1]
+    try:
+        todo_manager.set_project(task_id, project)
+        project = todo_manager.get_task(task_id).project
+        out(f"Task #{task_id} {f'moved to project {project}' if project else 'removed from its project'}")
+    except ValueError as e:
+        out(f"Error: {e}")
+    except TaskNotFoundError:
+        out(f"Task with ID {task_id} not found")
+
+
+@_command("filter")
+def _filter(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    try:
+        display_tasks(todo_manager.filter_tasks(args), out=out, cache=todo_manager.render_cache)
+    except ValueError as e:
+        out(f"Error: {e}")
+
+
+@_command("archive", arity=_OPTIONAL_ARGS)
+def _archive(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    try:
+        days = float(args) if args else _ARCHIVE_AFTER_DAYS
+        if days < 0:
+            raise ValueError
+    except ValueError:
+        out("Invalid archive command format. Use: archive [days]")
+        return
+    try:
+        count = todo_manager.archive_completed(days * 86400)
+    except ValueError as e:
+        out(f"Error: {e} (start with --archive-dir)")
+        return
+    out(f"{count} tasks archived")
+
+
+@_command("undo", arity=_NO_ARGS)
+def _undo(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    out("Undid the last change" if todo_manager.undo() else "Nothing to undo")
+
+
+@_command("redo", arity=_NO_ARGS)
+def _redo(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    out("Redid the last undone change" if todo_manager.redo() else "Nothing to redo")
+
+
+@_command("stats", arity=_NO_ARGS)
+def _stats(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    display_stats(todo_manager, out=out)
+
+
+@_command("help", arity=_NO_ARGS)
+def _help(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> None:
+    display_help(out=out)
+
+
+@_command("quit", arity=_NO_ARGS)
+def _quit(todo_manager: TodoManager, word: str, args: str, out: Callable[[str], None]) -> bool:
+    return False
+
+
+def _run_loop(todo_manager: TodoManager):
+    """Read and execute commands interactively until the user quits."""
     while True:
         try:
             command_input = input("\n> ").strip()
             if not command_input:
                 continue
-
-            # Use regex to handle quoted arguments
-            pattern = r'add\s+"([^"]*)"\s+"([^"]*)"'
-            match = re.match(pattern, command_input)
-
-            if command_input.lower().startswith("add "):
-                if match:
-                    title, description = match.groups()
-                    try:
-                        task_id = todo_manager.add_task(title, description)
-                        print(f"Added task #{task_id}: {title}")
-                    except ValueError as e:
-                        print(f"Error: {e}")
-                else:
-                    print("Invalid add command format. Use: add \"title\" \"description\"")
-            elif command_input.lower() == "list":
-                tasks = todo_manager.get_all_tasks()
-                display_tasks(tasks)
-            elif command_input.lower().startswith("complete "):
-                parts = command_input.split()
-                if len(parts) != 2:
-                    print("Invalid complete command format. Use: complete id")
-                else:
-                    try:
-                        task_id = int(parts[1])
-                        success = todo_manager.mark_complete(task_id)
-                        if success:
-                            print(f"Task #{task_id} marked as complete")
-                        else:
-                            print(f"Failed to mark task #{task_id} as complete")
-                    except ValueError:
-                        print("Task ID must be a number")
-                    except TaskNotFoundError:
-                        print(f"Task with ID {parts[1]} not found")
-            elif command_input.lower().startswith("update "):
-                # Parse update command: update id "new title" "new description"
-                parts = command_input.split(maxsplit=1)
-                if len(parts) < 2:
-                    print("Invalid update command format. Use: update id \"new title\" \"new description\"")
-                    continue
-
-                # Extract the arguments after "update"
-                args_str = parts[1]
-                # Use regex to parse ID, title, and description
-                update_pattern = r'^(\d+)\s+"([^"]*)"\s+"([^"]*)"$'
-                update_match = re.match(update_pattern, args_str)
-
-                if update_match:
-                    task_id, new_title, new_description = update_match.groups()
-                    try:
-                        task_id = int(task_id)
-                        success = todo_manager.update_task(task_id, new_title, new_description)
-                        if success:
-                            print(f"Task #{task_id} updated successfully")
-                        else:
-                            print(f"Failed to update task #{task_id}")
-                    except ValueError as e:
-                        print(f"Error: {e}")
-                    except TaskNotFoundError:
-                        print(f"Task with ID {task_id} not found")
-                else:
-                    print("Invalid update command format. Use: update id \"new title\" \"new description\"")
-            elif command_input.lower().startswith("delete "):
-                parts = command_input.split()
-                if len(parts) != 2:
-                    print("Invalid delete command format. Use: delete id")
-                else:
-                    try:
-                        task_id = int(parts[1])
-                        success = todo_manager.delete_task(task_id)
-                        if success:
-                            print(f"Task #{task_id} deleted successfully")
-                        else:
-                            print(f"Failed to delete task #{task_id}")
-                    except ValueError:
-                        print("Task ID must be a number")
-                    except TaskNotFoundError:
-                        print(f"Task with ID {parts[1]} not found")
-            elif command_input.lower() == "quit":
+            if not execute_command(todo_manager, command_input):
                 print("Goodbye!")
                 break
-            elif command_input.lower() == "help":
-                display_help()
-            else:
-                print(f"Unknown command: {command_input.split()[0] if command_input.split() else command_input}. Type 'help' for available commands.")
-
         except KeyboardInterrupt:
             print("\nGoodbye!")
             break
@@ -135,5 +654,30 @@ def main():
             break
 
 
+def run_script(todo_manager: TodoManager, lines: Iterable[str], stream: TextIOBase | None = None):
+    """
+    Execute commands non-interactively, without prompts or banners.
+
+    Blank lines and lines starting with "#" are skipped, and a "quit"
+    command stops the script early. Output is buffered and written to the
+    stream in large chunks rather than one write per line.
+
+    Args:
+        todo_manager: The manager to run the commands against
+        lines: Command lines, e.g. an open script file or sys.stdin
+        stream: Where to write output (default: sys.stdout)
+    """
+    out = BufferedOutput(stream if stream is not None else sys.stdout)
+    try:
+        for line in lines:
+            command_input = line.strip()
+            if not command_input or command_input.startswith("#"):
+                continue
+            if not execute_command(todo_manager, command_input, out):
+                break
+    finally:
+        out.flush()
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1:])
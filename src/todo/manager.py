@@ -1,7 +1,28 @@
 """TodoManager class to handle in-memory todo logic."""
-from typing import List, Optional
-from .models import Task
-from .exceptions import TaskNotFoundError
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import date
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Mapping, Optional, Union
+from .bitmap import BitmapIndex, decode, parse_filter
+from .models import (Task, TaskSnapshot, TaskStatus, Priority, STATUSES, parse_due, parse_label, parse_priority,
+                     parse_tags)
+from .exceptions import BulkOperationError, TaskNotFoundError, VersionConflictError
+from .changes import Change, ChangeFeed
+from .history import History, pack_ids
+from .metrics import Metrics
+from .schedule import ScheduleIndex
+from .search import SearchIndex, tokenize
+from .storage import MemoryBackend, StorageBackend
+
+if TYPE_CHECKING:
+    # Only needed for annotations; the journal (and json) load when one is used
+    from .archive import ColdStore
+    from .journal import Journal
+    from .query import Plan
+    from .render import RenderCache
 
 
 class TodoManager:
@@ -10,32 +31,328 @@ class TodoManager:
     update, view, and mark tasks as complete.
     """
 
-    def __init__(self):
-        """Initialize the TodoManager with an empty task collection."""
-        self._tasks: dict[int, Task] = {}
-        self._next_id: int = 1
+    def __init__(self, journal: Optional["Journal"] = None, compact: bool = False,
+                 backend: Optional[StorageBackend] = None, search_index: bool = True,
+                 metrics: Optional[Metrics] = None, history: Optional[History] = None,
+                 changes: Optional[ChangeFeed] = None, lazy_indexes: bool = False,
+                 archive: Optional["ColdStore"] = None, render_cache: Optional["RenderCache"] = None):
+        """
+        Initialize the TodoManager.
 
-    def add_task(self, title: str, description: str = "") -> int:
+        Args:
+            journal: Optional journal to persist mutations to. If given, the
+                task collection is first recovered from its last snapshot
+                and journal tail.
+            compact: Intern task titles and descriptions so that repeated
+                strings (common in bulk imports) are stored only once
+            backend: Where tasks are stored (default: an in-memory
+                MemoryBackend). Tasks already in a persistent backend are
+                picked up as-is; use a journal only with an empty backend.
+            search_index: Keep an in-memory full-text index for search().
+                Disable it for backends larger than RAM; search() then
+                scans the backend instead.
+            metrics: Record call counts and latencies of every public
+                method here. Without it, methods run uninstrumented.
+            history: Record every change here so it can be undone and
+                redone. Without it, changes are permanent.
+            changes: Publish every change to this feed for incremental
+                consumers (see changes_since and subscribe)
+            lazy_indexes: Build the search, schedule and bitmap indexes on
+                the first query that needs them rather than up front, which
+                would read every task. Pairs with a journal that keeps
+                mapped snapshots, so that starting up touches no tasks.
+            archive: Cold store that archive_completed moves old completed
+                tasks to. get_task still finds them there. Reopen a
+                journaled manager with the same archive.
+            render_cache: Cache of formatted task lines and listings for
+                the CLI, invalidated here whenever a task is added,
+                changed or removed
+        """
+        self._tasks: StorageBackend = backend if backend is not None else MemoryBackend()
+        self._next_id: int = self._tasks.next_id()
+        self._journal = journal
+        self._compact = compact
+        self._search = SearchIndex() if search_index else None
+        self._schedule = ScheduleIndex()
+        self._bitmaps = BitmapIndex()
+        # Whether the derived indexes above reflect the stored tasks yet;
+        # set only once they are complete
+        self._indexed = False
+        # Held while building them, since queries that trigger the build
+        # may run in parallel under ConcurrentTodoManager's read lock
+        self._index_lock = threading.Lock()
+        # Immutable copies of tasks handed out by read_task, dropped when
+        # a task changes; never updated in place, so they can be read
+        # without a lock
+        self._frozen: dict[int, TaskSnapshot] = {}
+        # Nesting depth of _batch; journal snapshots wait until it is zero
+        self._batching = 0
+        self._history = history
+        self._changes = changes
+        self._archive = archive
+        self.render_cache = render_cache
+
+        if journal is not None:
+            self._recover()
+        if not lazy_indexes:
+            self._build_indexes()
+
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.instrument(self, [
+                name for name, value in vars(TodoManager).items()
+                if not name.startswith("_") and callable(value)
+            ])
+
+    def _recover(self) -> None:
+        """Rebuild the task collection from the journal's snapshot and tail."""
+        mapped = None
+        if (self._journal.snapshot_format == "mapped" and isinstance(self._tasks, MemoryBackend)
+                and not len(self._tasks)):
+            mapped = self._journal.open_mapped_snapshot()
+        if mapped is not None:
+            # Serve the snapshot from the mapped file instead of loading it
+            from .mapped import MappedBackend
+            self._tasks = MappedBackend(mapped)
+            next_id = mapped.next_id
+        else:
+            next_id, tasks = self._journal.read_snapshot()
+            for task in tasks:
+                self._insert(task)
+        self._next_id = max(next_id, self._tasks.next_id())
+        for record in self._journal.read_tail():
+            self._apply(record)
+
+    def _apply(self, record: dict) -> None:
+        """Apply a journal record to the task collection without re-logging it."""
+        op = record["op"]
+        if op == "add":
+            task = Task.from_dict(record["task"])
+            self._insert(task)
+            self._next_id = max(self._next_id, task.id + 1)
+        elif op == "update":
+            self._set_text(self._tasks[record["id"]], record.get("title"), record.get("description"))
+        elif op == "complete":
+            self._set_status(self._tasks[record["id"]], TaskStatus.COMPLETED, record.get("at"))
+        elif op == "status":
+            self._set_status(self._tasks[record["id"]], TaskStatus(record["status"]), record.get("at"))
+        elif op == "labels":
+            self._set_labels(self._tasks[record["id"]], parse_tags(record["tags"]), parse_label(record["project"]))
+        elif op == "schedule":
+            self._set_schedule(self._tasks[record["id"]], Priority(record["priority"]), parse_due(record["due"]))
+        elif op == "delete":
+            self._remove(record["id"])
+        elif op == "archive":
+            # The task was written to the archive before this record
+            self._remove(record["id"])
+        else:
+            raise ValueError(f"Unknown journal operation: {op}")
+
+    def _insert(self, task: Task) -> None:
+        """Store a new task and add it to the derived indexes."""
+        if self._compact:
+            task.title = sys.intern(task.title)
+            task.description = sys.intern(task.description)
+        self._tasks.put(task)
+        self._index(task)
+        self._changed(task.id)
+
+    def _insert_many(self, tasks: List[Task]) -> None:
+        """Store a batch of new tasks in one backend call and index them."""
+        if self._compact:
+            for task in tasks:
+                task.title = sys.intern(task.title)
+                task.description = sys.intern(task.description)
+        self._tasks.put_many(tasks)
+        for task in tasks:
+            self._index(task)
+            self._changed(task.id)
+
+    def _build_indexes(self) -> None:
+        """Index every stored task, unless that was done already."""
+        if self._indexed:
+            return
+        with self._index_lock:
+            if self._indexed:
+                return
+            for task in self._tasks.scan():
+                self._add_to_indexes(task)
+            self._indexed = True
+
+    def _index(self, task: Task) -> None:
+        """Add a stored task to the search, schedule and bitmap indexes, once they are built."""
+        if self._indexed:
+            self._add_to_indexes(task)
+
+    def _add_to_indexes(self, task: Task) -> None:
+        if self._search is not None:
+            self._search.add(task.id, task.title, task.description)
+        if task.priority or task.due:
+            self._schedule.add(task)
+        self._bitmaps.add(task.id, _bitmap_keys(task))
+
+    def _remove(self, task_id: int) -> Task:
+        """Remove a task from the backend and the derived indexes."""
+        task = self._tasks.delete(task_id)
+        self._unindex(task)
+        return task
+
+    def _unindex(self, task: Task) -> None:
+        """Remove a task that is no longer stored from the derived indexes."""
+        self._changed(task.id)
+        if not self._indexed:
+            return
+        if self._search is not None:
+            self._search.remove(task.id)
+        self._schedule.remove(task.id)
+        self._bitmaps.remove(task.id, _bitmap_keys(task))
+
+    def _changed(self, task_id: int) -> None:
+        """Drop what was derived from a task that was added, changed or removed."""
+        self._frozen.pop(task_id, None)
+        if self.render_cache is not None:
+            self.render_cache.invalidate(task_id)
+
+    def _set_text(self, task: Task, title: Optional[str], description: Optional[str]) -> None:
+        """Replace a task's title and/or description, save it, and re-index it."""
+        if title is not None:
+            task.title = sys.intern(title) if self._compact else title
+        if description is not None:
+            task.description = sys.intern(description) if self._compact else description
+        task.version += 1
+        self._tasks.save(task)
+        self._changed(task.id)
+        if self._indexed and self._search is not None:
+            self._search.update(task.id, task.title, task.description)
+
+    def _set_status(self, task: Task, status: TaskStatus, completed_at: Optional[float] = None) -> None:
+        """Change a task's status and save it, stamping completions (now, unless given)."""
+        if task.status == status:
+            return
+        previous = task.status
+        task.status = status
+        if status == TaskStatus.COMPLETED:
+            task.completed_at = time.time() if completed_at is None else completed_at
+        else:
+            task.completed_at = None
+        task.version += 1
+        self._tasks.save(task, previous)
+        self._changed(task.id)
+        if not self._indexed:
+            return
+        if task.priority or task.due:
+            self._schedule.update(task)
+        self._bitmaps.replace(task.id, (_STATUS_KEYS[previous],), (_STATUS_KEYS[status],))
+
+    def _set_schedule(self, task: Task, priority: Priority, due: Optional[date]) -> None:
+        """Change a task's priority and due date, save it, and re-index it."""
+        task.priority = priority
+        task.due = due
+        task.version += 1
+        self._tasks.save(task)
+        self._changed(task.id)
+        if self._indexed:
+            self._schedule.update(task)
+
+    def _set_labels(self, task: Task, tags: tuple, project: str) -> None:
+        """Change a task's tags and project, save it, and re-index it."""
+        old_keys = _bitmap_keys(task)
+        task.tags = tags
+        task.project = project
+        task.version += 1
+        self._tasks.save(task)
+        self._changed(task.id)
+        if self._indexed:
+            self._bitmaps.replace(task.id, old_keys, _bitmap_keys(task))
+
+    def _log(self, op: str, task: Optional[Task] = None, **fields) -> None:
+        """
+        Append a mutation to the journal and the change feed.
+
+        Snapshots the journal when one is due, unless inside _batch. A
+        task passed for an "add" is serialized only when there is a
+        journal or feed to write to.
+        """
+        journal, feed = self._journal, self._changes
+        if journal is None and feed is None:
+            return
+        if task is not None:
+            fields["task"] = task.to_dict()
+        if journal is not None:
+            journal.append({"op": op, **fields})
+            if journal.snapshot_due and not self._batching:
+                self.snapshot()
+        if feed is not None:
+            if task is not None:
+                feed.publish(op, task.id, fields["task"])
+            else:
+                # In an update, None means "unchanged"; elsewhere it is a value
+                data = {k: v for k, v in fields.items() if k != "id" and (v is not None or op != "update")}
+                feed.publish(op, fields["id"], data or None)
+
+    @contextmanager
+    def _batch(self) -> Iterator[None]:
+        """
+        Hold back journal snapshots while a bulk operation logs its records.
+
+        Bulk operations apply every item before logging them, so a
+        snapshot taken after the first record would already contain the
+        later items, and recovery would replay their records on top of it.
+        A snapshot that falls due is taken once every record is written.
+        """
+        self._batching += 1
+        try:
+            yield
+        finally:
+            self._batching -= 1
+        if not self._batching and self._journal is not None and self._journal.snapshot_due:
+            self.snapshot()
+
+    def snapshot(self) -> None:
+        """Write a compacted snapshot of all tasks to the journal (no-op without one)."""
+        if self._journal is not None:
+            self._journal.write_snapshot(self.iter_tasks(), self._next_id)
+
+    def close(self) -> None:
+        """Flush and close the journal, if any, the storage backend and the archive."""
+        if self._journal is not None:
+            self._journal.close()
+        self._tasks.close()
+        if self._archive is not None:
+            self._archive.close()
+
+    def add_task(self, title: str, description: str = "", priority: Union[int, str, None] = Priority.NONE,
+                 due: Union[date, str, None] = None, tags: Union[str, Iterable[str], None] = (),
+                 project: Optional[str] = "") -> int:
         """
         Add a new task to the collection.
 
         Args:
             title: The title of the task (non-empty string)
             description: The description of the task (string, can be empty)
+            priority: Optional priority level, number or name (e.g. "high")
+            due: Optional due date, as a date or "YYYY-MM-DD"
+            tags: Optional tag names (an iterable, or a string separated by
+                spaces or commas)
+            project: Optional project name
 
         Returns:
             The ID of the newly created task
 
         Raises:
-            ValueError: If title is empty
+            ValueError: If title is empty or another field is invalid
         """
         if not title.strip():
             raise ValueError("Title cannot be empty")
 
         task_id = self._next_id
-        task = Task(id=task_id, title=title.strip(), description=description.strip())
-        self._tasks[task_id] = task
+        task = Task(id=task_id, title=title.strip(), description=description.strip(),
+                    priority=priority, due=due, tags=tags, project=project)
+        self._insert(task)
+        if self._history is not None:
+            self._history.record(("delete", range(task_id, task_id + 1)))
         self._next_id += 1
+        self._log("add", task=task)
 
         return task_id
 
@@ -43,6 +360,8 @@ class TodoManager:
         """
         Retrieve a task by its ID.
 
+        Archived tasks are found too, read from the archive.
+
         Args:
             task_id: The ID of the task to retrieve
 
@@ -52,9 +371,59 @@ class TodoManager:
         Raises:
             KeyError: If task with given ID doesn't exist
         """
-        if task_id not in self._tasks:
+        task = self._tasks.get(task_id)
+        if task is None:
+            if self._archive is not None:
+                task = self._archive.get(task_id)
+            if task is None:
+                raise TaskNotFoundError(task_id)
+        return task
+
+    def _stored(self, task_id: int) -> Optional[Task]:
+        """
+        Return a task to be changed, or None if it doesn't exist.
+
+        An archived task is first moved back into the task collection, so
+        changes only ever apply there.
+        """
+        task = self._tasks.get(task_id)
+        if task is None and self._archive is not None:
+            task = self._archive.get(task_id)
+            if task is not None:
+                self._insert(task)
+                self._log("add", task=task)
+                self._archive.remove((task_id,))
+        return task
+
+    def _require(self, task_id: int) -> Task:
+        """Like _stored, but raise TaskNotFoundError for unknown IDs."""
+        task = self._stored(task_id)
+        if task is None:
             raise TaskNotFoundError(task_id)
-        return self._tasks[task_id]
+        return task
+
+    def read_task(self, task_id: int) -> TaskSnapshot:
+        """
+        Return an immutable snapshot of a task, with its version.
+
+        Unlike the Task from get_task, a snapshot never changes, so it can
+        be shared between threads and read without locking. The snapshot
+        is kept and handed out again until the task next changes, which
+        also lets ConcurrentTodoManager serve it without taking its lock.
+
+        Args:
+            task_id: The ID of the task to read
+
+        Returns:
+            A TaskSnapshot of the task's current version
+
+        Raises:
+            TaskNotFoundError: If task with given ID doesn't exist
+        """
+        snapshot = self._frozen.get(task_id)
+        if snapshot is None:
+            snapshot = self._frozen[task_id] = self.get_task(task_id).freeze()
+        return snapshot
 
     def get_all_tasks(self) -> List[Task]:
         """
@@ -63,9 +432,394 @@ class TodoManager:
         Returns:
             A list of all Task objects, sorted by ID
         """
-        return sorted(self._tasks.values(), key=lambda x: x.id)
+        return list(self._tasks.scan())
+
+    def iter_tasks(self, status: Optional[str] = None, after_id: Optional[int] = None) -> Iterator[Task]:
+        """
+        Lazily iterate over tasks in ID order.
+
+        Tasks are read from the backend a page at a time, so no full copy
+        of the collection is made. Tasks deleted while iterating are
+        skipped.
+
+        Args:
+            status: "pending" or "completed"; None iterates all tasks
+            after_id: Only yield tasks with an ID greater than this cursor
+
+        Yields:
+            Task objects, sorted by ID
+
+        Raises:
+            ValueError: If status is not a valid task status
+        """
+        if status is not None:
+            self._validate_status(status)
+        return self._tasks.scan(status=status, after_id=after_id)
+
+    def get_tasks(self, status: Optional[str] = None, offset: int = 0,
+                  limit: Optional[int] = None, after_id: Optional[int] = None) -> List[Task]:
+        """
+        Retrieve a page of tasks in ID order, optionally filtered by status.
+
+        Filtering reads the status index, so it costs O(k) in the number of
+        matching tasks rather than scanning the whole collection. Use
+        after_id with the last ID of the previous page for cursor-based
+        pagination, which stays cheap however deep the page is.
+
+        Args:
+            status: "pending" or "completed"; None returns all tasks
+            offset: Number of matching tasks to skip
+            limit: Maximum number of tasks to return (None for no limit)
+            after_id: Only return tasks with an ID greater than this cursor
+
+        Returns:
+            A list of matching Task objects, sorted by ID
+
+        Raises:
+            ValueError: If status is not a valid task status, or offset or
+                limit is negative
+        """
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("Offset and limit cannot be negative")
+        if status is not None:
+            self._validate_status(status)
+        stop = None if limit is None else offset + limit
+        tasks = self._tasks.scan(status=status, after_id=after_id, limit=stop)
+        return list(islice(tasks, offset, stop))
+
+    @property
+    def next_id(self) -> int:
+        """The ID the next added task will get; every existing task's ID is lower."""
+        return self._next_id
+
+    def count(self, status: Optional[str] = None) -> int:
+        """
+        Count tasks in O(1), optionally filtered by status.
+
+        Args:
+            status: "pending" or "completed"; None counts all tasks
+
+        Returns:
+            The number of matching tasks
+
+        Raises:
+            ValueError: If status is not a valid task status
+        """
+        if status is not None:
+            self._validate_status(status)
+        return self._tasks.count(status)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Summarize the collection.
+
+        Returns:
+            A dict with the total task count and the count for each status,
+            plus the number of archived tasks when there is an archive
+        """
+        counts = {"total": self._tasks.count()}
+        for status in STATUSES:
+            counts[status] = self._tasks.count(status)
+        if self._archive is not None:
+            counts["archived"] = len(self._archive)
+        return counts
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Task]:
+        """
+        Find tasks whose title or description matches every term of a query.
+
+        Terms are case-insensitive and match word prefixes, so "dep" finds
+        "Deploy". Lookups go through an inverted index that is kept up to
+        date on every add, update, and delete.
+
+        Args:
+            query: Free-text search terms
+            limit: Maximum number of tasks to return (None for no limit)
+
+        Returns:
+            Matching Task objects, sorted by ID
+
+        Raises:
+            ValueError: If limit is negative
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("Limit cannot be negative")
+        if self._search is None:
+            return self._scan_search(query, limit)
+        self._build_indexes()
+        return [self._tasks[task_id] for task_id in self._search.search(query, limit)]
+
+    def filter_tasks(self, query: str, limit: Optional[int] = None) -> List[Task]:
+        """
+        Find tasks matching a boolean filter over status, tags and projects.
+
+        The filter is evaluated with bitwise operations over the bitmap
+        index, e.g. "pending AND tag:urgent AND NOT tag:blocked" or
+        "project:web (tag:bug OR tag:ux)"; see bitmap.parse_filter.
+
+        Args:
+            query: The filter expression
+            limit: Maximum number of tasks to return (None for no limit)
+
+        Returns:
+            Matching tasks in ID order
+
+        Raises:
+            ValueError: If the filter is malformed
+        """
+        if limit is not None and limit <= 0:
+            return []
+        node = parse_filter(query)
+        self._build_indexes()
+        bits = self._bitmaps.evaluate(node)
+        return [self._tasks[task_id] for task_id in decode(bits, limit)]
+
+    def query(self, text: str) -> Iterator[Task]:
+        """
+        Lazily run a list query, e.g. 'where status=pending order by id desc limit 50'.
+
+        The query is parsed and planned up front (see query.parse_query
+        and query.plan_query); tasks are only read as the result is
+        iterated, and a query ordered by ID stops reading at its limit.
+
+        Args:
+            text: The query, everything after "list"
+
+        Returns:
+            An iterator over the matching tasks, in the requested order
+
+        Raises:
+            ValueError: If the query is malformed
+        """
+        return self._plan(text).execute()
+
+    def explain(self, text: str) -> List[str]:
+        """
+        Describe how query() would run a query, without running it.
+
+        Returns:
+            Lines naming the chosen access path with its estimated cost, the
+            remaining filter, ordering and limit steps, and the rejected paths
+
+        Raises:
+            ValueError: If the query is malformed
+        """
+        return self._plan(text).describe()
+
+    def _plan(self, text: str) -> "Plan":
+        """Parse a query and choose its plan, building the indexes only if they could help."""
+        from .query import parse_query, plan_query
+
+        query = parse_query(text)
+        if query.uses_indexes:
+            self._build_indexes()
+        if not self._indexed:
+            return plan_query(query, self._tasks)
+        return plan_query(query, self._tasks, self._search, self._bitmaps)
 
-    def update_task(self, task_id: int, title: Optional[str] = None, description: Optional[str] = None) -> bool:
+    def next_tasks(self, n: int = 5) -> List[Task]:
+        """
+        Return the pending tasks to work on next.
+
+        Tasks are ranked by priority (highest first), then due date
+        (earliest first, undated last), then ID. Tasks with neither a
+        priority nor a due date follow in ID order. Ranked tasks come from a
+        heap, so this costs O(n log m) for m ranked tasks rather than a sort
+        of the whole collection.
+
+        Args:
+            n: Maximum number of tasks to return
+        """
+        if n <= 0:
+            return []
+        self._build_indexes()
+        tasks = [self._tasks[task_id] for task_id in self._schedule.next_ids(n)]
+        if len(tasks) < n:
+            for task in self._tasks.scan(status=TaskStatus.PENDING):
+                if task.id not in self._schedule:
+                    tasks.append(task)
+                    if len(tasks) == n:
+                        break
+        return tasks
+
+    def overdue(self, today: Union[date, str, None] = None) -> List[Task]:
+        """
+        Return the pending tasks due before a date, earliest first.
+
+        Args:
+            today: The reference date (default: the current local date)
+        """
+        day = parse_due(today) or date.today()
+        self._build_indexes()
+        return [self._tasks[task_id] for task_id in self._schedule.due_before_ids(day)]
+
+    def due_between(self, start: Union[date, str], end: Union[date, str]) -> List[Task]:
+        """
+        Return the pending tasks due from start to end inclusive, earliest first.
+
+        Raises:
+            ValueError: If either date is missing or invalid
+        """
+        start, end = parse_due(start), parse_due(end)
+        if start is None or end is None:
+            raise ValueError("Both start and end dates are required")
+        self._build_indexes()
+        return [self._tasks[task_id] for task_id in self._schedule.due_ids(start, end)]
+
+    def archive_completed(self, older_than: float, now: Optional[float] = None,
+                          limit: Optional[int] = None) -> int:
+        """
+        Move tasks completed more than older_than seconds ago to the archive.
+
+        Archived tasks leave the task collection and its indexes, so they
+        no longer appear in listings, counts, searches or filters, and the
+        collection stays proportional to the active tasks; get_task still
+        finds them, and changing one moves it back. Completed tasks with no
+        completion time (recorded before times were kept) count as old.
+        With a limit, each call does a bounded amount of work, so a
+        long-running process can archive a little at a time.
+
+        Args:
+            older_than: Age in seconds a completion must exceed
+            now: The current time in seconds since the epoch (default: now)
+            limit: Most tasks to archive in this call (None for no limit)
+
+        Returns:
+            The number of tasks archived
+
+        Raises:
+            ValueError: If the manager has no archive
+        """
+        if self._archive is None:
+            raise ValueError("This manager has no archive")
+        cutoff = (time.time() if now is None else now) - older_than
+        expired = []
+        if limit is None or limit > 0:
+            for task in self._tasks.scan(status=TaskStatus.COMPLETED):
+                if task.completed_at is None or task.completed_at <= cutoff:
+                    expired.append(task)
+                    if len(expired) == limit:
+                        break
+        if not expired:
+            return 0
+        # Archived durably before the tasks leave the collection, so a
+        # crash in between leaves a duplicate rather than a lost task
+        self._archive.add(expired)
+        with self._tasks.transaction():
+            self._tasks.delete_many([task.id for task in expired])
+        with self._batch():
+            for task in expired:
+                self._unindex(task)
+                self._log("archive", id=task.id)
+        return len(expired)
+
+    def changes_since(self, seq: int, limit: Optional[int] = None) -> List[Change]:
+        """
+        Return the changes made after a sequence number, oldest first.
+
+        Consumers keep the seq of the last change they processed and pass
+        it back; start from 0 after a full listing taken when the feed was
+        empty, or from changes_seq() taken alongside the listing.
+
+        Args:
+            seq: The last sequence number seen
+            limit: Maximum number of changes to return
+
+        Raises:
+            ValueError: If the manager has no change feed
+            ChangesExpiredError: If the changes are no longer buffered
+        """
+        return self._require_changes().changes_since(seq, limit)
+
+    def changes_seq(self) -> int:
+        """Return the sequence number of the latest change (0 if none yet)."""
+        return self._require_changes().seq
+
+    def subscribe(self, callback: Callable[[Change], None]) -> Callable[[], None]:
+        """
+        Call callback with every future change, right after it is made.
+
+        Returns:
+            A function that cancels the subscription
+
+        Raises:
+            ValueError: If the manager has no change feed
+        """
+        return self._require_changes().subscribe(callback)
+
+    def apply_change(self, change: Change) -> None:
+        """
+        Apply a change made by another manager, e.g. a replication primary.
+
+        The change is applied the way journal replay applies a record: it
+        is not journaled, published or recorded for undo again, and task
+        versions advance just as they did on the manager that made it.
+
+        Raises:
+            KeyError: If the change is to a task this manager does not have
+            ValueError: If the change's op is unknown
+        """
+        if change.op == "add":
+            self._apply({"op": "add", "task": change.data})
+        else:
+            self._apply({"op": change.op, "id": change.task_id, **(change.data or {})})
+
+    def replace_all(self, tasks: Iterable[Task]) -> None:
+        """
+        Replace every task at once, e.g. when a replica loads its primary's snapshot.
+
+        The in-memory backend and the derived indexes are rebuilt from
+        scratch rather than emptied task by task. Like apply_change, this
+        is not journaled, published or recorded for undo.
+
+        Raises:
+            ValueError: If the manager keeps its tasks in another backend
+        """
+        if not isinstance(self._tasks, MemoryBackend):
+            raise ValueError("Only a manager with an in-memory backend can replace all its tasks")
+        indexed = self._indexed
+        self._indexed = False
+        self._tasks = MemoryBackend()
+        if self._search is not None:
+            self._search = SearchIndex()
+        self._schedule = ScheduleIndex()
+        self._bitmaps = BitmapIndex()
+        # Cleared in place: ConcurrentTodoManager shares this dict
+        self._frozen.clear()
+        if self.render_cache is not None:
+            self.render_cache.clear()
+        self._insert_many(list(tasks))
+        self._next_id = max(self._next_id, self._tasks.next_id())
+        if indexed:
+            self._build_indexes()
+
+    def _require_changes(self) -> ChangeFeed:
+        if self._changes is None:
+            raise ValueError("This manager has no change feed")
+        return self._changes
+
+    def _scan_search(self, query: str, limit: Optional[int]) -> List[Task]:
+        """Search by scanning every task, for managers without a search index."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        matches = []
+        for task in self._tasks.scan():
+            if limit is not None and len(matches) >= limit:
+                break
+            tokens = tokenize(f"{task.title} {task.description}")
+            if all(any(token.startswith(term) for token in tokens) for term in terms):
+                matches.append(task)
+        return matches
+
+    @staticmethod
+    def _validate_status(status: str) -> None:
+        """Raise ValueError unless status names a valid task status."""
+        if status not in STATUSES:
+            raise ValueError(f"Status must be one of {', '.join(STATUSES)}")
+
+    def update_task(self, task_id: int, title: Optional[str] = None, description: Optional[str] = None,
+                    expected_version: Optional[int] = None) -> bool:
         """
         Update the title and/or description of an existing task.
 
@@ -73,6 +827,8 @@ class TodoManager:
             task_id: The ID of the task to update
             title: New title (optional, if provided must be non-empty)
             description: New description (optional)
+            expected_version: Only update if the task is still at this
+                version (compare-and-set); None updates unconditionally
 
         Returns:
             True if the task was successfully updated, False otherwise
@@ -80,20 +836,24 @@ class TodoManager:
         Raises:
             KeyError: If task with given ID doesn't exist
             ValueError: If new title is empty
+            VersionConflictError: If the task is not at expected_version
         """
-        if task_id not in self._tasks:
-            raise TaskNotFoundError(task_id)
-
-        task = self._tasks[task_id]
+        task = self._require(task_id)
+        if expected_version is not None:
+            _check_version(task, expected_version)
 
         if title is not None:
             if not title.strip():
                 raise ValueError("Title cannot be empty")
-            task.title = title.strip()
+            title = title.strip()
 
         if description is not None:
-            task.description = description.strip()
+            description = description.strip()
 
+        if self._history is not None:
+            self._history.record(("text", [_text_delta(task, title, description)]))
+        self._set_text(task, title, description)
+        self._log("update", id=task_id, title=title, description=description)
         return True
 
     def mark_complete(self, task_id: int) -> bool:
@@ -109,12 +869,38 @@ class TodoManager:
         Raises:
             KeyError: If task with given ID doesn't exist
         """
-        if task_id not in self._tasks:
-            raise TaskNotFoundError(task_id)
-
-        self._tasks[task_id].status = "completed"
+        task = self._require(task_id)
+        if task.status == TaskStatus.COMPLETED:
+            # Nothing changes, so there is nothing to journal or publish
+            return True
+        if self._history is not None:
+            self._history.record(("status", task.status, pack_ids((task_id,))))
+        self._set_status(task, TaskStatus.COMPLETED)
+        self._log("complete", id=task_id, at=task.completed_at)
         return True
 
+    def mark_complete_if(self, task_id: int, expected_version: int) -> bool:
+        """
+        Mark a task as complete only if it is still at the expected version.
+
+        The compare-and-set counterpart of mark_complete: a caller that
+        decided to complete the task based on what it read fails instead of
+        overwriting a change made since.
+
+        Args:
+            task_id: The ID of the task to mark as complete
+            expected_version: The version the caller read
+
+        Returns:
+            True if the task was marked as complete
+
+        Raises:
+            TaskNotFoundError: If task with given ID doesn't exist
+            VersionConflictError: If the task is not at expected_version
+        """
+        _check_version(self._require(task_id), expected_version)
+        return self.mark_complete(task_id)
+
     def delete_task(self, task_id: int) -> bool:
         """
         Delete a task from the collection.
@@ -128,8 +914,481 @@ class TodoManager:
         Raises:
             KeyError: If task with given ID doesn't exist
         """
-        if task_id not in self._tasks:
-            raise TaskNotFoundError(task_id)
+        self._require(task_id)
+        task = self._remove(task_id)
+        if self._history is not None:
+            self._history.record(("restore", [_task_row(task)]))
+        self._log("delete", id=task_id)
+        return True
+
+    def set_priority(self, task_id: int, priority: Union[int, str, None]) -> bool:
+        """
+        Set the priority of a task.
+
+        Args:
+            task_id: The ID of the task
+            priority: Priority level, number or name (e.g. "high"); None or
+                0 clears it
+
+        Returns:
+            True if the priority was set
+
+        Raises:
+            TaskNotFoundError: If task with given ID doesn't exist
+            ValueError: If the priority is invalid
+        """
+        task = self._require(task_id)
+        self._reschedule(task, parse_priority(priority), task.due)
+        return True
+
+    def set_due(self, task_id: int, due: Union[date, str, None]) -> bool:
+        """
+        Set or clear the due date of a task.
+
+        Args:
+            task_id: The ID of the task
+            due: The due date, as a date or "YYYY-MM-DD"; None clears it
+
+        Returns:
+            True if the due date was set
+
+        Raises:
+            TaskNotFoundError: If task with given ID doesn't exist
+            ValueError: If the date is invalid
+        """
+        task = self._require(task_id)
+        self._reschedule(task, task.priority, parse_due(due))
+        return True
+
+    def _reschedule(self, task: Task, priority: Priority, due: Optional[date]) -> None:
+        """Record, apply and log a priority/due date change."""
+        if self._history is not None:
+            self._history.record(("schedule", [(task.id, task.priority, task.due)]))
+        self._set_schedule(task, priority, due)
+        self._log("schedule", id=task.id, **_schedule_fields(task))
+
+    def tag_task(self, task_id: int, tags: Union[str, Iterable[str]]) -> bool:
+        """
+        Add tags to a task (tags it already has are ignored).
+
+        Raises:
+            TaskNotFoundError: If task with given ID doesn't exist
+            ValueError: If a tag name is invalid
+        """
+        task = self._require(task_id)
+        self._relabel(task, parse_tags(task.tags + parse_tags(tags)), task.project)
+        return True
+
+    def untag_task(self, task_id: int, tags: Union[str, Iterable[str]]) -> bool:
+        """
+        Remove tags from a task (tags it does not have are ignored).
+
+        Raises:
+            TaskNotFoundError: If task with given ID doesn't exist
+            ValueError: If a tag name is invalid
+        """
+        task = self._require(task_id)
+        removed = set(parse_tags(tags))
+        self._relabel(task, tuple(tag for tag in task.tags if tag not in removed), task.project)
+        return True
+
+    def set_project(self, task_id: int, project: Optional[str]) -> bool:
+        """
+        Move a task to a project; None or "" removes it from its project.
+
+        Raises:
+            TaskNotFoundError: If task with given ID doesn't exist
+            ValueError: If the project name is invalid
+        """
+        task = self._require(task_id)
+        self._relabel(task, task.tags, parse_label(project))
+        return True
+
+    def _relabel(self, task: Task, tags: tuple, project: str) -> None:
+        """Record, apply and log a tag/project change."""
+        if self._history is not None:
+            self._history.record(("labels", [(task.id, task.tags, task.project)]))
+        self._set_labels(task, tags, project)
+        self._log("labels", id=task.id, tags=list(tags), project=project)
+
+    # Bulk operations validate every item first and only then apply them,
+    # so a batch either succeeds completely or leaves the collection as is.
+
+    def add_tasks(self, items: Iterable[Union[tuple, Mapping]]) -> List[int]:
+        """
+        Add many tasks at once.
+
+        Args:
+            items: (title, description) pairs, or mappings with a "title"
+                and optional "description", "status", "priority", "due",
+                "tags" and "project" keys
+
+        Returns:
+            The IDs of the new tasks, in input order
+
+        Raises:
+            BulkOperationError: If any item is invalid; errors are keyed by
+                the item's position in the input and no task is added
+        """
+        validated = []
+        errors = {}
+        for index, item in enumerate(items):
+            try:
+                validated.append(_validate_new_task(item))
+            except (ValueError, TypeError) as e:
+                errors[index] = str(e)
+        if errors:
+            raise BulkOperationError(errors, len(validated) + len(errors))
+
+        first_id = self._next_id
+        tasks = [
+            Task.unchecked(task_id, *fields) for task_id, fields in enumerate(validated, first_id)
+        ]
+        now = time.time()
+        for task in tasks:
+            if task.status == TaskStatus.COMPLETED:
+                task.completed_at = now
+        with self._tasks.transaction():
+            self._insert_many(tasks)
+        self._next_id += len(tasks)
+        if self._history is not None and tasks:
+            self._history.record(("delete", range(first_id, self._next_id)))
+        with self._batch():
+            for task in tasks:
+                self._log("add", task=task)
+        return [task.id for task in tasks]
+
+    def update_many(self, updates: Mapping[int, Union[tuple, Mapping]]) -> int:
+        """
+        Update the title and/or description of many tasks at once.
+
+        Args:
+            updates: Maps task IDs to (title, description) pairs or mappings
+                with optional "title"/"description" keys; None leaves a field
+                unchanged
+
+        Returns:
+            The number of tasks updated
+
+        Raises:
+            BulkOperationError: If any ID is unknown or any new title is
+                empty; errors are keyed by task ID and no task is updated
+        """
+        validated = []
+        errors = {}
+        for task_id, change in updates.items():
+            task = self._stored(task_id)
+            if task is None:
+                errors[task_id] = str(TaskNotFoundError(task_id))
+                continue
+            if isinstance(change, Mapping):
+                title, description = change.get("title"), change.get("description")
+            else:
+                title, description = change
+            if title is not None:
+                title = title.strip()
+                if not title:
+                    errors[task_id] = "Title cannot be empty"
+                    continue
+            if description is not None:
+                description = description.strip()
+            validated.append((task, title, description))
+        if errors:
+            raise BulkOperationError(errors, len(updates))
+
+        if self._history is not None and validated:
+            self._history.record(("text", [_text_delta(*change) for change in validated]))
+        with self._tasks.transaction():
+            for task, title, description in validated:
+                self._set_text(task, title, description)
+        with self._batch():
+            for task, title, description in validated:
+                self._log("update", id=task.id, title=title, description=description)
+        return len(validated)
+
+    def mark_complete_many(self, task_ids: Iterable[int]) -> int:
+        """
+        Mark many tasks as complete at once.
+
+        Args:
+            task_ids: IDs of the tasks to complete (duplicates are ignored)
+
+        Returns:
+            The number of tasks marked as complete
+
+        Raises:
+            BulkOperationError: If any ID is unknown; no task is changed
+        """
+        tasks = self._lookup_many(task_ids)
+        if self._history is not None:
+            reopened = [task.id for task in tasks if task.status != TaskStatus.COMPLETED]
+            if reopened:
+                self._history.record(("status", TaskStatus.PENDING, pack_ids(reopened)))
+        with self._tasks.transaction():
+            for task in tasks:
+                self._set_status(task, TaskStatus.COMPLETED)
+        with self._batch():
+            for task in tasks:
+                self._log("complete", id=task.id, at=task.completed_at)
+        return len(tasks)
+
+    def delete_many(self, task_ids: Iterable[int]) -> int:
+        """
+        Delete many tasks at once.
+
+        Args:
+            task_ids: IDs of the tasks to delete (duplicates are ignored)
+
+        Returns:
+            The number of tasks deleted
+
+        Raises:
+            BulkOperationError: If any ID is unknown; no task is deleted
+        """
+        tasks = self._lookup_many(task_ids)
+        with self._tasks.transaction():
+            self._tasks.delete_many([task.id for task in tasks])
+        if self._history is not None and tasks:
+            self._history.record(("restore", [_task_row(task) for task in tasks]))
+        with self._batch():
+            for task in tasks:
+                self._unindex(task)
+                self._log("delete", id=task.id)
+        return len(tasks)
+
+    def _lookup_many(self, task_ids: Iterable[int]) -> List[Task]:
+        """Resolve distinct task IDs to tasks, reporting every unknown ID."""
+        tasks = []
+        errors = {}
+        for task_id in dict.fromkeys(task_ids):
+            task = self._stored(task_id)
+            if task is None:
+                errors[task_id] = str(TaskNotFoundError(task_id))
+            else:
+                tasks.append(task)
+        if errors:
+            raise BulkOperationError(errors, len(tasks) + len(errors))
+        return tasks
+
+    def undo(self) -> bool:
+        """
+        Revert the most recent change (a bulk operation or import counts as one).
+
+        Returns:
+            True if a change was undone, False if there was nothing to undo
+        """
+        if self._history is None:
+            return False
+        entry = self._history.pop_undo()
+        if entry is None:
+            return False
+        self._history.push_redo(self._revert(entry))
+        return True
+
+    def redo(self) -> bool:
+        """
+        Re-apply the most recently undone change.
+
+        Returns:
+            True if a change was redone, False if there was nothing to redo
+        """
+        if self._history is None:
+            return False
+        entry = self._history.pop_redo()
+        if entry is None:
+            return False
+        self._history.push_undo(self._revert(entry))
+        return True
+
+    def _revert(self, entry: tuple) -> tuple:
+        """Apply a history entry (see history.entry_size) and return its reverse."""
+        kind = entry[0]
+        with self._batch(), self._tasks.transaction():
+            if kind == "delete":
+                tasks = [self._require(task_id) for task_id in entry[1]]
+                self._tasks.delete_many(entry[1])
+                for task in tasks:
+                    self._unindex(task)
+                    self._log("delete", id=task.id)
+                return ("restore", [_task_row(task) for task in tasks])
+            if kind == "restore":
+                tasks = [Task.unchecked(*row) for row in entry[1]]
+                for task in tasks:
+                    # Restoring is a change too, so stale versions stay stale
+                    task.version += 1
+                self._insert_many(tasks)
+                for task in tasks:
+                    self._log("add", task=task)
+                return ("delete", pack_ids(task.id for task in tasks))
+            if kind == "text":
+                reverse = []
+                for task_id, title, description in entry[1]:
+                    task = self._require(task_id)
+                    reverse.append(_text_delta(task, title, description))
+                    self._set_text(task, title, description)
+                    self._log("update", id=task_id, title=title, description=description)
+                return ("text", reverse)
+            if kind == "status":
+                status, ids = entry[1], entry[2]
+                previous = None
+                for task_id in ids:
+                    task = self._require(task_id)
+                    previous = task.status
+                    self._set_status(task, status)
+                    self._log("status", id=task_id, status=str(status), at=task.completed_at)
+                # The history is linear, so the tasks in one entry all shared a status
+                return ("status", previous, ids)
+            if kind == "schedule":
+                reverse = []
+                for task_id, priority, due in entry[1]:
+                    task = self._require(task_id)
+                    reverse.append((task_id, task.priority, task.due))
+                    self._set_schedule(task, priority, due)
+                    self._log("schedule", id=task_id, **_schedule_fields(task))
+                return ("schedule", reverse)
+            if kind == "labels":
+                reverse = []
+                for task_id, tags, project in entry[1]:
+                    task = self._require(task_id)
+                    reverse.append((task_id, task.tags, task.project))
+                    self._set_labels(task, tags, project)
+                    self._log("labels", id=task_id, tags=list(tags), project=project)
+                return ("labels", reverse)
+            if kind == "group":
+                return ("group", [self._revert(item) for item in entry[1]][::-1])
+        raise ValueError(f"Unknown history entry: {kind}")
+
+    def import_tasks(self, path: str, fmt: Optional[str] = None, chunk_size: int = 10_000) -> int:
+        """
+        Stream tasks from a CSV or JSON Lines file into the collection.
+
+        Rows are read and validated a chunk at a time, so memory use does
+        not grow with the file size. Each row gets a new ID; "title" is
+        required and "description"/"status" are optional.
+
+        Args:
+            path: File to read
+            fmt: "csv" or "jsonl" (default: inferred from the extension)
+            chunk_size: Rows validated and added per batch
+
+        Returns:
+            The number of tasks imported
+
+        Raises:
+            BulkOperationError: If any row is invalid, keyed by 1-based row
+                number over the whole file; the chunks before the first
+                invalid one remain imported and are counted in `applied`
+            ValueError: If the format is unknown
+        """
+        from . import transfer
+
+        fmt = transfer.resolve_format(path, fmt)
+        imported = rows = 0
+        errors = {}
+        group = self._history.group() if self._history is not None else nullcontext()
+        with group, open(path, "r", encoding="utf-8", newline="") as handle:
+            for chunk in transfer.chunked(transfer.read_rows(handle, fmt), chunk_size):
+                if not errors:
+                    try:
+                        imported += len(self.add_tasks(chunk))
+                    except BulkOperationError as e:
+                        errors = {rows + index + 1: message for index, message in e.errors.items()}
+                else:
+                    # Nothing more is added after a failed chunk, but the rest
+                    # of the file is still checked so every bad row is reported
+                    for index, row in enumerate(chunk, rows + 1):
+                        try:
+                            _validate_new_task(row)
+                        except (ValueError, TypeError) as e:
+                            errors[index] = str(e)
+                rows += len(chunk)
+        if errors:
+            raise BulkOperationError(errors, rows, applied=imported)
+        return imported
+
+    def export_tasks(self, path: str, fmt: Optional[str] = None) -> int:
+        """
+        Stream every task, in ID order, to a CSV or JSON Lines file.
+
+        Args:
+            path: File to write (overwritten if it exists)
+            fmt: "csv" or "jsonl" (default: inferred from the extension)
+
+        Returns:
+            The number of tasks exported
+
+        Raises:
+            ValueError: If the format is unknown
+        """
+        from . import transfer
+
+        fmt = transfer.resolve_format(path, fmt)
+        with open(path, "w", encoding="utf-8", newline="") as handle:
+            return transfer.write_rows(handle, self.iter_tasks(), fmt)
+
+
+_STATUS_KEYS = {status: f"status:{status}" for status in STATUSES}
+
+
+def _bitmap_keys(task: Task) -> list[str]:
+    """Return the bitmap index keys of a task: its status, tags and project."""
+    keys = [_STATUS_KEYS[task.status]]
+    keys.extend(["tag:" + tag for tag in task.tags])
+    if task.project:
+        keys.append("project:" + task.project)
+    return keys
+
+
+def _task_row(task: Task) -> tuple:
+    """Return the fields needed to recreate a deleted task."""
+    return (task.id, task.title, task.description, task.status, task.priority, task.due,
+            task.tags, task.project, task.version, task.completed_at)
+
+
+def _check_version(task: Task, expected_version: int) -> None:
+    """Raise VersionConflictError unless a task is at the expected version."""
+    if task.version != expected_version:
+        raise VersionConflictError(task.id, expected_version, task.version)
+
+
+def _schedule_fields(task: Task) -> dict:
+    """Return a task's priority and due date as journal record fields."""
+    return {"priority": int(task.priority), "due": task.due.isoformat() if task.due else None}
+
+
+def _text_delta(task: Task, title: Optional[str], description: Optional[str]) -> tuple:
+    """Return the current values of the fields an update will change (None for the others)."""
+    return (
+        task.id,
+        task.title if title is not None and title != task.title else None,
+        task.description if description is not None and description != task.description else None,
+    )
+
 
-        del self._tasks[task_id]
-        return True
\ No newline at end of file
+def _validate_new_task(item: Union[tuple, Mapping]) -> tuple:
+    """Return the normalized (title, description, status, priority, due, tags, project) of a new-task item."""
+    status = TaskStatus.PENDING
+    priority, due, tags, project = Priority.NONE, None, (), ""
+    if type(item) is dict or isinstance(item, Mapping):
+        title, description = item.get("title") or "", item.get("description") or ""
+        if item.get("status"):
+            try:
+                status = TaskStatus(item["status"])
+            except ValueError:
+                raise ValueError("Status must be either 'pending' or 'completed'") from None
+        if item.get("priority"):
+            priority = parse_priority(item["priority"])
+        if item.get("due"):
+            due = parse_due(item["due"])
+        if item.get("tags"):
+            tags = parse_tags(item["tags"])
+        if item.get("project"):
+            project = parse_label(item["project"])
+    else:
+        title, description = item
+    if not isinstance(title, str) or not isinstance(description, str):
+        raise TypeError("Title and description must be strings")
+    title = title.strip()
+    if not title:
+        raise ValueError("Title cannot be empty")
+    return title, description.strip(), status, priority, due, tags, project
\ No newline at end of file
@@ -0,0 +1,322 @@
+"""Memory-mapped binary task snapshots and a storage backend served from them."""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import nullcontext
+from datetime import date
+from heapq import merge
+from itertools import islice
+from typing import ContextManager, Iterable, Iterator, Optional
+
+from .models import Priority, Task, STATUSES
+from .storage import MemoryBackend
+
+# File layout (native byte order, recorded in the header):
+#
+#   header   magic, version, byte order, task count, next ID, journal seq,
+#            per-status counts, and the offset of the columns
+#   heap     UTF-8 title + description + labels of each task, back to back
+#   ids      int64 per task, ascending
+#   records  fixed-width per task: heap offset, version, completion time
+#            (0 for none), title/description/labels byte lengths, due date
+#            ordinal (0 for none), priority
+#   status   one byte per task, an index into STATUSES
+#
+# Writing streams the heap straight to disk and appends the columns (about
+# 53 bytes per task) at the end, then fills in the header.
+_MAGIC = b"TODOMAP\x00"
+_VERSION = 3
+_HEADER = struct.Struct("=8sHBxxxxxqqqqqq")
+_RECORD = struct.Struct("=QqdIIIiB3x")
+_BYTE_ORDERS = {"little": 0, "big": 1}
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+_PRIORITIES = list(Priority)
+_PAGE_SIZE = 1024
+
+
+def _labels_bytes(task: Task) -> bytes:
+    # Project and tag names cannot contain spaces: "project tag tag ..."
+    if not task.tags and not task.project:
+        return b""
+    return " ".join((task.project,) + task.tags).encode("utf-8")
+
+
+def write_mapped_snapshot(path: str, tasks: Iterable[Task], next_id: int, seq: int = 0) -> int:
+    """
+    Write tasks to a binary snapshot file that MappedSnapshot can map.
+
+    Args:
+        path: File to write (overwritten if it exists)
+        tasks: The tasks, in ascending ID order
+        next_id: The next task ID to allocate
+        seq: Journal sequence number the snapshot is current up to
+
+    Returns:
+        The number of tasks written
+
+    Raises:
+        ValueError: If the tasks are not in ascending ID order
+    """
+    ids = array("q")
+    records = bytearray()
+    statuses = bytearray()
+    counts = [0] * len(STATUSES)
+    with open(path, "wb") as handle:
+        handle.write(bytes(_HEADER.size))
+        offset = _HEADER.size
+        for task in tasks:
+            if ids and task.id <= ids[-1]:
+                raise ValueError("Tasks must be written in ascending ID order")
+            title = task.title.encode("utf-8")
+            description = task.description.encode("utf-8")
+            labels = _labels_bytes(task)
+            handle.write(title + description + labels)
+            records += _RECORD.pack(offset, task.version, task.completed_at or 0.0,
+                                    len(title), len(description), len(labels),
+                                    task.due.toordinal() if task.due else 0, task.priority)
+            offset += len(title) + len(description) + len(labels)
+            code = _STATUS_CODES[task.status]
+            statuses.append(code)
+            counts[code] += 1
+            ids.append(task.id)
+
+        # Align the ID column so it can be viewed as int64s in place
+        padding = -offset % 8
+        handle.write(bytes(padding))
+        columns = offset + padding
+        handle.write(ids.tobytes())
+        handle.write(records)
+        handle.write(statuses)
+        handle.seek(0)
+        handle.write(_HEADER.pack(_MAGIC, _VERSION, _BYTE_ORDERS[sys.byteorder], len(ids),
+                                  next_id, seq, counts[0], counts[1], columns))
+        handle.flush()
+        os.fsync(handle.fileno())
+    return len(ids)
+
+
+class MappedSnapshot:
+    """
+    Read-only view of a snapshot file written by write_mapped_snapshot.
+
+    Opening the file maps it and reads the header; nothing else is read
+    until it is asked for. Looking a task up binary-searches the ID column
+    in place and decodes one record and its strings, so a lookup touches a
+    few pages of the file and the operating system pages in only what is
+    read. Tasks are built on each call; callers that need a stable object
+    keep their own.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a snapshot file.
+
+        Raises:
+            ValueError: If the file is not a snapshot, or was written with a
+                different format version or byte order
+        """
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self._map.close()
+            raise ValueError(f"{path} is not a task snapshot")
+        magic, version, byte_order, count, next_id, seq, pending, completed, columns = (
+            _HEADER.unpack_from(self._map))
+        if magic != _MAGIC or version != _VERSION or byte_order != _BYTE_ORDERS[sys.byteorder]:
+            self._map.close()
+            raise ValueError(f"{path} is not a task snapshot readable on this machine")
+        self.path = path
+        self.next_id = next_id
+        self.seq = seq
+        self._count = count
+        self._counts = dict(zip(STATUSES, (pending, completed)))
+        self._records = columns + 8 * count
+        self._statuses = self._records + _RECORD.size * count
+        self._ids = memoryview(self._map)[columns:self._records].cast("q")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, task_id: object) -> bool:
+        return self.position(task_id) is not None
+
+    def count(self, status: Optional[str] = None) -> int:
+        """Count tasks, optionally by status."""
+        return self._count if status is None else self._counts[status]
+
+    def position(self, task_id: object) -> Optional[int]:
+        """Return the index of a task in ID order, or None if absent."""
+        if not isinstance(task_id, int):
+            return None
+        position = bisect_left(self._ids, task_id)
+        if position < self._count and self._ids[position] == task_id:
+            return position
+        return None
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """Return a new Task for this ID, or None."""
+        position = self.position(task_id)
+        return None if position is None else self.task_at(position)
+
+    def task_at(self, position: int) -> Task:
+        """Build the Task at an index in ID order."""
+        data = self._map
+        offset, version, completed_at, title_len, description_len, labels_len, due, priority = (
+            _RECORD.unpack_from(data, self._records + position * _RECORD.size))
+        end = offset + title_len + description_len
+        title = str(data[offset:offset + title_len], "utf-8")
+        description = str(data[offset + title_len:end], "utf-8")
+        tags, project = (), ""
+        if labels_len:
+            project, *names = str(data[end:end + labels_len], "utf-8").split(" ")
+            tags = tuple(map(sys.intern, names))
+            project = sys.intern(project)
+        return Task.unchecked(self._ids[position], title, description, STATUSES[data[self._statuses + position]],
+                              _PRIORITIES[priority], date.fromordinal(due) if due else None, tags, project,
+                              version, completed_at or None)
+
+    def status_at(self, position: int) -> str:
+        """Return the status of the task at an index, without building it."""
+        return STATUSES[self._map[self._statuses + position]]
+
+    def pages(self, after_id: Optional[int] = None) -> Iterator[tuple]:
+        """
+        Yield (first position, IDs, status codes) a page at a time, in ID order.
+
+        Args:
+            after_id: Start after this ID
+        """
+        position = 0 if after_id is None else bisect_right(self._ids, after_id)
+        while position < self._count:
+            end = min(position + _PAGE_SIZE, self._count)
+            yield position, self._ids[position:end].tolist(), self._map[self._statuses + position:self._statuses + end]
+            position = end
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._ids.release()
+        self._map.close()
+
+
+class MappedBackend:
+    """
+    A StorageBackend serving tasks from a MappedSnapshot, with changes in memory.
+
+    The snapshot is never written to. A task read from it is built when it
+    is first looked up and kept from then on, so repeated lookups return
+    the same object; scans build the tasks they yield without keeping
+    them. New tasks go to an in-memory MemoryBackend, and deleted snapshot
+    tasks are remembered by ID. Persist changes by writing a new snapshot
+    (the journal does this when configured with snapshot_format="mapped").
+    """
+
+    def __init__(self, snapshot: MappedSnapshot):
+        self._snapshot = snapshot
+        # Snapshot tasks that were looked up, changed or re-added, by ID
+        self._live: dict[int, Task] = {}
+        # Snapshot tasks that were deleted
+        self._deleted: set[int] = set()
+        # Tasks that are not in the snapshot
+        self._added = MemoryBackend()
+        self._counts = {status: snapshot.count(status) for status in STATUSES}
+
+    @classmethod
+    def open(cls, path: str) -> "MappedBackend":
+        """Map a snapshot file and serve it."""
+        return cls(MappedSnapshot(path))
+
+    def __len__(self) -> int:
+        return len(self._snapshot) - len(self._deleted) + len(self._added)
+
+    def __contains__(self, task_id: object) -> bool:
+        return self.get(task_id) is not None
+
+    def __getitem__(self, task_id: int) -> Task:
+        task = self.get(task_id)
+        if task is None:
+            raise KeyError(task_id)
+        return task
+
+    def get(self, task_id: int) -> Optional[Task]:
+        task = self._live.get(task_id)
+        if task is not None:
+            return task
+        if task_id in self._added:
+            return self._added.get(task_id)
+        if task_id in self._deleted:
+            return None
+        task = self._snapshot.get(task_id)
+        if task is not None:
+            self._live[task_id] = task
+        return task
+
+    def next_id(self) -> int:
+        return max(self._snapshot.next_id, self._added.next_id())
+
+    def put(self, task: Task) -> None:
+        if task.id in self._deleted:
+            # A deleted snapshot task restored, e.g. by undo
+            self._deleted.discard(task.id)
+            self._live[task.id] = task
+        else:
+            self._added.put(task)
+        self._counts[task.status] += 1
+
+    def put_many(self, tasks: Iterable[Task]) -> None:
+        for task in tasks:
+            self.put(task)
+
+    def save(self, task: Task, previous_status: Optional[str] = None) -> None:
+        if task.id in self._added:
+            self._added.save(task, previous_status)
+        else:
+            self._live[task.id] = task
+        if previous_status is not None and previous_status != task.status:
+            self._counts[previous_status] -= 1
+            self._counts[task.status] += 1
+
+    def delete(self, task_id: int) -> Task:
+        if task_id in self._added:
+            task = self._added.delete(task_id)
+        else:
+            task = self[task_id]
+            del self._live[task_id]
+            self._deleted.add(task_id)
+        self._counts[task.status] -= 1
+        return task
+
+    def delete_many(self, task_ids: Iterable[int]) -> None:
+        for task_id in task_ids:
+            self.delete(task_id)
+
+    def scan(self, status: Optional[str] = None, after_id: Optional[int] = None,
+             limit: Optional[int] = None) -> Iterator[Task]:
+        tasks = merge(self._scan_snapshot(status, after_id), self._added.scan(status, after_id),
+                      key=lambda task: task.id)
+        return tasks if limit is None else islice(tasks, limit)
+
+    def _scan_snapshot(self, status: Optional[str], after_id: Optional[int]) -> Iterator[Task]:
+        snapshot, live, deleted = self._snapshot, self._live, self._deleted
+        code = None if status is None else _STATUS_CODES[status]
+        for first, ids, codes in snapshot.pages(after_id):
+            for index, task_id in enumerate(ids):
+                task = live.get(task_id)
+                if task is not None:
+                    if status is None or task.status == status:
+                        yield task
+                elif (code is None or codes[index] == code) and task_id not in deleted:
+                    yield snapshot.task_at(first + index)
+
+    def count(self, status: Optional[str] = None) -> int:
+        if status is None:
+            return len(self)
+        return self._counts[status]
+
+    def transaction(self) -> ContextManager:
+        return nullcontext()
+
+    def close(self) -> None:
+        self._snapshot.close()
@@ -0,0 +1,176 @@
+"""Operation counters, latency histograms, and an opt-in profiler."""
+import threading
+import time
+from functools import wraps
+from typing import Callable, Iterable, List, Optional
+
+# Histogram bucket i counts calls that took under 2**i microseconds (and at
+# least 2**(i - 1)); the last bucket also takes everything slower.
+_BUCKETS = 32
+
+
+class _OpStats:
+    """Running totals for one operation."""
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * _BUCKETS
+
+    def percentile(self, q: float) -> float:
+        """Estimate a latency percentile (in microseconds) from the histogram."""
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(float(2 ** i), self.max * 1e6)
+        return self.max * 1e6
+
+
+class Metrics:
+    """
+    Per-operation call counters and latency histograms.
+
+    Histograms use fixed power-of-two buckets, so recording a call is a
+    few integer operations and memory does not grow with the call count;
+    percentiles are reported as the upper bound of their bucket. Metrics
+    are only collected for objects passed to instrument(): code that is not
+    instrumented pays nothing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ops: dict[str, _OpStats] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record one call of an operation and how long it took."""
+        bucket = min(int(seconds * 1e6).bit_length(), _BUCKETS - 1)
+        with self._lock:
+            stats = self._ops.get(name)
+            if stats is None:
+                stats = self._ops[name] = _OpStats()
+            stats.count += 1
+            stats.total += seconds
+            if seconds > stats.max:
+                stats.max = seconds
+            stats.buckets[bucket] += 1
+
+    def timed(self, name: str, fn: Callable) -> Callable:
+        """Wrap fn so that every call, including failed ones, is recorded under name."""
+        record = self.record
+        clock = time.perf_counter
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, clock() - start)
+        return wrapper
+
+    def instrument(self, obj: object, names: Iterable[str]) -> None:
+        """
+        Replace methods of one object with timed wrappers.
+
+        The wrappers are set as instance attributes, so other instances of
+        the class are left untouched.
+
+        Args:
+            obj: The object to instrument
+            names: The method names to time; each is recorded under its name
+        """
+        for name in names:
+            setattr(obj, name, self.timed(name, getattr(obj, name)))
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Return the collected metrics.
+
+        Returns:
+            Operation name -> {"count", "total_ms", "mean_us", "p50_us",
+            "p99_us", "max_us"}, sorted by name
+        """
+        with self._lock:
+            return {
+                name: {
+                    "count": stats.count,
+                    "total_ms": stats.total * 1e3,
+                    "mean_us": stats.total / stats.count * 1e6,
+                    "p50_us": stats.percentile(0.50),
+                    "p99_us": stats.percentile(0.99),
+                    "max_us": stats.max * 1e6,
+                }
+                for name, stats in sorted(self._ops.items())
+            }
+
+    def reset(self) -> None:
+        """Discard everything recorded so far."""
+        with self._lock:
+            self._ops.clear()
+
+
+def format_metrics(snapshot: dict[str, dict]) -> List[str]:
+    """Format a Metrics.snapshot() as table lines."""
+    if not snapshot:
+        return ["No operations recorded."]
+    lines = [f"{'operation':<24}{'calls':>10}{'total ms':>12}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'max us':>10}"]
+    for name, s in snapshot.items():
+        lines.append(f"{name:<24}{s['count']:>10}{s['total_ms']:>12.1f}{s['mean_us']:>10.1f}"
+                     f"{s['p50_us']:>10.0f}{s['p99_us']:>10.0f}{s['max_us']:>10.0f}")
+    return lines
+
+
+class Profiler:
+    """
+    cProfile and tracemalloc capture for a whole run.
+
+    Both add noticeable overhead, so this is strictly opt-in (the CLI's
+    --profile option). stop() writes a plain-text report.
+    """
+
+    def __init__(self, path: str, top: int = 25):
+        """
+        Args:
+            path: Where stop() writes the report
+            top: Number of functions and allocation sites to list
+        """
+        # Imported here so that code which never profiles does not load them
+        import cProfile
+
+        self.path = path
+        self._top = top
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        """Start profiling calls and tracing allocations."""
+        import tracemalloc
+
+        tracemalloc.start()
+        self._profile.enable()
+
+    def stop(self, metrics: Optional[Metrics] = None) -> None:
+        """Stop profiling and write the report, including metrics if given."""
+        import io
+        import pstats
+        import tracemalloc
+
+        self._profile.disable()
+        allocations = tracemalloc.take_snapshot().statistics("lineno")
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        calls = io.StringIO()
+        pstats.Stats(self._profile, stream=calls).sort_stats("cumulative").print_stats(self._top)
+        with open(self.path, "w", encoding="utf-8") as report:
+            report.write(f"Traced memory: {current / 1024:.1f} KiB current, {peak / 1024:.1f} KiB peak\n\n")
+            if metrics is not None:
+                report.write("Operations:\n" + "\n".join(format_metrics(metrics.snapshot())) + "\n\n")
+            report.write(f"Top {self._top} allocation sites:\n")
+            report.writelines(f"  {stat}\n" for stat in allocations[:self._top])
+            report.write("\nCall profile (by cumulative time):\n")
+            report.write(calls.getvalue())
@@ -1,26 +1,301 @@
-from dataclasses import dataclass
-from typing import Union
+import re
+import sys
+from datetime import date, datetime
+from enum import IntEnum, StrEnum
+from typing import Iterable, NamedTuple, Optional, Union
+
+
+class TaskStatus(StrEnum):
+    """
+    Task status values.
+
+    Members compare equal to their plain string values, so existing code
+    comparing task.status against "pending" keeps working, while every
+    task shares the same two member objects instead of its own string.
+    """
+    PENDING = "pending"
+    COMPLETED = "completed"
+
+
+STATUSES = tuple(TaskStatus)
+
+
+class Priority(IntEnum):
+    """Task priority levels; higher values are more urgent."""
+    NONE = 0
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+
+
+def parse_priority(value: Union[int, str, None]) -> Priority:
+    """
+    Convert a priority given as a level, a number or a name ("high") to a Priority.
+
+    Raises:
+        ValueError: If the value is not a known priority
+    """
+    if value is None or value == "":
+        return Priority.NONE
+    if isinstance(value, str):
+        value = value.strip()
+        if value.isdigit():
+            value = int(value)
+        elif value.upper() in Priority.__members__:
+            return Priority[value.upper()]
+    if isinstance(value, int) and not isinstance(value, bool) and value in Priority._value2member_map_:
+        return Priority(value)
+    names = ", ".join(p.name.lower() for p in Priority)
+    raise ValueError(f"Priority must be 0-{max(Priority)} or one of: {names}")
+
+
+def parse_due(value: Union[date, str, None]) -> Optional[date]:
+    """
+    Convert a due date given as a date or an ISO "YYYY-MM-DD" string.
+
+    Empty values mean no due date; datetimes are truncated to their date.
+
+    Raises:
+        ValueError: If the value is not a valid date
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value.strip())
+        except ValueError:
+            pass
+    raise ValueError("Due date must be a date in YYYY-MM-DD format")
+
+
+_LABEL_RE = re.compile(r"^\w[\w\-.]*$")
+
+
+def parse_label(value: Optional[str], kind: str = "Project") -> str:
+    """
+    Normalize a tag or project name: stripped and lowercased ("" for none).
+
+    Raises:
+        ValueError: If the name contains characters other than letters,
+            digits, "_", "-" and "."
+    """
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise TypeError(f"{kind} names must be strings")
+    value = value.strip().lower()
+    if value and not _LABEL_RE.match(value):
+        raise ValueError(f"{kind} names may only contain letters, digits, '_', '-' and '.'")
+    return sys.intern(value)
+
+
+def parse_tags(value: Union[str, Iterable[str], None]) -> tuple[str, ...]:
+    """
+    Normalize tags to a sorted tuple of distinct, interned, lowercased names.
+
+    Accepts an iterable of names or a single string of names separated by
+    spaces or commas.
+
+    Raises:
+        ValueError: If a tag name is invalid
+    """
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = value.replace(",", " ").split()
+    tags = {parse_label(tag, "Tag") for tag in value}
+    tags.discard("")
+    return tuple(sorted(tags))
 
 
-@dataclass
 class Task:
     """
     Represents a single todo item with id, title, description, and status.
 
+    Tasks use __slots__ rather than a per-instance __dict__, which keeps
+    per-task memory overhead low in large collections. The class is
+    written out by hand rather than generated with @dataclass, so that
+    starting the CLI does not pay for importing dataclasses and inspect.
+
     Attributes:
         id: Auto-incremented unique identifier
         title: Non-empty task title
         description: Task description (can be empty)
-        status: Either "pending" or "completed"
+        status: Either "pending" or "completed" (stored as a TaskStatus)
+        priority: Urgency level (stored as a Priority; NONE by default)
+        due: Optional due date
+        tags: Sorted tuple of lowercased tag names
+        project: Lowercased project name ("" for none)
+        version: Starts at 1 and goes up by one on every change, so a
+            writer can tell whether the task changed since it read it
+        completed_at: When the task was completed, in seconds since the
+            epoch (None while pending)
+    """
+
+    __slots__ = ("id", "title", "description", "status", "priority", "due", "tags", "project", "version",
+                 "completed_at")
+
+    # Tasks are mutable, so they compare by value but are not hashable
+    __hash__ = None
+
+    def __init__(self, id: int, title: str, description: str, status: str = TaskStatus.PENDING,
+                 priority: Union[int, str, None] = Priority.NONE, due: Union[date, str, None] = None,
+                 tags: Union[str, Iterable[str]] = (), project: Optional[str] = "", version: int = 1,
+                 completed_at: Optional[float] = None):
+        """
+        Initialize and validate a task.
+
+        Raises:
+            ValueError: If the title is empty or any other field is invalid
+        """
+        if not title.strip():
+            raise ValueError("Title cannot be empty")
+        if status not in STATUSES:
+            raise ValueError("Status must be either 'pending' or 'completed'")
+        self.id = id
+        self.title = title
+        self.description = description
+        self.status = TaskStatus(status)
+        self.priority = parse_priority(priority)
+        self.due = parse_due(due)
+        self.tags = parse_tags(tags)
+        self.project = parse_label(project)
+        if not isinstance(version, int) or isinstance(version, bool) or version < 1:
+            raise ValueError("Version must be a positive integer")
+        self.version = version
+        self.completed_at = None if completed_at is None else float(completed_at)
+
+    def __repr__(self) -> str:
+        return (f"Task(id={self.id!r}, title={self.title!r}, description={self.description!r}, "
+                f"status={self.status!r}, priority={self.priority!r}, due={self.due!r}, "
+                f"tags={self.tags!r}, project={self.project!r}, version={self.version!r}, "
+                f"completed_at={self.completed_at!r})")
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.id, self.title, self.description, self.status, self.priority, self.due,
+                self.tags, self.project, self.version, self.completed_at) == (
+            other.id, other.title, other.description, other.status, other.priority, other.due,
+            other.tags, other.project, other.version, other.completed_at)
+
+    @classmethod
+    def unchecked(cls, id: int, title: str, description: str,
+                  status: "TaskStatus" = TaskStatus.PENDING, priority: "Priority" = Priority.NONE,
+                  due: Optional[date] = None, tags: tuple = (), project: str = "",
+                  version: int = 1, completed_at: Optional[float] = None) -> "Task":
+        """
+        Build a task without running __init__ validation.
+
+        For bulk paths that have already validated (and normalized) every
+        field; status and priority must already be TaskStatus and Priority
+        members, and tags and project normalized as by parse_tags and
+        parse_label.
+        """
+        task = object.__new__(cls)
+        task.id = id
+        task.title = title
+        task.description = description
+        task.status = status
+        task.priority = priority
+        task.due = due
+        task.tags = tags
+        task.project = project
+        task.version = version
+        task.completed_at = completed_at
+        return task
+
+    def __reduce__(self):
+        # Pickle as plain values rather than slot state holding enum members:
+        # about half the size and twice as fast to load, which matters when
+        # tasks are shipped between processes (see sharded.py).
+        return _unpickle_task, (self.id, self.title, self.description, str(self.status),
+                                int(self.priority), self.due, self.tags, self.project, self.version,
+                                self.completed_at)
+
+    def freeze(self) -> "TaskSnapshot":
+        """Return an immutable copy of the task as it is now."""
+        return TaskSnapshot(self.id, self.title, self.description, self.status, self.priority,
+                            self.due, self.tags, self.project, self.version, self.completed_at)
+
+    def to_dict(self) -> dict:
+        """Return a plain dict of the task, suitable for JSON serialization."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "status": str(self.status),
+            "priority": int(self.priority),
+            "due": self.due.isoformat() if self.due else None,
+            "tags": list(self.tags),
+            "project": self.project,
+            "version": self.version,
+            "completed_at": self.completed_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Task":
+        """Build a task from a dict produced by to_dict()."""
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            description=data.get("description", ""),
+            status=data.get("status", "pending"),
+            priority=data.get("priority", Priority.NONE),
+            due=data.get("due"),
+            tags=data.get("tags", ()),
+            project=data.get("project", ""),
+            version=data.get("version", 1),
+            completed_at=data.get("completed_at"),
+        )
+
+
+class TaskSnapshot(NamedTuple):
+    """
+    An immutable copy of a Task at one version (see Task.freeze).
+
+    Snapshots never change after they are made, so they can be handed to
+    other threads and read without any locking; compare the version with
+    a later one to tell whether the task has changed since.
     """
     id: int
     title: str
     description: str
-    status: str = "pending"
+    status: TaskStatus
+    priority: Priority
+    due: Optional[date]
+    tags: tuple
+    project: str
+    version: int
+    completed_at: Optional[float]
 
-    def __post_init__(self):
-        """Validate the task attributes after initialization."""
-        if not self.title.strip():
-            raise ValueError("Title cannot be empty")
-        if self.status not in ["pending", "completed"]:
-            raise ValueError("Status must be either 'pending' or 'completed'")
\ No newline at end of file
+    def to_dict(self) -> dict:
+        """Return a plain dict of the snapshot, in the same shape as Task.to_dict()."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "status": str(self.status),
+            "priority": int(self.priority),
+            "due": self.due.isoformat() if self.due else None,
+            "tags": list(self.tags),
+            "project": self.project,
+            "version": self.version,
+            "completed_at": self.completed_at,
+        }
+
+
+# Enum members by value; indexing these is much cheaper than calling the enum
+_STATUS_MEMBERS = {str(status): status for status in TaskStatus}
+_PRIORITY_MEMBERS = list(Priority)
+
+
+def _unpickle_task(id: int, title: str, description: str, status: str, priority: int,
+                   due: Optional[date], tags: tuple, project: str, version: int = 1,
+                   completed_at: Optional[float] = None) -> Task:
+    return Task.unchecked(id, title, description, _STATUS_MEMBERS[status], _PRIORITY_MEMBERS[priority],
+                          due, tags, project, version, completed_at)
@@ -0,0 +1,392 @@
+"""Query language for listing tasks, and a planner that picks how to run a query."""
+import heapq
+import operator
+import re
+from datetime import date
+from itertools import islice, takewhile
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .bitmap import BitmapIndex, decode
+from .models import STATUSES, Task, parse_due, parse_label, parse_priority
+from .search import SearchIndex, tokenize
+from .storage import StorageBackend
+
+# A quoted string, a comparison operator, or a bare word
+_TOKEN_RE = re.compile(r'"([^"]*)"|(<=|>=|!=|=|<|>|~)|([^\s"<>=!~]+)')
+
+_COMPARISONS = ("=", "!=", "<", "<=", ">", ">=")
+# Field -> the operators it supports
+_FIELDS = {
+    "id": _COMPARISONS,
+    "status": ("=", "!="),
+    "priority": _COMPARISONS,
+    "due": _COMPARISONS,
+    "title": ("=", "!=", "~"),
+    "description": ("=", "!=", "~"),
+    "tag": ("=", "!="),
+    "project": ("=", "!="),
+}
+_ORDER_FIELDS = ("id", "title", "status", "priority", "due")
+
+_OPERATORS = {"=": operator.eq, "!=": operator.ne, "<": operator.lt,
+              "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+# Width of the ID windows read by descending scans (see _scan_descending)
+_WINDOW = 1024
+
+
+class Condition(NamedTuple):
+    """One comparison of a task field against a value, e.g. status=pending."""
+    field: str
+    op: str
+    # Parsed value: an int, status, Priority, date (None for no due date),
+    # label, or for ~ the tuple of search terms
+    value: object
+    # The condition as written, for explain
+    text: str
+
+
+class Query(NamedTuple):
+    """A parsed list query: conditions (all must hold), ordering and limit."""
+    conditions: Tuple[Condition, ...] = ()
+    order: str = "id"
+    descending: bool = False
+    limit: Optional[int] = None
+
+    @property
+    def uses_indexes(self) -> bool:
+        """Whether the search or bitmap index could answer a condition."""
+        return any(c.op == "~" or c.field in ("tag", "project") for c in self.conditions)
+
+
+def parse_query(text: str) -> Query:
+    """
+    Parse a list query.
+
+    The grammar is "[where CONDITION [and CONDITION ...]] [order by FIELD
+    [asc|desc]] [limit N]". A condition is FIELD OP VALUE with one of the
+    fields id, status, priority, due, title, description, tag and project.
+    Every field supports = and !=; id, priority and due also support <, <=,
+    > and >=, and title and description support ~, which matches word
+    prefixes like search. Values containing spaces are quoted, and "none"
+    stands for no due date or project. Keywords are case-insensitive, e.g.
+    'where status=pending and title~"deploy" order by id desc limit 50'.
+
+    Returns:
+        The parsed Query
+
+    Raises:
+        ValueError: If the query is malformed or a value is invalid
+    """
+    tokens = []
+    for quoted, op, word in _TOKEN_RE.findall(text):
+        # Quoted strings are values, never keywords or operators
+        tokens.append(("value", quoted) if not op and not word else ("op", op) if op else ("word", word))
+    position = 0
+
+    def peek_keyword() -> Optional[str]:
+        if position < len(tokens) and tokens[position][0] == "word":
+            return tokens[position][1].lower()
+        return None
+
+    def take(kind: str, expected: str) -> str:
+        nonlocal position
+        if position == len(tokens) or tokens[position][0] not in (kind, "value" if kind == "word" else kind):
+            found = f"'{tokens[position][1]}'" if position < len(tokens) else "the end of the query"
+            raise ValueError(f"Expected {expected} but found {found}")
+        position += 1
+        return tokens[position - 1][1]
+
+    conditions = []
+    if peek_keyword() == "where":
+        position += 1
+        conditions.append(_parse_condition(take("word", "a field"), take("op", "an operator"),
+                                           take("word", "a value"), tokens[position - 1][0] == "value"))
+        while peek_keyword() == "and":
+            position += 1
+            conditions.append(_parse_condition(take("word", "a field"), take("op", "an operator"),
+                                               take("word", "a value"), tokens[position - 1][0] == "value"))
+    order, descending = "id", False
+    if peek_keyword() == "order":
+        position += 1
+        if peek_keyword() != "by":
+            raise ValueError("Expected 'by' after 'order'")
+        position += 1
+        order = take("word", "a field to order by").lower()
+        if order not in _ORDER_FIELDS:
+            raise ValueError(f"Cannot order by '{order}'; use one of: {', '.join(_ORDER_FIELDS)}")
+        if peek_keyword() in ("asc", "desc"):
+            descending = take("word", "asc or desc").lower() == "desc"
+    limit = None
+    if peek_keyword() == "limit":
+        position += 1
+        value = take("word", "a number")
+        if not value.isdigit():
+            raise ValueError("Limit must be a non-negative number")
+        limit = int(value)
+    if position != len(tokens):
+        raise ValueError(f"Unexpected '{tokens[position][1]}'")
+    return Query(tuple(conditions), order, descending, limit)
+
+
+def _parse_condition(field: str, op: str, raw: str, quoted: bool) -> Condition:
+    """Validate one condition and parse its value."""
+    field = field.lower()
+    if field not in _FIELDS:
+        raise ValueError(f"Unknown field '{field}'; use one of: {', '.join(_FIELDS)}")
+    if op not in _FIELDS[field]:
+        raise ValueError(f"Field '{field}' does not support '{op}'; use one of: {' '.join(_FIELDS[field])}")
+    text = f'{field}{op}"{raw}"' if quoted else f"{field}{op}{raw}"
+    none = not quoted and raw.lower() == "none"
+    if field == "id":
+        if not raw.isdigit():
+            raise ValueError("Task IDs must be numbers")
+        value = int(raw)
+    elif field == "status":
+        value = raw.lower()
+        if value not in STATUSES:
+            raise ValueError(f"Status must be one of {', '.join(STATUSES)}")
+    elif field == "priority":
+        value = parse_priority(raw)
+    elif field == "due":
+        if none and op not in ("=", "!="):
+            raise ValueError("Tasks without a due date can only be matched with = or !=")
+        value = None if none else parse_due(raw)
+    elif op == "~":
+        value = tuple(sorted(tokenize(raw)))
+        if not value:
+            raise ValueError(f"'{text}' has no words to match")
+    elif field in ("tag", "project"):
+        value = "" if none and field == "project" else parse_label(raw, field.capitalize())
+        if not value and field == "tag":
+            raise ValueError("Tag names cannot be empty")
+    else:
+        value = raw
+    return Condition(field, op, value, text)
+
+
+def _predicate(condition: Condition) -> Callable[[Task], bool]:
+    """Build a function testing whether a task satisfies a condition."""
+    field, op, value = condition.field, condition.op, condition.value
+    if op == "~":
+        def matches(task: Task) -> bool:
+            tokens = tokenize(getattr(task, field))
+            return all(any(token.startswith(term) for token in tokens) for term in value)
+        return matches
+    if field == "tag":
+        if op == "=":
+            return lambda task: value in task.tags
+        return lambda task: value not in task.tags
+    compare = _OPERATORS[op]
+    if field == "due" and op not in ("=", "!="):
+        # Undated tasks are neither before nor after any date
+        return lambda task: task.due is not None and compare(task.due, value)
+    getter = operator.attrgetter(field)
+    return lambda task: compare(getter(task), value)
+
+
+def _sort_key(field: str) -> Callable[[Task], tuple]:
+    """Return the sort key for an order by field; ties are broken by ID."""
+    if field == "title":
+        return lambda task: (task.title.casefold(), task.id)
+    if field == "due":
+        # Undated tasks sort after every dated one
+        return lambda task: (task.due is None, task.due or date.min, task.id)
+    getter = operator.attrgetter(field)
+    return lambda task: (getter(task), task.id)
+
+
+def _sorted(tasks: Iterator[Task], key: Callable[[Task], tuple], descending: bool,
+            limit: Optional[int]) -> Iterator[Task]:
+    """Yield tasks in key order, reading them all on the first next() call."""
+    if limit is None:
+        yield from sorted(tasks, key=key, reverse=descending)
+    else:
+        # A heap of `limit` tasks rather than a sort of every match
+        yield from (heapq.nlargest if descending else heapq.nsmallest)(limit, tasks, key=key)
+
+
+class _Path(NamedTuple):
+    """A way to produce candidate tasks for a query, in ID order."""
+    name: str
+    # Estimated number of candidates produced
+    rows: int
+    # Estimated number of tasks read to answer the query this way
+    cost: int
+    # Conditions every candidate satisfies, so they need no re-check
+    exact: Tuple[Condition, ...]
+    # Called with descending=True/False to open the candidate stream
+    open: Callable[[bool], Iterator[Task]]
+
+
+class Plan:
+    """
+    How a query will run: an access path, then filter, order and limit steps.
+
+    Every step is a generator over the one before it, so nothing is read
+    until the results are iterated, and when the access path already
+    yields tasks in the requested order, iteration stops at the limit.
+    """
+
+    def __init__(self, query: Query, path: _Path, rejected: List[_Path], total: int):
+        self.query = query
+        self.path = path
+        self.rejected = rejected
+        self.total = total
+        self.residual = tuple(c for c in query.conditions if c not in path.exact)
+
+    def execute(self) -> Iterator[Task]:
+        """Return an iterator over the matching tasks, in order."""
+        query = self.query
+        if query.limit == 0:
+            return iter(())
+        by_id = query.order == "id"
+        tasks = self.path.open(by_id and query.descending)
+        if self.residual:
+            predicates = [_predicate(condition) for condition in self.residual]
+            tasks = (task for task in tasks if all(test(task) for test in predicates))
+        if by_id:
+            return tasks if query.limit is None else islice(tasks, query.limit)
+        return _sorted(tasks, _sort_key(query.order), query.descending, query.limit)
+
+    def describe(self) -> List[str]:
+        """Return the plan as lines of text, as shown by the explain command."""
+        query = self.query
+        lines = [f"access:   {self.path.name} (~{self.path.rows} of {self.total} tasks, cost ~{self.path.cost})"]
+        lines.append(f"filter:   {' and '.join(c.text for c in self.residual) if self.residual else 'none'}")
+        direction = "desc" if query.descending else "asc"
+        if query.order == "id":
+            lines.append(f"order:    id {direction}, as produced by the access path")
+        elif query.limit is None:
+            lines.append(f"order:    {query.order} {direction}, sorting every match")
+        else:
+            lines.append(f"order:    {query.order} {direction}, keeping the top {query.limit} in a heap")
+        if query.limit is not None:
+            stops = f", stops reading once {query.limit} tasks match" if query.order == "id" else ""
+            lines.append(f"limit:    {query.limit}{stops}")
+        for path in self.rejected:
+            lines.append(f"rejected: {path.name} (cost ~{path.cost})")
+        return lines
+
+
+def plan_query(query: Query, tasks: StorageBackend, search: Optional[SearchIndex] = None,
+               bitmaps: Optional[BitmapIndex] = None) -> Plan:
+    """
+    Choose the cheapest way to run a query.
+
+    The access paths considered are a full scan, an ID range, a status
+    partition and, when the indexes are given, the bitmap index (status,
+    tag and project equality) and the search index (~ conditions). Each
+    path's candidate count is estimated from counts the backend and indexes
+    keep, without reading tasks. A path is costed at the tasks it reads:
+    all its candidates, or, when it yields tasks in the requested order
+    and there is a limit, about as many as it takes to find that many
+    matches.
+
+    Args:
+        query: The parsed query
+        tasks: The backend to read tasks from
+        search: The search index, if it is up to date
+        bitmaps: The bitmap index, if it is up to date
+    """
+    total = tasks.count()
+    # (name, estimated candidates, directions streamed in ID order without
+    # reading every candidate first, exact conditions, opener), most
+    # specific first
+    candidates = []
+
+    low, high, bounds = None, None, []
+    for condition in query.conditions:
+        if condition.field == "id" and condition.op != "!=":
+            value = condition.value
+            if condition.op in ("=", ">", ">="):
+                value += condition.op == ">"
+                low = value if low is None else max(low, value)
+            if condition.op in ("=", "<", "<="):
+                value -= condition.op == "<"
+                high = value if high is None else min(high, value)
+            bounds.append(condition)
+    if bounds:
+        first, last = low or 1, tasks.next_id() - 1 if high is None else high
+        candidates.append((f"ID range {first}..{last}", max(0, min(last - first + 1, total)), (False, True),
+                           tuple(bounds), lambda descending: _scan(tasks, low, high, descending)))
+
+    statuses = [c for c in query.conditions if c.field == "status" and c.op == "="]
+    if statuses:
+        status = statuses[0].value
+        candidates.append((f"status partition {status}", tasks.count(status), (False,), (statuses[0],),
+                           lambda descending: _scan_status(tasks, status, descending)))
+
+    if bitmaps is not None:
+        labels = [c for c in query.conditions
+                  if c.op == "=" and (c.field in ("tag", "status") or c.field == "project" and c.value)]
+        if any(c.field != "status" for c in labels):
+            keys = [f"{c.field}:{c.value}" for c in labels]
+            node = ("key", keys[0])
+            for key in keys[1:]:
+                node = ("and", node, ("key", key))
+            candidates.append((f"bitmap index {' & '.join(keys)}", min(bitmaps.count(key) for key in keys), (),
+                               tuple(labels), lambda descending: _fetch(tasks, decode(bitmaps.evaluate(node)),
+                                                                        descending)))
+
+    if search is not None:
+        terms = " ".join(" ".join(c.value) for c in query.conditions if c.op == "~")
+        if terms:
+            candidates.append((f'search index "{terms}"', search.estimate(terms), (), (),
+                               lambda descending: _fetch(tasks, search.search(terms), descending)))
+
+    candidates.append(("full scan", total, (False, True), (),
+                       lambda descending: _scan(tasks, None, None, descending)))
+
+    # The result is no larger than the most selective path's candidates
+    matches = min(rows for _, rows, _, _, _ in candidates)
+    limited = query.order == "id" and query.limit is not None
+    paths = []
+    for name, rows, streamed, exact, opener in candidates:
+        cost = rows
+        if limited and query.descending in streamed and matches:
+            # Matches are assumed spread evenly over the candidates
+            cost = min(rows, -(-query.limit * rows // matches))
+        paths.append(_Path(name, rows, cost, exact, opener))
+    # Ties go to the path listed first
+    best = min(paths, key=lambda path: path.cost)
+    return Plan(query, best, [path for path in paths if path is not best], total)
+
+
+def _scan(tasks: StorageBackend, low: Optional[int], high: Optional[int], descending: bool) -> Iterator[Task]:
+    """Yield the tasks with IDs from low to high (either may be open), in ID order."""
+    if descending:
+        below = tasks.next_id()
+        return _scan_descending(tasks, low or 1, below if high is None else min(high + 1, below))
+    scan = tasks.scan(after_id=None if low is None else low - 1)
+    return scan if high is None else takewhile(lambda task: task.id <= high, scan)
+
+
+def _scan_descending(tasks: StorageBackend, low: int, below: int) -> Iterator[Task]:
+    """
+    Yield the tasks with low <= ID < below, highest ID first.
+
+    Backends only scan forwards, so this seeks to windows of _WINDOW IDs
+    from the top down and reverses each window's tasks, reading no more
+    than one window past the last task the caller takes.
+    """
+    while below > low:
+        start = max(low, below - _WINDOW)
+        window = [task for task in tasks.scan(after_id=start - 1, limit=below - start) if task.id < below]
+        yield from reversed(window)
+        below = start
+
+
+def _scan_status(tasks: StorageBackend, status: str, descending: bool) -> Iterator[Task]:
+    """Yield the tasks with a status in ID order; descending reads the whole partition first."""
+    if descending:
+        yield from reversed(list(tasks.scan(status=status)))
+    else:
+        yield from tasks.scan(status=status)
+
+
+def _fetch(tasks: StorageBackend, ids: List[int], descending: bool) -> Iterator[Task]:
+    """Look up tasks by ascending IDs from an index, skipping any deleted since."""
+    for task_id in reversed(ids) if descending else ids:
+        task = tasks.get(task_id)
+        if task is not None:
+            yield task
@@ -0,0 +1,91 @@
+"""Task formatting for the CLI, and a cache of formatted lines and listings."""
+from collections import OrderedDict
+from typing import Optional
+
+from .models import Task
+
+
+def format_task(task: Task) -> str:
+    """Format a task as one line of list output."""
+    status_indicator = "[x]" if task.status == "completed" else "[ ]"
+    line = f"{task.id}. {status_indicator} {task.title} - {task.description}"
+    if task.priority or task.due:
+        details = []
+        if task.priority:
+            details.append(f"priority: {task.priority.name.lower()}")
+        if task.due:
+            details.append(f"due: {task.due.isoformat()}")
+        line += f" ({', '.join(details)})"
+    if task.project:
+        line += f" @{task.project}"
+    if task.tags:
+        line += " " + " ".join(f"#{tag}" for tag in task.tags)
+    return line
+
+
+class RenderCache:
+    """
+    LRU caches of formatted task lines and of whole listings.
+
+    A TodoManager given a cache calls invalidate() whenever it adds,
+    changes or removes a task. That drops the task's line, so the next
+    listing formats only the tasks that changed. It also drops every cached
+    listing, since any of them may include the task.
+
+    Attributes:
+        max_lines: Most task lines kept
+        max_pages: Most listings kept
+    """
+
+    def __init__(self, max_lines: int = 100_000, max_pages: int = 4):
+        """
+        Raises:
+            ValueError: If a size is not positive
+        """
+        if max_lines < 1 or max_pages < 1:
+            raise ValueError("Cache sizes must be at least 1")
+        self.max_lines = max_lines
+        self.max_pages = max_pages
+        self._lines: OrderedDict[int, str] = OrderedDict()
+        self._pages: OrderedDict[str, str] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached task lines."""
+        return len(self._lines)
+
+    def line(self, task: Task) -> str:
+        """Return a task's formatted line, formatting it only if it is not cached."""
+        lines = self._lines
+        line = lines.get(task.id)
+        if line is not None:
+            lines.move_to_end(task.id)
+            return line
+        line = lines[task.id] = format_task(task)
+        if len(lines) > self.max_lines:
+            lines.popitem(last=False)
+        return line
+
+    def page(self, key: str) -> Optional[str]:
+        """Return a cached listing, or None."""
+        text = self._pages.get(key)
+        if text is not None:
+            self._pages.move_to_end(key)
+        return text
+
+    def store_page(self, key: str, text: str) -> None:
+        """Cache a listing, e.g. the output of a list command, under a key."""
+        self._pages[key] = text
+        self._pages.move_to_end(key)
+        if len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def invalidate(self, task_id: int) -> None:
+        """Forget a task's line and every listing, after the task was added, changed or removed."""
+        self._lines.pop(task_id, None)
+        if self._pages:
+            self._pages.clear()
+
+    def clear(self) -> None:
+        """Forget everything."""
+        self._lines.clear()
+        self._pages.clear()
@@ -0,0 +1,375 @@
+"""
+Log-shipping replication: a primary streams its changes to read replicas.
+
+The primary's TodoManager is the only one that takes writes. Its change
+feed is the replication log: a ReplicationPrimary streams it over a local
+TCP or Unix socket to any number of Replica processes, which apply it to
+their own in-memory TodoManager and serve reads from it. Reads on a
+replica run in another process and never wait for the writer.
+
+Protocol (newline-delimited JSON, one message per line):
+
+    replica -> primary   {"since": seq, "epoch": epoch}   once, on connecting
+                         {"applied": seq}                 after each heartbeat
+    primary -> replica   {"snapshot": seq, "epoch": epoch, "count": n}
+                         followed by n task lines         the full collection
+                         {"seq", "op", "id", "data"}      a change
+                         {"seq": seq, "at": time}         a heartbeat
+
+A replica that connects for the first time, fell further behind than the
+feed's capacity, or follows a primary that has restarted (a new epoch)
+is sent a snapshot first; otherwise streaming resumes after its last
+applied change. Archived tasks are not replicated.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+from .changes import Change
+from .exceptions import ChangesExpiredError
+from .manager import TodoManager
+from .models import Task
+
+# Most changes or snapshot tasks written per send
+_BATCH = 1000
+# Changes a replica applies before letting its readers run
+_YIELD_EVERY = 1000
+# Longest line a replica reads (a task or change, JSON-encoded), like the
+# server's request body limit
+_LINE_LIMIT = 16 * 1024 * 1024
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _line(message: dict) -> bytes:
+    return _encode(message).encode("utf-8") + b"\n"
+
+
+class ReplicationPrimary:
+    """
+    Streams a TodoManager's change feed to replicas.
+
+    Runs on the asyncio loop that makes the manager's changes (e.g. next
+    to a TodoServer), so a snapshot taken between two awaits is
+    consistent without locking.
+
+    Attributes:
+        manager: The manager whose changes are shipped
+        epoch: Random token identifying this primary's feed; a replica
+            that followed another epoch is resynchronized from a snapshot
+    """
+
+    def __init__(self, manager: TodoManager, host: str = "127.0.0.1", port: int = 0,
+                 path: Optional[str] = None, heartbeat_interval: float = 1.0):
+        """
+        Args:
+            manager: The primary's manager (it needs a change feed)
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            path: Listen on this Unix socket instead of host and port
+            heartbeat_interval: Seconds between heartbeats, which carry the
+                primary's latest seq so replicas can report their lag
+
+        Raises:
+            ValueError: If the manager has no change feed
+        """
+        manager.changes_seq()
+        self.manager = manager
+        self.epoch = os.urandom(8).hex()
+        self._host = host
+        self._port = port
+        self._path = path
+        self._heartbeat_interval = heartbeat_interval
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._unsubscribe = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[int] = None
+        # One event per connection, set when there are changes to ship
+        self._events: set = set()
+        # Connection task -> [peer, seq the replica last reported applying, writer]
+        self._replicas: dict = {}
+        self._closing = False
+
+    @property
+    def port(self) -> int:
+        """The bound port (useful when started with port 0)."""
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self) -> None:
+        """Start listening for replicas."""
+        self._loop = asyncio.get_running_loop()
+        self._thread = threading.get_ident()
+        self._unsubscribe = self.manager.subscribe(self._notify)
+        if self._path is not None:
+            self._server = await asyncio.start_unix_server(self._serve, self._path)
+        else:
+            self._server = await asyncio.start_server(self._serve, self._host, self._port)
+
+    async def close(self) -> None:
+        """Stop listening and disconnect every replica."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        # Let each connection finish, rather than cancel it mid-write
+        self._closing = True
+        connections = list(self._replicas)
+        for task in connections:
+            self._replicas[task][2].transport.abort()
+        self._wake()
+        await asyncio.gather(*connections, return_exceptions=True)
+        self._closing = False
+
+    def status(self) -> dict:
+        """Return the latest seq and, per connected replica, what it has applied and how far behind it is."""
+        seq = self.manager.changes_seq()
+        return {
+            "role": "primary",
+            "epoch": self.epoch,
+            "seq": seq,
+            "replicas": [{"peer": peer, "applied": applied, "lag": seq - applied}
+                         for peer, applied, _ in self._replicas.values()],
+        }
+
+    def _notify(self, change: Change) -> None:
+        """Feed subscriber: wake the connections, from whichever thread made the change."""
+        if threading.get_ident() == self._thread:
+            self._wake()
+        else:
+            self._loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self) -> None:
+        for event in self._events:
+            event.set()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Ship changes to one replica until it disconnects."""
+        task = asyncio.current_task()
+        peer = writer.get_extra_info("peername")
+        event = asyncio.Event()
+        acks = None
+        try:
+            hello = json.loads(await reader.readline())
+            state = self._replicas[task] = [
+                f"{peer[0]}:{peer[1]}" if isinstance(peer, tuple) else "local", int(hello["since"]), writer]
+            self._events.add(event)
+            acks = asyncio.create_task(self._read_acks(reader, state))
+            since = state[1]
+            if hello.get("epoch") != self.epoch or not 0 <= since <= self.manager.changes_seq():
+                since = await self._send_snapshot(writer)
+            await self._ship(writer, since, event)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError, KeyError, TypeError):
+            pass
+        finally:
+            if acks is not None:
+                acks.cancel()
+            self._events.discard(event)
+            self._replicas.pop(task, None)
+            writer.close()
+
+    async def _ship(self, writer: asyncio.StreamWriter, cursor: int, event: asyncio.Event) -> None:
+        """Write every change after cursor, then each new one as it is made, with heartbeats in between."""
+        manager = self.manager
+        next_heartbeat = 0.0
+        while not self._closing:
+            try:
+                changes = manager.changes_since(cursor, _BATCH)
+            except ChangesExpiredError:
+                # The replica fell too far behind the feed: start it over
+                cursor = await self._send_snapshot(writer)
+                continue
+            if changes:
+                writer.write(b"".join(_line(change.to_dict()) for change in changes))
+                cursor = changes[-1].seq
+            # Written between whole batches, never inside a snapshot
+            if time.monotonic() >= next_heartbeat:
+                writer.write(_line({"seq": manager.changes_seq(), "at": time.time()}))
+                next_heartbeat = time.monotonic() + self._heartbeat_interval
+            if changes:
+                # Only waits while the replica is not keeping up
+                await writer.drain()
+                continue
+            event.clear()
+            try:
+                await asyncio.wait_for(event.wait(), max(0.0, next_heartbeat - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _send_snapshot(self, writer: asyncio.StreamWriter) -> int:
+        """Write every task as of now, and return the seq it is current up to."""
+        # Taken without awaiting, so no change can land in the middle
+        seq = self.manager.changes_seq()
+        tasks = [task.to_dict() for task in self.manager.iter_tasks()]
+        writer.write(_line({"snapshot": seq, "epoch": self.epoch, "count": len(tasks)}))
+        for start in range(0, len(tasks), _BATCH):
+            writer.write(b"".join(_line(task) for task in tasks[start:start + _BATCH]))
+            await writer.drain()
+        return seq
+
+    @staticmethod
+    async def _read_acks(reader: asyncio.StreamReader, state: list) -> None:
+        """Record the seq the replica reports after each heartbeat."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                state[1] = json.loads(line)["applied"]
+        except (ConnectionError, ValueError, KeyError):
+            return
+
+
+class Replica:
+    """
+    Follows a ReplicationPrimary, applying its changes to a local TodoManager.
+
+    run() connects, loads a snapshot when the primary sends one, applies
+    the changes that follow, and reconnects whenever the connection drops.
+    Changes are applied on the replica's event loop between reads, a
+    bounded number at a time, so readers on the same loop never see a
+    half-applied change or a half-loaded snapshot, and need no lock.
+
+    Attributes:
+        manager: The replica's manager; read from it, never write to it
+        applied: Seq of the last change applied
+        epoch: Epoch of the primary the replica follows (None before the
+            first snapshot)
+    """
+
+    def __init__(self, manager: TodoManager, host: str = "127.0.0.1", port: int = 0,
+                 path: Optional[str] = None, retry_interval: float = 1.0,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        """
+        Args:
+            manager: An empty in-memory manager to replicate into
+            host: The primary's host
+            port: The primary's replication port
+            path: Connect to this Unix socket instead of host and port
+            retry_interval: Seconds to wait before reconnecting
+            on_error: Called with the error whenever the replica falls out
+                of step with the primary and resynchronizes from a
+                snapshot (also counted in status())
+        """
+        self.manager = manager
+        self.applied = 0
+        self.epoch: Optional[str] = None
+        self._host = host
+        self._port = port
+        self._path = path
+        self._retry_interval = retry_interval
+        self._on_error = on_error
+        self._connected = False
+        self._primary_seq = 0
+        self._resyncs = 0
+        self._last_error: Optional[str] = None
+        # (seq, time) of heartbeats newer than what has been applied
+        self._heartbeats: deque = deque()
+        # The primary's clock time of the newest state applied
+        self._current_at: Optional[float] = None
+
+    def status(self) -> dict:
+        """
+        Return the replication state.
+
+        "lag" is how many changes the replica is behind the latest seq the
+        primary announced; "seconds_behind" is how old the replica's state
+        is, to within a heartbeat interval (0 when caught up).
+        """
+        lag = max(0, self._primary_seq - self.applied)
+        behind = 0.0
+        if lag and self._current_at is not None:
+            behind = max(0.0, time.time() - self._current_at)
+        return {
+            "role": "replica",
+            "primary": self._path or f"{self._host}:{self._port}",
+            "connected": self._connected,
+            "applied": self.applied,
+            "primary_seq": self._primary_seq,
+            "lag": lag,
+            "seconds_behind": behind,
+            "resyncs": self._resyncs,
+            "last_error": self._last_error,
+        }
+
+    async def run(self) -> None:
+        """Follow the primary until cancelled."""
+        while True:
+            try:
+                if self._path is not None:
+                    reader, writer = await asyncio.open_unix_connection(self._path, limit=_LINE_LIMIT)
+                else:
+                    reader, writer = await asyncio.open_connection(self._host, self._port, limit=_LINE_LIMIT)
+            except OSError:
+                await asyncio.sleep(self._retry_interval)
+                continue
+            try:
+                await self._follow(reader, writer)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+            except (KeyError, ValueError, TypeError) as e:
+                # Out of step with the primary (or a line over the limit,
+                # which readline reports as ValueError): start over from a
+                # snapshot
+                self.epoch = None
+                self._resyncs += 1
+                self._last_error = repr(e)
+                if self._on_error is not None:
+                    self._on_error(e)
+            finally:
+                self._connected = False
+                writer.close()
+            await asyncio.sleep(self._retry_interval)
+
+    async def _follow(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Apply what the primary sends until it disconnects."""
+        writer.write(_line({"since": self.applied, "epoch": self.epoch}))
+        self._connected = True
+        pending = 0
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            message = json.loads(line)
+            if "op" in message:
+                self.manager.apply_change(Change(message["seq"], message["op"], message["id"], message["data"]))
+                self.applied = message["seq"]
+                pending += 1
+                if pending == _YIELD_EVERY:
+                    # A burst is buffered: let readers in before applying more
+                    pending = 0
+                    self._advance()
+                    await asyncio.sleep(0)
+            elif "snapshot" in message:
+                await self._load_snapshot(reader, message)
+            else:
+                self._primary_seq = max(self._primary_seq, message["seq"])
+                self._heartbeats.append((message["seq"], message["at"]))
+                self._advance()
+                writer.write(_line({"applied": self.applied}))
+
+    async def _load_snapshot(self, reader: asyncio.StreamReader, header: dict) -> None:
+        """Replace the replica's tasks with the snapshot that follows a header."""
+        tasks: List[Task] = []
+        for _ in range(header["count"]):
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("Primary closed the connection during a snapshot")
+            tasks.append(Task.from_dict(json.loads(line)))
+        # Swapped in without awaiting, so readers see the old state or the new one
+        self.manager.replace_all(tasks)
+        self.applied = self._primary_seq = header["snapshot"]
+        self.epoch = header["epoch"]
+        self._heartbeats.clear()
+        self._current_at = None
+
+    def _advance(self) -> None:
+        """Move the replica's state time up to the newest heartbeat it has applied past."""
+        heartbeats = self._heartbeats
+        while heartbeats and heartbeats[0][0] <= self.applied:
+            self._current_at = heartbeats.popleft()[1]
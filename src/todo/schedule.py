@@ -0,0 +1,97 @@
+"""Priority queue and due-date index behind TodoManager's "next up" queries."""
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from typing import List
+
+from .models import Task, TaskStatus
+
+# Sort key used for tasks without a due date, so they rank after dated ones
+_NO_DUE = date.max.toordinal() + 1
+
+
+def schedule_key(task: Task) -> tuple:
+    """Ordering of tasks by urgency: higher priority, then earlier due date, then ID."""
+    return (-task.priority, task.due.toordinal() if task.due else _NO_DUE, task.id)
+
+
+class ScheduleIndex:
+    """
+    Indexes the pending tasks that have a priority or a due date.
+
+    A binary heap keyed by schedule_key() answers "next n tasks" by popping
+    n entries and pushing them back, in O(n log m) for m indexed tasks.
+    Entries are invalidated lazily: a change pushes a fresh entry, and
+    stale ones are discarded when they surface. A list of (due date, id)
+    pairs kept sorted with bisect answers due-date range queries in
+    O(log m + k). Tasks with neither priority nor due date are not indexed
+    at all, so plain tasks cost nothing.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        # Current key of every indexed task; heap entries not matching it are stale
+        self._keys: dict[int, tuple] = {}
+        self._heap: List[tuple] = []
+        self._due: List[tuple] = []
+
+    def __len__(self) -> int:
+        """Return the number of indexed tasks."""
+        return len(self._keys)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._keys
+
+    def add(self, task: Task) -> None:
+        """Index a task if it is pending and has a priority or due date."""
+        if task.status != TaskStatus.PENDING or not (task.priority or task.due):
+            return
+        key = schedule_key(task)
+        self._keys[task.id] = key
+        heapq.heappush(self._heap, key)
+        if task.due:
+            insort(self._due, (key[1], task.id))
+
+    def remove(self, task_id: int) -> None:
+        """Drop a task from the index (no-op if it is not indexed)."""
+        key = self._keys.pop(task_id, None)
+        if key is None:
+            return
+        if key[1] != _NO_DUE:
+            del self._due[bisect_left(self._due, (key[1], task_id))]
+        # Rebuild once stale entries outnumber live ones
+        if len(self._heap) > 2 * len(self._keys) + 64:
+            self._heap = list(self._keys.values())
+            heapq.heapify(self._heap)
+
+    def update(self, task: Task) -> None:
+        """Re-index a task after its status, priority or due date changed."""
+        self.remove(task.id)
+        self.add(task)
+
+    def next_ids(self, n: int) -> List[int]:
+        """Return the IDs of the n most urgent indexed tasks, most urgent first."""
+        heap, keys = self._heap, self._keys
+        found: List[tuple] = []
+        seen = set()
+        while len(found) < n and heap:
+            key = heapq.heappop(heap)
+            task_id = key[2]
+            # Skip stale entries, and duplicates left by a key changing back
+            if keys.get(task_id) == key and task_id not in seen:
+                seen.add(task_id)
+                found.append(key)
+        for key in found:
+            heapq.heappush(heap, key)
+        return [key[2] for key in found]
+
+    def due_ids(self, start: date, end: date) -> List[int]:
+        """Return the IDs of tasks due from start to end inclusive, by due date then ID."""
+        lo = bisect_left(self._due, (start.toordinal(),))
+        hi = bisect_right(self._due, (end.toordinal(), float("inf")))
+        return [task_id for _, task_id in self._due[lo:hi]]
+
+    def due_before_ids(self, day: date) -> List[int]:
+        """Return the IDs of tasks due strictly before a date, by due date then ID."""
+        hi = bisect_left(self._due, (day.toordinal(),))
+        return [task_id for _, task_id in self._due[:hi]]
@@ -0,0 +1,198 @@
+"""Inverted index for full-text search over task titles and descriptions."""
+import heapq
+import re
+import sys
+from bisect import bisect_left
+from typing import List, Optional
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# New tokens are collected unsorted and merged into the sorted vocabulary
+# once this many have accumulated, keeping inserts amortized O(1).
+_MERGE_THRESHOLD = 1024
+
+
+def tokenize(text: str) -> set[str]:
+    """Split text into a set of case-folded word tokens."""
+    return set(_TOKEN_RE.findall(text.casefold()))
+
+
+def _document_tokens(texts: tuple) -> tuple[str, ...]:
+    """Tokenize a document's fields into a tuple of interned tokens."""
+    tokens = tokenize(" ".join(texts))
+    return tuple(map(sys.intern, tokens))
+
+
+class SearchIndex:
+    """
+    Inverted index mapping case-folded tokens to the IDs of tasks containing them.
+
+    Every query term is matched as a prefix: "dep" matches "deploy" and
+    "deps". Prefix lookups binary-search a sorted vocabulary, so query cost
+    depends on the size of the matching posting lists, not on the number
+    of tasks indexed.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._postings: dict[str, set[int]] = {}
+        # Per-task tokens, kept as interned tuples: far smaller than sets
+        self._doc_tokens: dict[int, tuple[str, ...]] = {}
+        self._vocabulary: list[str] = []
+        self._unmerged: set[str] = set()
+        # Most tasks indexed since the last compaction (see _compact)
+        self._peak = 0
+
+    def __len__(self) -> int:
+        """Return the number of indexed tasks."""
+        return len(self._doc_tokens)
+
+    def add(self, task_id: int, *texts: str) -> None:
+        """
+        Index a task's text fields.
+
+        Args:
+            task_id: The ID of the task
+            texts: The text fields to index (e.g. title and description)
+        """
+        tokens = _document_tokens(texts)
+        self._doc_tokens[task_id] = tokens
+        postings = self._postings
+        for token in tokens:
+            ids = postings.get(token)
+            if ids is None:
+                postings[token] = {task_id}
+                self._unmerged.add(token)
+            else:
+                ids.add(task_id)
+
+    def update(self, task_id: int, *texts: str) -> None:
+        """Re-index a task, touching only the tokens that changed."""
+        old = set(self._doc_tokens.get(task_id, ()))
+        new = _document_tokens(texts)
+        for token in old.difference(new):
+            self._remove_posting(token, task_id)
+        for token in set(new).difference(old):
+            self._add_posting(token, task_id)
+        self._doc_tokens[task_id] = new
+
+    def remove(self, task_id: int) -> None:
+        """Remove a task from the index (no-op if it is not indexed)."""
+        self._peak = max(self._peak, len(self._doc_tokens))
+        for token in self._doc_tokens.pop(task_id, ()):
+            self._remove_posting(token, task_id)
+        if len(self._doc_tokens) * 4 < self._peak:
+            self._compact()
+
+    def _compact(self) -> None:
+        """
+        Copy the dict and posting sets once most indexed tasks are removed.
+
+        Dicts and sets never shrink as entries are removed; copying them
+        after three quarters of the peak are gone (e.g. by archiving) keeps
+        memory proportional to the indexed tasks at O(1) amortized cost.
+        """
+        self._doc_tokens = dict(self._doc_tokens)
+        self._postings = {token: set(ids) for token, ids in self._postings.items()}
+        self._peak = len(self._doc_tokens)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """
+        Find tasks matching every term of a query.
+
+        Args:
+            query: Free text; each term is case-folded and prefix-matched
+            limit: Maximum number of IDs to return (None for no limit)
+
+        Returns:
+            Matching task IDs in ascending order
+        """
+        terms = tokenize(query)
+        if not terms or limit == 0:
+            return []
+        if len(self._unmerged) >= _MERGE_THRESHOLD:
+            self._merge_vocabulary()
+
+        # Materialize only the most selective term (the one expanding to the
+        # fewest tokens), then check the remaining terms against each
+        # candidate's own tokens instead of building wide prefix unions.
+        expansions = sorted(((self._expand(term), term) for term in terms), key=lambda e: len(e[0]))
+        result = self._union(expansions[0][0])
+        rest = [term for _, term in expansions[1:]]
+        if rest and result:
+            doc_tokens = self._doc_tokens
+            result = {
+                task_id for task_id in result
+                if all(any(token.startswith(term) for token in doc_tokens[task_id]) for term in rest)
+            }
+
+        if limit is None:
+            return sorted(result)
+        return heapq.nsmallest(limit, result)
+
+    def estimate(self, query: str) -> int:
+        """
+        Return an upper bound on the number of tasks matching a query, without running it.
+
+        The bound is the smallest total size of any term's posting lists,
+        which costs one vocabulary lookup per term.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return 0
+        if len(self._unmerged) >= _MERGE_THRESHOLD:
+            self._merge_vocabulary()
+        postings = self._postings
+        return min(sum(len(postings[token]) for token in self._expand(term)) for term in terms)
+
+    def _expand(self, prefix: str) -> list[str]:
+        """Return the live vocabulary tokens starting with prefix."""
+        tokens = [t for t in self._unmerged if t.startswith(prefix)]
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, prefix)
+        end = bisect_left(vocabulary, prefix + "\U0010ffff", start)
+        tokens.extend(t for t in vocabulary[start:end] if t in self._postings)
+        return tokens
+
+    def _union(self, tokens: list[str]) -> set[int]:
+        """Return the IDs of tasks containing any of the given tokens."""
+        postings = self._postings
+        if len(tokens) == 1:
+            return postings[tokens[0]]
+        matches: set[int] = set()
+        for token in tokens:
+            matches |= postings[token]
+        return matches
+
+    def _add_posting(self, token: str, task_id: int) -> None:
+        ids = self._postings.get(token)
+        if ids is None:
+            self._postings[token] = {task_id}
+            self._unmerged.add(token)
+        else:
+            ids.add(task_id)
+
+    def _remove_posting(self, token: str, task_id: int) -> None:
+        ids = self._postings[token]
+        ids.discard(task_id)
+        if not ids:
+            # The token stays in the sorted vocabulary until the next merge;
+            # lookups skip it because it has no posting list.
+            del self._postings[token]
+            self._unmerged.discard(token)
+
+    def _merge_vocabulary(self) -> None:
+        """
+        Fold unmerged tokens into the sorted vocabulary, dropping dead ones.
+
+        Runs lazily from search(), possibly in several reader threads at once
+        under ConcurrentTodoManager. That is safe: merges only reorganize
+        tokens that are already indexed, and the vocabulary is replaced
+        before the unmerged set, so a concurrent _expand() may see a token
+        twice but never miss one.
+        """
+        merged = {t for t in self._vocabulary if t in self._postings}
+        merged |= self._unmerged
+        self._vocabulary = sorted(merged)
+        self._unmerged = set()
+
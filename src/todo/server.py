@@ -0,0 +1,432 @@
+"""
+asyncio HTTP/JSON service exposing a TodoManager (stdlib only).
+
+Endpoints:
+    GET    /tasks                 List tasks (?status=&after_id=&offset=&limit=)
+    POST   /tasks                 Add a task ({"title", "description"})
+    GET    /tasks/{id}            Get a task
+    PATCH  /tasks/{id}            Update a task ({"title"?, "description"?, "expected_version"?})
+    POST   /tasks/{id}/complete   Mark a task as complete ({"expected_version"?})
+    DELETE /tasks/{id}            Delete a task
+    GET    /search                Full-text search (?q=&limit=)
+    GET    /stats                 Task counts by status
+    GET    /changes               Changes after a sequence number (?since=&limit=)
+    GET    /replication           Replication status and lag
+    POST   /batch                 Run a list of {"method", "path", "body"?} requests
+
+Connections are kept alive (HTTP/1.1) and pipelined requests are answered in
+order. With an archive, completed tasks are moved to it in the background
+once they are old enough (see --archive-after). Tasks carry a version;
+requests with an expected_version only apply if the task is still at it and
+answer 409 Conflict otherwise. A primary (--replication-port) streams its
+changes to read-only replicas (--replica-of), which answer writes with 403.
+Run with: python -m src.todo.server [--host HOST] [--port PORT]
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+from http import HTTPStatus
+from typing import Any, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from .archive import ColdStore
+from .changes import ChangeFeed
+from .exceptions import BulkOperationError, ChangesExpiredError, TaskNotFoundError, VersionConflictError
+from .journal import Journal
+from .manager import TodoManager
+from .replication import Replica, ReplicationPrimary
+
+# Upper bound on a request body, to keep a bad client from exhausting memory
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+_TASK_PATH = re.compile(r"^/tasks/(\d+)$")
+_COMPLETE_PATH = re.compile(r"^/tasks/(\d+)/complete$")
+
+# Most tasks the background archiver moves per step between requests
+_ARCHIVE_BATCH = 10_000
+
+
+class HTTPError(Exception):
+    """Raised while handling a request to send an error response."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        self.status = status
+        super().__init__(message)
+
+
+class TodoServer:
+    """
+    Serves TodoManager operations over HTTP/JSON on an asyncio event loop.
+
+    All manager calls run on the event loop thread, one request at a time,
+    so the wrapped manager needs no locking. The optional archiver runs on
+    the same loop, archiving a bounded batch of tasks per step so requests
+    are never held up for long. So do the optional replication primary,
+    which streams changes to replicas, and replica, which applies them.
+
+    Attributes:
+        manager: The TodoManager requests are run against
+    """
+
+    def __init__(self, manager: TodoManager, host: str = "127.0.0.1", port: int = 8080,
+                 archive_after: Optional[float] = None, archive_interval: float = 60.0,
+                 primary: Optional[ReplicationPrimary] = None, replica: Optional[Replica] = None):
+        """
+        Args:
+            manager: The TodoManager to serve
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            archive_after: If given, archive tasks completed more than this
+                many seconds ago (the manager needs an archive)
+            archive_interval: Seconds between archiving passes
+            primary: Stream the manager's changes to replicas with this
+            replica: Serve as a read-only replica: follow a primary with
+                this replica (of the manager) and reject writes
+        """
+        self.manager = manager
+        self._host = host
+        self._port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._archive_after = archive_after
+        self._archive_interval = archive_interval
+        self._archiver: Optional[asyncio.Task] = None
+        self._primary = primary
+        self._replica = replica
+        self._follower: Optional[asyncio.Task] = None
+
+    @property
+    def port(self) -> int:
+        """The bound port (useful when started with port 0)."""
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self) -> None:
+        """Start listening for connections."""
+        self._server = await asyncio.start_server(self._handle_connection, self._host, self._port)
+        if self._archive_after is not None:
+            self._archiver = asyncio.create_task(self._archive_loop())
+        if self._primary is not None:
+            await self._primary.start()
+        if self._replica is not None:
+            self._follower = asyncio.create_task(self._replica.run())
+
+    async def serve_forever(self) -> None:
+        """Start the server if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop accepting connections and wait for the listener to close."""
+        for task in (self._archiver, self._follower):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._archiver = self._follower = None
+        if self._primary is not None:
+            await self._primary.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _archive_loop(self) -> None:
+        """Archive old completed tasks a batch at a time, every archive_interval seconds."""
+        while True:
+            while self.manager.archive_completed(self._archive_after, limit=_ARCHIVE_BATCH) == _ARCHIVE_BATCH:
+                # More to do: let waiting requests run before the next batch
+                await asyncio.sleep(0)
+            await asyncio.sleep(self._archive_interval)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer requests on one connection until the client closes it."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                keep_alive = True
+                try:
+                    method, target, version, headers = _parse_head(head)
+                    keep_alive = _wants_keep_alive(version, headers)
+                    body = await _read_body(reader, headers)
+                    status, payload = self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                    keep_alive = False
+                except asyncio.IncompleteReadError:
+                    break
+
+                writer.write(_format_response(status, payload, keep_alive))
+                # Responses to pipelined requests are written back to back;
+                # drain() only waits when the transport buffer is full.
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def dispatch(self, method: str, target: str, body: Any) -> Tuple[HTTPStatus, Any]:
+        """
+        Route a request to the manager.
+
+        Args:
+            method: HTTP method, e.g. "GET"
+            target: Request target, path plus optional query string
+            body: Decoded JSON body, or None
+
+        Returns:
+            The response status and JSON-serializable payload
+        """
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        query = dict(parse_qsl(url.query))
+        try:
+            return self._route(method, path, query, body)
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except TaskNotFoundError as e:
+            return HTTPStatus.NOT_FOUND, {"error": str(e)}
+        except ChangesExpiredError as e:
+            return HTTPStatus.GONE, {"error": str(e), "oldest": e.oldest}
+        except VersionConflictError as e:
+            return HTTPStatus.CONFLICT, {"error": str(e), "version": e.actual}
+        except BulkOperationError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e), "errors": {str(k): v for k, v in e.errors.items()}}
+        except (ValueError, TypeError) as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+
+    def _route(self, method: str, path: str, query: dict, body: Any) -> Tuple[HTTPStatus, Any]:
+        manager = self.manager
+        if self._replica is not None and method != "GET" and path != "/batch":
+            raise HTTPError(HTTPStatus.FORBIDDEN, "This server is a read-only replica")
+
+        if path == "/tasks":
+            if method == "GET":
+                tasks = manager.get_tasks(
+                    status=query.get("status"),
+                    offset=int(query.get("offset", 0)),
+                    limit=_optional_int(query.get("limit")),
+                    after_id=_optional_int(query.get("after_id")),
+                )
+                return HTTPStatus.OK, [task.to_dict() for task in tasks]
+            if method == "POST":
+                body = _require_object(body)
+                task_id = manager.add_task(_require_str(body, "title"), _optional_str(body, "description") or "")
+                return HTTPStatus.CREATED, manager.get_task(task_id).to_dict()
+            raise _method_not_allowed(method, path)
+
+        match = _TASK_PATH.match(path)
+        if match:
+            task_id = int(match.group(1))
+            if method == "GET":
+                return HTTPStatus.OK, manager.get_task(task_id).to_dict()
+            if method == "PATCH":
+                body = _require_object(body)
+                manager.update_task(task_id, _optional_str(body, "title"), _optional_str(body, "description"),
+                                    expected_version=_optional_version(body))
+                return HTTPStatus.OK, manager.get_task(task_id).to_dict()
+            if method == "DELETE":
+                manager.delete_task(task_id)
+                return HTTPStatus.NO_CONTENT, None
+            raise _method_not_allowed(method, path)
+
+        match = _COMPLETE_PATH.match(path)
+        if match:
+            if method != "POST":
+                raise _method_not_allowed(method, path)
+            task_id = int(match.group(1))
+            expected_version = _optional_version(_require_object(body)) if body is not None else None
+            if expected_version is None:
+                manager.mark_complete(task_id)
+            else:
+                manager.mark_complete_if(task_id, expected_version)
+            return HTTPStatus.OK, manager.get_task(task_id).to_dict()
+
+        if path == "/search" and method == "GET":
+            tasks = manager.search(query.get("q", ""), _optional_int(query.get("limit")))
+            return HTTPStatus.OK, [task.to_dict() for task in tasks]
+
+        if path == "/stats" and method == "GET":
+            return HTTPStatus.OK, manager.stats()
+
+        if path == "/changes" and method == "GET":
+            changes = manager.changes_since(int(query.get("since", 0)), _optional_int(query.get("limit")))
+            return HTTPStatus.OK, {
+                "seq": changes[-1].seq if changes else manager.changes_seq(),
+                "changes": [change.to_dict() for change in changes],
+            }
+
+        if path == "/replication" and method == "GET":
+            replication = self._replica or self._primary
+            if replication is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, "Replication is not configured")
+            return HTTPStatus.OK, replication.status()
+
+        if path == "/batch" and method == "POST":
+            return HTTPStatus.OK, self._batch(body)
+
+        if path in ("/search", "/stats", "/changes", "/replication", "/batch"):
+            raise _method_not_allowed(method, path)
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+
+    def _batch(self, body: Any) -> List[dict]:
+        """Run each sub-request in order and collect the individual responses."""
+        if not isinstance(body, list):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Batch body must be a JSON array")
+        results = []
+        for request in body:
+            if (not isinstance(request, dict) or not isinstance(request.get("method"), str)
+                    or not isinstance(request.get("path"), str)):
+                status, payload = HTTPStatus.BAD_REQUEST, {"error": "Each request needs a string method and path"}
+            elif request["path"].startswith("/batch"):
+                status, payload = HTTPStatus.BAD_REQUEST, {"error": "Batches cannot be nested"}
+            else:
+                status, payload = self.dispatch(request["method"].upper(), request["path"], request.get("body"))
+            results.append({"status": int(status), "body": payload})
+        return results
+
+
+def _parse_head(head: bytes) -> Tuple[str, str, str, dict]:
+    """Parse the request line and headers (header names are lowercased)."""
+    try:
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line") from None
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return method.upper(), target, version, headers
+
+
+def _wants_keep_alive(version: str, headers: dict) -> bool:
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: dict) -> Any:
+    """Read and decode a JSON body, if the request has one."""
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length") from None
+    if length < 0 or length > MAX_BODY_SIZE:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+    if not length:
+        return None
+    data = await reader.readexactly(length)
+    try:
+        return json.loads(data)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be valid JSON") from None
+
+
+def _format_response(status: HTTPStatus, payload: Any, keep_alive: bool) -> bytes:
+    body = b"" if payload is None else json.dumps(payload, separators=(",", ":")).encode()
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def _optional_int(value: Optional[str]) -> Optional[int]:
+    return None if value is None else int(value)
+
+
+def _require_object(body: Any) -> dict:
+    if not isinstance(body, dict):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+    return body
+
+
+def _require_str(body: dict, field: str) -> str:
+    value = body.get(field)
+    if not isinstance(value, str):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Field '{field}' must be a string")
+    return value
+
+
+def _optional_str(body: dict, field: str) -> Optional[str]:
+    value = body.get(field)
+    if value is not None and not isinstance(value, str):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Field '{field}' must be a string")
+    return value
+
+
+def _optional_version(body: dict) -> Optional[int]:
+    value = body.get("expected_version")
+    if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Field 'expected_version' must be an integer")
+    return value
+
+
+def _method_not_allowed(method: str, path: str) -> HTTPError:
+    return HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the server until interrupted."""
+    parser = argparse.ArgumentParser(prog="todo-server", description="Todo App HTTP/JSON service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data-dir",
+                        help="Persist tasks to a journal in this directory (default: in-memory only)")
+    parser.add_argument("--snapshot-format", choices=Journal.SNAPSHOT_FORMATS, default="jsonl",
+                        help="Journal snapshot format; 'mapped' restarts without loading every task")
+    parser.add_argument("--archive-dir",
+                        help="Archive old completed tasks to compressed segments in this directory")
+    parser.add_argument("--archive-after", type=float, default=30.0, metavar="DAYS",
+                        help="Age in days at which completed tasks are archived (with --archive-dir)")
+    parser.add_argument("--replication-port", type=int, metavar="PORT",
+                        help="Stream changes to read replicas connecting on this port")
+    parser.add_argument("--replica-of", metavar="HOST:PORT",
+                        help="Serve reads as a replica of the primary replicating on HOST:PORT")
+    args = parser.parse_args(argv or [])
+
+    replica = primary = archive = None
+    if args.replica_of:
+        if args.data_dir or args.archive_dir or args.replication_port is not None:
+            parser.error("a replica keeps its tasks in memory and cannot replicate further")
+        host, _, port = args.replica_of.rpartition(":")
+        if not host or not port.isdigit():
+            parser.error("--replica-of must be HOST:PORT")
+        manager = TodoManager()
+        replica = Replica(manager, host, int(port))
+    else:
+        journal = Journal(args.data_dir, snapshot_format=args.snapshot_format) if args.data_dir else None
+        archive = ColdStore(args.archive_dir) if args.archive_dir else None
+        manager = TodoManager(journal=journal, changes=ChangeFeed(), lazy_indexes=args.snapshot_format == "mapped",
+                              archive=archive)
+        if args.replication_port is not None:
+            primary = ReplicationPrimary(manager, args.host, args.replication_port)
+    server = TodoServer(manager, args.host, args.port,
+                        archive_after=args.archive_after * 86400 if archive is not None else None,
+                        primary=primary, replica=replica)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,259 @@
+"""Multi-tenant TodoManager sharded across worker processes."""
+import multiprocessing
+import os
+import re
+import threading
+import zlib
+from typing import Any, Iterable, List, Optional, Sequence
+
+from .journal import Journal
+from .manager import TodoManager
+
+# Tenant keys double as journal directory names
+_TENANT_RE = re.compile(r"^\w[\w\-.]*$")
+
+# Manager methods that can be called for a tenant. Anything taking a
+# callback (subscribe) or returning a live iterator (iter_tasks) cannot
+# cross a process boundary and is left out.
+_METHODS = frozenset({
+    "add_task", "get_task", "read_task", "get_all_tasks", "get_tasks", "count", "stats", "search",
+    "filter_tasks", "next_tasks", "overdue", "due_between", "update_task", "mark_complete",
+    "mark_complete_if", "delete_task", "set_priority", "set_due", "tag_task", "untag_task", "set_project",
+    "add_tasks", "update_many", "mark_complete_many", "delete_many", "import_tasks",
+    "export_tasks", "snapshot", "explain",
+})
+
+
+def shard_for(tenant: str, shards: int) -> int:
+    """
+    Return the shard that owns a tenant.
+
+    Uses CRC-32 rather than hash(), which is randomized per process, so a
+    tenant maps to the same shard in every process and across restarts.
+    """
+    return zlib.crc32(tenant.encode("utf-8")) % shards
+
+
+def _check_tenant(tenant: str) -> None:
+    if not isinstance(tenant, str) or not _TENANT_RE.match(tenant):
+        raise ValueError(f"Invalid tenant key: {tenant!r}")
+
+
+def _serve(conn, index: int, shards: int, journal_dir: Optional[str]) -> None:
+    """
+    Worker process loop: one TodoManager per tenant owned by this shard.
+
+    Messages are tuples:
+        ("batch", [(tenant, method, args, kwargs), ...]) -> [(ok, result), ...]
+        ("gather", method, args, kwargs)                 -> (ok, {tenant: result})
+        ("close",)                                       -> None, then exit
+    """
+    managers: dict[str, TodoManager] = {}
+
+    def manager_for(tenant: str) -> TodoManager:
+        manager = managers.get(tenant)
+        if manager is None:
+            journal = Journal(os.path.join(journal_dir, tenant)) if journal_dir else None
+            manager = managers[tenant] = TodoManager(journal=journal)
+        return manager
+
+    if journal_dir:
+        # Reopen the tenants this shard owns so scatter-gather queries see them
+        os.makedirs(journal_dir, exist_ok=True)
+        for tenant in sorted(os.listdir(journal_dir)):
+            if _TENANT_RE.match(tenant) and shard_for(tenant, shards) == index:
+                manager_for(tenant)
+
+    while True:
+        message = conn.recv()
+        kind = message[0]
+        if kind == "batch":
+            results = []
+            for tenant, method, args, kwargs in message[1]:
+                try:
+                    results.append((True, getattr(manager_for(tenant), method)(*args, **kwargs)))
+                except Exception as exc:
+                    results.append((False, exc))
+            conn.send(results)
+        elif kind == "gather":
+            _, method, args, kwargs = message
+            try:
+                conn.send((True, {tenant: getattr(manager, method)(*args, **kwargs)
+                                  for tenant, manager in managers.items()}))
+            except Exception as exc:
+                conn.send((False, exc))
+        elif kind == "close":
+            for manager in managers.values():
+                manager.close()
+            conn.send(None)
+            return
+
+
+class ShardedTodoManager:
+    """
+    Tenants' task lists spread over a pool of worker processes.
+
+    Each tenant (a user or a list) has its own TodoManager, with its own
+    IDs, living in the worker process that owns it, so independent
+    tenants are served on separate cores. Requests travel over a pipe per
+    worker; batch() groups requests by shard and sends each worker one
+    message, so the pickling and context-switch cost is paid per batch
+    rather than per call, and all workers run their part at the same time.
+    Cross-tenant queries such as count() are scattered to every worker and
+    the partial results gathered and combined.
+
+    Calls from several threads are serialized; use batch() for throughput.
+    """
+
+    def __init__(self, shards: Optional[int] = None, journal_dir: Optional[str] = None,
+                 start_method: Optional[str] = None):
+        """
+        Start the worker processes.
+
+        Args:
+            shards: Number of worker processes (default: the CPU count)
+            journal_dir: If given, each tenant is journaled in a subdirectory
+                named after it, and existing tenants are reopened on start
+            start_method: multiprocessing start method (default: the platform's)
+        """
+        shards = shards or os.cpu_count() or 1
+        if shards < 1:
+            raise ValueError("Number of shards must be at least 1")
+        context = multiprocessing.get_context(start_method)
+        self._lock = threading.Lock()
+        self._conns = []
+        self._processes = []
+        for index in range(shards):
+            conn, child = context.Pipe()
+            process = context.Process(target=_serve, args=(child, index, shards, journal_dir),
+                                      name=f"todo-shard-{index}", daemon=True)
+            process.start()
+            child.close()
+            self._conns.append(conn)
+            self._processes.append(process)
+
+    @property
+    def shards(self) -> int:
+        """The number of worker processes."""
+        return len(self._conns)
+
+    def call(self, tenant: str, method: str, *args, **kwargs) -> Any:
+        """
+        Call a TodoManager method for one tenant.
+
+        Args:
+            tenant: The tenant key, e.g. a user name or list name
+            method: The TodoManager method, e.g. "add_task"
+            *args, **kwargs: Its arguments
+
+        Returns:
+            What the method returned
+
+        Raises:
+            ValueError: If the tenant key or method is invalid
+            Whatever the method raised, e.g. TaskNotFoundError
+        """
+        result = self.batch([(tenant, method, args, kwargs)])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def batch(self, requests: Iterable[Sequence]) -> List[Any]:
+        """
+        Run many requests with one round trip per involved worker.
+
+        Requests for the same tenant run in the order given. Unlike the
+        manager's bulk operations, a batch is not atomic: each request
+        succeeds or fails on its own.
+
+        Args:
+            requests: (tenant, method, args) or (tenant, method, args, kwargs)
+                tuples
+
+        Returns:
+            One result per request, in request order; a request that raised
+            has its exception in its place
+
+        Raises:
+            ValueError: If any tenant key or method is invalid (nothing is sent)
+        """
+        shards = self.shards
+        groups: dict[int, list] = {}
+        positions: dict[int, list] = {}
+        count = 0
+        for position, request in enumerate(requests):
+            tenant, method, args = request[0], request[1], tuple(request[2])
+            kwargs = request[3] if len(request) > 3 else {}
+            _check_tenant(tenant)
+            if method not in _METHODS:
+                raise ValueError(f"Unknown or unsupported method: {method}")
+            shard = shard_for(tenant, shards)
+            groups.setdefault(shard, []).append((tenant, method, args, kwargs))
+            positions.setdefault(shard, []).append(position)
+            count = position + 1
+
+        results: List[Any] = [None] * count
+        with self._lock:
+            # Send everything first so the workers run in parallel
+            for shard, group in groups.items():
+                self._conns[shard].send(("batch", group))
+            for shard in groups:
+                for position, (_, value) in zip(positions[shard], self._conns[shard].recv()):
+                    results[position] = value
+        return results
+
+    def gather(self, method: str, *args, **kwargs) -> dict[str, Any]:
+        """
+        Call a TodoManager method for every tenant, on all workers at once.
+
+        Returns:
+            Tenant -> result, sorted by tenant
+
+        Raises:
+            ValueError: If the method is unsupported
+            The first error raised by a worker
+        """
+        if method not in _METHODS:
+            raise ValueError(f"Unknown or unsupported method: {method}")
+        merged = {}
+        error = None
+        with self._lock:
+            for conn in self._conns:
+                conn.send(("gather", method, args, kwargs))
+            # Drain every reply, even after an error, to keep the pipes in step
+            for conn in self._conns:
+                ok, value = conn.recv()
+                if ok:
+                    merged.update(value)
+                elif error is None:
+                    error = value
+        if error is not None:
+            raise error
+        return dict(sorted(merged.items()))
+
+    def tenants(self) -> List[str]:
+        """Return every tenant with a task list, sorted."""
+        return list(self.gather("count"))
+
+    def count(self, status: Optional[str] = None) -> int:
+        """Count tasks across all tenants, optionally by status."""
+        return sum(self.gather("count", status).values())
+
+    def stats(self) -> dict[str, int]:
+        """Return task counts by status summed across all tenants."""
+        totals: dict[str, int] = {}
+        for stats in self.gather("stats").values():
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def close(self) -> None:
+        """Close every tenant's manager and stop the workers."""
+        with self._lock:
+            for conn in self._conns:
+                conn.send(("close",))
+            for conn, process in zip(self._conns, self._processes):
+                conn.recv()
+                conn.close()
+                process.join()
+            self._conns, self._processes = [], []
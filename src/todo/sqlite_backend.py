@@ -0,0 +1,221 @@
+"""SQLite storage backend for TodoManager (stdlib sqlite3)."""
+import sqlite3
+import sys
+from contextlib import contextmanager
+from datetime import date
+from typing import Iterable, Iterator, Optional
+
+from .models import Priority, Task, TaskStatus
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    due TEXT,
+    tags TEXT NOT NULL DEFAULT '',
+    project TEXT NOT NULL DEFAULT '',
+    version INTEGER NOT NULL DEFAULT 1,
+    completed_at REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_status_id ON tasks (status, id);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+# Statements are module constants so sqlite3's statement cache reuses the
+# prepared form on every call.
+_COLUMNS = "id, title, description, status, priority, due, tags, project, version, completed_at"
+_SELECT = f"SELECT {_COLUMNS} FROM tasks WHERE id = ?"
+_INSERT = f"INSERT INTO tasks ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_UPDATE = ("UPDATE tasks SET title = ?, description = ?, status = ?, priority = ?, due = ?, "
+           "tags = ?, project = ?, version = ?, completed_at = ? WHERE id = ?")
+_DELETE = "DELETE FROM tasks WHERE id = ?"
+_COUNT_BY_STATUS = "SELECT status, COUNT(*) FROM tasks GROUP BY status"
+_SCAN = f"SELECT {_COLUMNS} FROM tasks WHERE id > ? ORDER BY id LIMIT ?"
+_SCAN_STATUS = (f"SELECT {_COLUMNS} FROM tasks "
+                "WHERE status = ? AND id > ? ORDER BY status, id LIMIT ?")
+_GET_NEXT_ID = "SELECT value FROM meta WHERE key = 'next_id'"
+_SET_NEXT_ID = "INSERT OR REPLACE INTO meta (key, value) VALUES ('next_id', ?)"
+
+
+# Columns added after the first release, added to older databases on open
+_MIGRATIONS = {
+    "priority": "ALTER TABLE tasks ADD COLUMN priority INTEGER NOT NULL DEFAULT 0",
+    "due": "ALTER TABLE tasks ADD COLUMN due TEXT",
+    "tags": "ALTER TABLE tasks ADD COLUMN tags TEXT NOT NULL DEFAULT ''",
+    "project": "ALTER TABLE tasks ADD COLUMN project TEXT NOT NULL DEFAULT ''",
+    "version": "ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 1",
+    "completed_at": "ALTER TABLE tasks ADD COLUMN completed_at REAL",
+}
+
+
+def _row_to_task(row: tuple) -> Task:
+    due = date.fromisoformat(row[5]) if row[5] else None
+    # Tags are stored space-separated; names cannot contain spaces
+    tags = tuple(map(sys.intern, row[6].split())) if row[6] else ()
+    return Task.unchecked(row[0], row[1], row[2], TaskStatus(row[3]), Priority(row[4]), due,
+                          tags, sys.intern(row[7]), row[8], row[9])
+
+
+def _task_to_row(task: Task) -> tuple:
+    due = task.due.isoformat() if task.due else None
+    return (task.id, task.title, task.description, str(task.status), int(task.priority), due,
+            " ".join(task.tags), task.project, task.version, task.completed_at)
+
+
+class SQLiteBackend:
+    """
+    Stores tasks in a SQLite database, so collections can exceed RAM.
+
+    The database runs in WAL mode; status-filtered scans are answered from
+    an index on (status, id), and bulk writes go through executemany inside
+    a single transaction. Writes outside a transaction() block commit
+    immediately. Per-status counts are loaded once on open and then kept up
+    to date in memory, which assumes this backend is the database's only
+    writer.
+
+    Attributes:
+        path: Database file path (":memory:" for a throwaway database)
+    """
+
+    # Rows fetched per query while scanning
+    _PAGE_SIZE = 1024
+
+    def __init__(self, path: str, synchronous: str = "NORMAL"):
+        """
+        Open (or create) a task database.
+
+        Args:
+            path: Database file path
+            synchronous: SQLite synchronous pragma; NORMAL is durable
+                across application crashes in WAL mode, FULL also across
+                power loss
+        """
+        self.path = path
+        # Autocommit mode: transactions are managed explicitly in transaction()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        for column, statement in _MIGRATIONS.items():
+            if column not in columns:
+                self._conn.execute(statement)
+        row = self._conn.execute(_GET_NEXT_ID).fetchone()
+        self._next_id = row[0] if row else 1
+        self._in_transaction = False
+        self._load_counts()
+
+    def _load_counts(self) -> None:
+        """Read the per-status task counts from the database."""
+        self._counts = {status: 0 for status in TaskStatus}
+        for status, count in self._conn.execute(_COUNT_BY_STATUS):
+            self._counts[TaskStatus(status)] = count
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __contains__(self, task_id: object) -> bool:
+        return self.get(task_id) is not None
+
+    def __getitem__(self, task_id: int) -> Task:
+        task = self.get(task_id)
+        if task is None:
+            raise KeyError(task_id)
+        return task
+
+    def get(self, task_id: int) -> Optional[Task]:
+        row = self._conn.execute(_SELECT, (task_id,)).fetchone()
+        return None if row is None else _row_to_task(row)
+
+    def next_id(self) -> int:
+        return self._next_id
+
+    def put(self, task: Task) -> None:
+        self.put_many((task,))
+
+    def put_many(self, tasks: Iterable[Task]) -> None:
+        tasks = list(tasks)
+        if not tasks:
+            return
+        with self.transaction():
+            self._conn.executemany(_INSERT, [_task_to_row(t) for t in tasks])
+            for task in tasks:
+                self._counts[task.status] += 1
+            self._next_id = max(self._next_id, max(t.id for t in tasks) + 1)
+            self._conn.execute(_SET_NEXT_ID, (self._next_id,))
+
+    def save(self, task: Task, previous_status: Optional[str] = None) -> None:
+        row = _task_to_row(task)
+        self._conn.execute(_UPDATE, row[1:] + row[:1])
+        if previous_status is not None and previous_status != task.status:
+            self._counts[previous_status] -= 1
+            self._counts[task.status] += 1
+
+    def delete(self, task_id: int) -> Task:
+        task = self[task_id]
+        self._conn.execute(_DELETE, (task_id,))
+        self._counts[task.status] -= 1
+        return task
+
+    def delete_many(self, task_ids: Iterable[int]) -> None:
+        task_ids = list(task_ids)
+        with self.transaction():
+            # Look up the doomed tasks' statuses in chunks (SQLite caps the
+            # number of bound parameters) to keep the counts current.
+            for start in range(0, len(task_ids), 500):
+                chunk = task_ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for (status,) in self._conn.execute(
+                        f"SELECT status FROM tasks WHERE id IN ({placeholders})", chunk):
+                    self._counts[TaskStatus(status)] -= 1
+            self._conn.executemany(_DELETE, [(task_id,) for task_id in task_ids])
+
+    def scan(self, status: Optional[str] = None, after_id: Optional[int] = None,
+             limit: Optional[int] = None) -> Iterator[Task]:
+        # Keyset pagination: each page re-seeks the index after the last ID
+        # seen, so the scan never holds a cursor open across yields.
+        cursor = 0 if after_id is None else after_id
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page_size = self._PAGE_SIZE if remaining is None else min(self._PAGE_SIZE, remaining)
+            if status is None:
+                rows = self._conn.execute(_SCAN, (cursor, page_size)).fetchall()
+            else:
+                rows = self._conn.execute(_SCAN_STATUS, (str(status), cursor, page_size)).fetchall()
+            for row in rows:
+                yield _row_to_task(row)
+            if len(rows) < page_size:
+                return
+            cursor = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def count(self, status: Optional[str] = None) -> int:
+        if status is None:
+            return sum(self._counts.values())
+        return self._counts[status]
+
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed writes in one transaction (nested calls join the outer one)."""
+        if self._in_transaction:
+            yield
+            return
+        self._conn.execute("BEGIN")
+        self._in_transaction = True
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            self._load_counts()
+            raise
+        else:
+            self._conn.execute("COMMIT")
+        finally:
+            self._in_transaction = False
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,224 @@
+"""Storage backend interface for TodoManager and the default in-memory backend."""
+from bisect import bisect_left, bisect_right, insort
+from contextlib import nullcontext
+from itertools import dropwhile, islice
+from typing import ContextManager, Iterable, Iterator, Optional, Protocol, runtime_checkable
+
+from .models import Task, STATUSES
+
+
+@runtime_checkable
+class StorageBackend(Protocol):
+    """
+    Where a TodoManager keeps its tasks.
+
+    The manager validates input, allocates IDs, and maintains derived
+    indexes; a backend only stores tasks and answers ordered and
+    status-filtered scans and counts, so that filtering can be pushed down
+    to the storage engine. Tasks handed out by get() and scan() may be
+    copies: after changing a task the manager calls save() to persist it.
+    """
+
+    def __len__(self) -> int: ...
+
+    def __contains__(self, task_id: object) -> bool: ...
+
+    def __getitem__(self, task_id: int) -> Task: ...
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """Return the task with this ID, or None."""
+
+    def next_id(self) -> int:
+        """Return one more than the highest ID ever stored (1 if empty)."""
+
+    def put(self, task: Task) -> None:
+        """Store a new task."""
+
+    def put_many(self, tasks: Iterable[Task]) -> None:
+        """Store many new tasks in one batch."""
+
+    def save(self, task: Task, previous_status: Optional[str] = None) -> None:
+        """Persist changes to a stored task; previous_status is given if its status changed."""
+
+    def delete(self, task_id: int) -> Task:
+        """Remove and return a task (KeyError if absent)."""
+
+    def delete_many(self, task_ids: Iterable[int]) -> None:
+        """Remove many stored tasks in one batch."""
+
+    def scan(self, status: Optional[str] = None, after_id: Optional[int] = None,
+             limit: Optional[int] = None) -> Iterator[Task]:
+        """Lazily yield tasks in ID order, optionally by status and after a cursor."""
+
+    def count(self, status: Optional[str] = None) -> int:
+        """Count tasks, optionally by status."""
+
+    def transaction(self) -> ContextManager:
+        """Group the writes made inside the context into one atomic commit."""
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class MemoryBackend:
+    """
+    The default backend: tasks in a dict, plus an ordered ID list and
+    per-status partitions for cheap ordered scans and O(1) counts.
+    """
+
+    # Number of IDs copied out of the ordered index per step of scan()
+    _PAGE_SIZE = 1024
+    # Batch size from which delete_many rebuilds the ordered ID index
+    _BULK_REORDER_THRESHOLD = 64
+
+    def __init__(self):
+        self._tasks: dict[int, Task] = {}
+        # All task IDs in ascending order, for ordered iteration and seeking
+        self._order: list[int] = []
+        # Status partitions used as ordered sets: status -> {task_id: None}
+        self._by_status: dict[str, dict[int, None]] = {status: {} for status in STATUSES}
+        # Statuses whose partition may be out of ID order (see _partition)
+        self._unsorted: set[str] = set()
+        self._next_id = 1
+        # Most tasks held since the dicts were last compacted (see _compact)
+        self._peak = 0
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._tasks
+
+    def __getitem__(self, task_id: int) -> Task:
+        return self._tasks[task_id]
+
+    def get(self, task_id: int) -> Optional[Task]:
+        return self._tasks.get(task_id)
+
+    def next_id(self) -> int:
+        return self._next_id
+
+    def put(self, task: Task) -> None:
+        self._tasks[task.id] = task
+        if not self._order or task.id > self._order[-1]:
+            self._order.append(task.id)
+        else:
+            insort(self._order, task.id)
+        self._add_to_partition(task.status, task.id)
+        if task.id >= self._next_id:
+            self._next_id = task.id + 1
+
+    def put_many(self, tasks: Iterable[Task]) -> None:
+        for task in tasks:
+            self.put(task)
+
+    def save(self, task: Task, previous_status: Optional[str] = None) -> None:
+        # Tasks are stored by reference, so only a status move needs work.
+        if previous_status is not None and previous_status != task.status:
+            del self._by_status[previous_status][task.id]
+            self._add_to_partition(task.status, task.id)
+
+    def _add_to_partition(self, status: str, task_id: int) -> None:
+        partition = self._by_status[status]
+        if partition and task_id < next(reversed(partition)):
+            self._unsorted.add(status)
+        partition[task_id] = None
+
+    def _partition(self, status: str) -> dict[int, None]:
+        """
+        Return a status partition in ID order.
+
+        Partitions stay in order as long as IDs arrive in ascending order
+        (always true for pending tasks). One that got out of order, e.g.
+        because tasks were completed out of ID order, is re-sorted once here
+        and stays sorted until the next out-of-order insert.
+        """
+        if status in self._unsorted:
+            self._by_status[status] = dict.fromkeys(sorted(self._by_status[status]))
+            self._unsorted.discard(status)
+        return self._by_status[status]
+
+    def delete(self, task_id: int) -> Task:
+        self._peak = max(self._peak, len(self._tasks))
+        task = self._tasks.pop(task_id)
+        del self._order[bisect_left(self._order, task_id)]
+        del self._by_status[task.status][task_id]
+        self._compact()
+        return task
+
+    def delete_many(self, task_ids: Iterable[int]) -> None:
+        task_ids = list(task_ids)
+        if len(task_ids) < self._BULK_REORDER_THRESHOLD:
+            for task_id in task_ids:
+                self.delete(task_id)
+            return
+        self._peak = max(self._peak, len(self._tasks))
+
+        # Deleting from the ordered ID index one at a time shifts the list
+        # on every call; for large batches rebuild it in a single pass.
+        for task_id in task_ids:
+            task = self._tasks.pop(task_id)
+            del self._by_status[task.status][task_id]
+        tasks = self._tasks
+        self._order = [task_id for task_id in self._order if task_id in tasks]
+        self._compact()
+
+    def _compact(self) -> None:
+        """
+        Copy the dicts once three quarters of their peak size is deleted.
+
+        Dicts never shrink as entries are deleted, so without this a
+        collection that once held many tasks, e.g. before archiving, would
+        keep the memory for all of them. Copying costs O(n) but happens only
+        after 3n deletes, so it adds O(1) per delete.
+        """
+        if len(self._tasks) * 4 < self._peak:
+            self._tasks = dict(self._tasks)
+            self._by_status = {status: dict(partition) for status, partition in self._by_status.items()}
+            self._peak = len(self._tasks)
+
+    def scan(self, status: Optional[str] = None, after_id: Optional[int] = None,
+             limit: Optional[int] = None) -> Iterator[Task]:
+        if status is not None:
+            partition = self._partition(status)
+            # A bounded page is collected straight off the partition; an
+            # unbounded scan iterates a copy so callers may mutate meanwhile.
+            ids = iter(partition) if limit is not None else iter(list(partition))
+            if after_id is not None:
+                ids = dropwhile(lambda task_id: task_id <= after_id, ids)
+            # Skip tasks deleted since the IDs were read
+            tasks = (task for task in (self._tasks.get(i) for i in ids) if task is not None)
+            return tasks if limit is None else iter(list(islice(tasks, limit)))
+        return self._scan_ordered(after_id, limit)
+
+    def _scan_ordered(self, after_id: Optional[int], limit: Optional[int]) -> Iterator[Task]:
+        """Yield tasks after a cursor, re-seeking the ID index for each page."""
+        remaining = limit
+        while remaining is None or remaining > 0:
+            # Re-read the index each page: delete_many may have replaced it,
+            # and _compact the tasks dict
+            order, tasks = self._order, self._tasks
+            start = 0 if after_id is None else bisect_right(order, after_id)
+            page = order[start:start + self._PAGE_SIZE]
+            if not page:
+                return
+            for task_id in page:
+                task = tasks.get(task_id)
+                if task is not None:
+                    yield task
+                    if remaining is not None:
+                        remaining -= 1
+                        if not remaining:
+                            return
+            after_id = page[-1]
+
+    def count(self, status: Optional[str] = None) -> int:
+        if status is None:
+            return len(self._tasks)
+        return len(self._by_status[status])
+
+    def transaction(self) -> ContextManager:
+        return nullcontext()
+
+    def close(self) -> None:
+        pass
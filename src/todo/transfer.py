@@ -0,0 +1,71 @@
+"""Streaming CSV and JSON Lines readers/writers for bulk import and export."""
+import csv
+import json
+import os
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from .models import Task
+
+FORMATS = ("csv", "jsonl")
+FIELDS = ("id", "title", "description", "status", "priority", "due", "tags", "project")
+
+_EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def resolve_format(path: str, fmt: Optional[str] = None) -> str:
+    """
+    Return the file format to use, inferring it from the extension if needed.
+
+    Raises:
+        ValueError: If the format is unknown or cannot be inferred
+    """
+    if fmt is None:
+        fmt = _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise ValueError(f"Cannot infer format of {path}; use one of: {', '.join(FORMATS)}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt}; use one of: {', '.join(FORMATS)}")
+    return fmt
+
+
+def chunked(rows: Iterable, size: int) -> Iterator[List]:
+    """Yield lists of at most `size` items from an iterable."""
+    if size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def read_rows(handle: TextIO, fmt: str) -> Iterator[dict]:
+    """Lazily yield one dict per row of a CSV (with header) or JSON Lines file."""
+    if fmt == "csv":
+        yield from csv.DictReader(handle)
+    else:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_rows(handle: TextIO, tasks: Iterable[Task], fmt: str) -> int:
+    """
+    Write tasks one row at a time.
+
+    Returns:
+        The number of tasks written
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(handle)
+        writer.writerow(FIELDS)
+        for task in tasks:
+            writer.writerow((task.id, task.title, task.description, task.status,
+                             int(task.priority), task.due.isoformat() if task.due else "",
+                             " ".join(task.tags), task.project))
+            count += 1
+    else:
+        for task in tasks:
+            handle.write(json.dumps(task.to_dict(), separators=(",", ":")) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,160 @@
+"""Tests for completion times, the cold store and archiving."""
+import os
+import pytest
+from src.todo.archive import ColdStore
+from src.todo.exceptions import TaskNotFoundError
+from src.todo.history import History
+from src.todo.journal import Journal
+from src.todo.manager import TodoManager
+from src.todo.models import Task
+
+DAY = 86400
+
+
+class TestColdStore:
+    """Test cases for the compressed segment store."""
+
+    def test_add_get_and_reopen(self, tmp_path):
+        """Test that archived tasks are found, including after reopening."""
+        store = ColdStore(str(tmp_path), segment_size=2)
+        tasks = [Task(i, f"Task {i}", "", status="completed", completed_at=1000.0 + i) for i in (7, 3, 5)]
+        assert store.add(tasks) == 3
+
+        assert len(os.listdir(tmp_path)) == 2
+        assert (len(store), 5 in store, 4 in store) == (3, True, False)
+        assert store.get(5) == tasks[2]
+
+        reopened = ColdStore(str(tmp_path))
+        assert len(reopened) == 3
+        assert [reopened.get(i).completed_at for i in (3, 5, 7)] == [1003.0, 1005.0, 1007.0]
+        assert reopened.get(4) is None
+
+    def test_remove_rewrites_segments(self, tmp_path):
+        """Test that removal rewrites segments and drops empty ones."""
+        store = ColdStore(str(tmp_path), segment_size=2)
+        store.add([Task(i, f"Task {i}", "", status="completed") for i in range(1, 5)])
+
+        assert store.remove([1, 2, 3, 99]) == 3
+
+        assert len(os.listdir(tmp_path)) == 1
+        assert [store.get(i) is not None for i in range(1, 5)] == [False, False, False, True]
+        assert len(ColdStore(str(tmp_path))) == 1
+
+    def test_lru_cache(self, tmp_path):
+        """Test that recent lookups share objects and old ones are evicted."""
+        store = ColdStore(str(tmp_path), cache_size=2)
+        store.add([Task(i, f"Task {i}", "", status="completed") for i in range(1, 4)])
+
+        first = store.get(1)
+        assert store.get(1) is first
+        store.get(2)
+        store.get(3)
+        assert store.get(1) is not first
+        assert store.get(1) == first
+
+    def test_invalid_sizes_rejected(self, tmp_path):
+        """Test that cache and segment sizes must be positive."""
+        with pytest.raises(ValueError):
+            ColdStore(str(tmp_path), cache_size=0)
+
+
+class TestArchiving:
+    """Test cases for TodoManager.archive_completed."""
+
+    def open_manager(self, tmp_path, journal=False, **journal_options):
+        """Open a manager with an archive (and a journal) under tmp_path."""
+        return TodoManager(archive=ColdStore(str(tmp_path / "archive")), history=History(),
+                           journal=Journal(str(tmp_path / "journal"), **journal_options) if journal else None)
+
+    def fill(self, manager):
+        """Add two pending tasks and two completed ones, #1 ten days ago."""
+        manager.add_tasks([("Old report", ""), ("New report", ""), ("Pending", ""), ("Also pending", "")])
+        manager.mark_complete_many([1, 2])
+        manager.get_task(1).completed_at -= 10 * DAY
+
+    def test_completion_times(self):
+        """Test that completing stamps a time and reopening clears it."""
+        manager = TodoManager(history=History())
+        manager.add_task("Task 1")
+        assert manager.get_task(1).completed_at is None
+
+        manager.mark_complete(1)
+        assert manager.get_task(1).completed_at is not None
+        manager.undo()
+        assert manager.get_task(1).completed_at is None
+
+    def test_old_completed_tasks_move_to_the_archive(self, tmp_path):
+        """Test that only tasks past the TTL leave the collection, and stay readable."""
+        manager = self.open_manager(tmp_path)
+        self.fill(manager)
+
+        assert manager.archive_completed(7 * DAY) == 1
+
+        assert [task.id for task in manager.get_all_tasks()] == [2, 3, 4]
+        assert manager.stats() == {"total": 3, "pending": 2, "completed": 1, "archived": 1}
+        assert manager.search("report") == [manager.get_task(2)]
+        assert manager.filter_tasks("completed") == [manager.get_task(2)]
+        assert manager.get_task(1).title == "Old report"
+        assert manager.read_task(1).status == "completed"
+        assert manager.archive_completed(7 * DAY) == 0
+
+    def test_limit_bounds_each_pass(self, tmp_path):
+        """Test that a limited pass archives at most that many tasks."""
+        manager = self.open_manager(tmp_path)
+        self.fill(manager)
+
+        assert manager.archive_completed(0, limit=1) == 1
+        assert manager.archive_completed(0, limit=1) == 1
+        assert manager.archive_completed(0, limit=1) == 0
+        assert manager.stats()["archived"] == 2
+
+    def test_changing_an_archived_task_moves_it_back(self, tmp_path):
+        """Test that updates, undo and deletes bring archived tasks back first."""
+        manager = self.open_manager(tmp_path)
+        self.fill(manager)
+        manager.archive_completed(0)
+
+        manager.update_task(1, title="Old report, revised")
+        assert [task.id for task in manager.get_all_tasks()] == [1, 3, 4]
+        assert manager.stats()["archived"] == 1
+
+        manager.undo()
+        assert manager.get_task(1).title == "Old report"
+        manager.delete_task(2)
+        assert manager.stats()["archived"] == 0
+        with pytest.raises(TaskNotFoundError):
+            manager.get_task(2)
+
+    def test_archiving_survives_a_restart(self, tmp_path):
+        """Test that journal replay removes archived tasks and keeps completion times."""
+        manager = self.open_manager(tmp_path, journal=True)
+        manager.add_tasks([("Task 1", ""), ("Task 2", "")])
+        manager.mark_complete(1)
+        manager.mark_complete(2)
+        completed_at = manager.get_task(2).completed_at
+        manager.archive_completed(0, limit=1)
+        manager.close()
+
+        recovered = self.open_manager(tmp_path, journal=True)
+
+        assert [task.id for task in recovered.get_all_tasks()] == [2]
+        assert recovered.get_task(2).completed_at == completed_at
+        assert recovered.get_task(1).status == "completed"
+
+    def test_archiving_across_a_snapshot_survives_a_restart(self, tmp_path):
+        """Test that a snapshot falling due while archiving replays nothing twice."""
+        manager = self.open_manager(tmp_path, journal=True, snapshot_interval=20)
+        manager.add_tasks([(f"Task {i}", "") for i in range(1, 11)])
+        manager.mark_complete_many(range(1, 8))
+        assert manager.archive_completed(0) == 7
+        manager.close()
+
+        recovered = self.open_manager(tmp_path, journal=True, snapshot_interval=20)
+
+        assert [task.id for task in recovered.get_all_tasks()] == [8, 9, 10]
+        assert recovered.stats()["archived"] == 7
+
+    def test_without_an_archive(self):
+        """Test that archiving needs an archive."""
+        with pytest.raises(ValueError):
+            TodoManager().archive_completed(0)
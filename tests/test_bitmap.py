@@ -0,0 +1,107 @@
+"""Tests for tags, projects and bitmap-indexed filters."""
+import pytest
+from src.todo.bitmap import BitmapIndex, decode, parse_filter
+from src.todo.history import History
+from src.todo.journal import Journal
+from src.todo.manager import TodoManager
+from src.todo.models import Task
+
+
+class TestBitmapIndex:
+    """Test cases for the BitmapIndex class and filter parsing."""
+
+    def test_decode(self):
+        """Test that set bits decode to ascending positions, honoring a limit."""
+        bits = (1 << 3) | (1 << 9) | (1 << 10_000)
+        assert decode(bits) == [3, 9, 10_000]
+        assert decode(bits, limit=2) == [3, 9]
+        assert decode(0) == []
+
+    def test_parse_filter_precedence(self):
+        """Test that AND binds tighter than OR and adjacent terms are ANDed."""
+        assert parse_filter("pending tag:a or NOT tag:b") == (
+            "or",
+            ("and", ("key", "status:pending"), ("key", "tag:a")),
+            ("not", ("key", "tag:b")),
+        )
+        assert parse_filter("project:X AND (tag:a OR tag:b)") == (
+            "and", ("key", "project:x"), ("or", ("key", "tag:a"), ("key", "tag:b")),
+        )
+
+    @pytest.mark.parametrize("query", ["", "tag:", "(tag:a", "tag:a)", "owner:me", "and tag:a", "archived"])
+    def test_parse_filter_errors(self, query):
+        """Test that malformed filters raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_filter(query)
+
+    def test_evaluate_and_retire_keys(self):
+        """Test evaluation, NOT against live tasks, and dropping empty keys."""
+        index = BitmapIndex()
+        index.add(1, ["tag:a"])
+        index.add(2, ["tag:a", "tag:b"])
+        index.add(3, [])
+        index.remove(2, ["tag:a", "tag:b"])
+
+        assert decode(index.evaluate(parse_filter("not tag:a"))) == [3]
+        assert index.count("tag:b") == 0
+        assert decode(index.evaluate(parse_filter("tag:b"))) == []
+
+
+class TestTags:
+    """Test cases for tags and projects in the TodoManager."""
+
+    def setup_method(self):
+        """Set up a TodoManager with a few labeled tasks."""
+        self.manager = TodoManager(history=History())
+        self.manager.add_task("Fix login", tags="urgent bug", project="Web")
+        self.manager.add_task("Write docs", tags=["docs"])
+        self.manager.add_task("Deploy", tags="urgent,blocked", project="ops")
+
+    def ids(self, query, **kwargs):
+        return [task.id for task in self.manager.filter_tasks(query, **kwargs)]
+
+    def test_tags_are_normalized(self):
+        """Test that tags are lowercased, deduplicated and sorted."""
+        task = Task(id=1, title="Task", description="", tags="B a,b", project=" Web ")
+        assert task.tags == ("a", "b")
+        assert task.project == "web"
+        assert Task.from_dict(task.to_dict()) == task
+        with pytest.raises(ValueError):
+            Task(id=1, title="Task", description="", tags="no!")
+
+    def test_filter_queries(self):
+        """Test boolean filters over status, tags and projects."""
+        assert self.ids("pending AND tag:urgent AND NOT tag:blocked") == [1]
+        assert self.ids("tag:urgent") == [1, 3]
+        assert self.ids("project:web or tag:docs") == [1, 2]
+        assert self.ids("not tag:urgent") == [2]
+        assert self.ids("tag:urgent", limit=1) == [1]
+
+    def test_filter_follows_changes(self):
+        """Test that status, tag, project and delete changes update the index."""
+        self.manager.mark_complete(1)
+        self.manager.untag_task(3, "blocked")
+        self.manager.tag_task(2, ["urgent"])
+        self.manager.set_project(1, None)
+        self.manager.delete_task(2)
+
+        assert self.ids("pending tag:urgent not tag:blocked") == [3]
+        assert self.ids("completed") == [1]
+        assert self.ids("project:web") == []
+
+        self.manager.undo()
+        self.manager.undo()
+        assert self.ids("project:web") == [1]
+        assert self.ids("tag:urgent") == [1, 2, 3]
+
+    def test_labels_survive_restart(self, tmp_path):
+        """Test that tags and projects are journaled and re-indexed on recovery."""
+        manager = TodoManager(journal=Journal(str(tmp_path)))
+        manager.add_task("Task 1", tags="a")
+        manager.add_task("Task 2")
+        manager.tag_task(2, "b")
+        manager.set_project(2, "home")
+        manager.close()
+
+        recovered = TodoManager(journal=Journal(str(tmp_path)))
+        assert [t.id for t in recovered.filter_tasks("tag:a or project:home")] == [1, 2]
@@ -0,0 +1,94 @@
+"""Tests for the change feed and its TodoManager integration."""
+import asyncio
+import pytest
+from src.todo.changes import ChangeFeed
+from src.todo.exceptions import ChangesExpiredError
+from src.todo.history import History
+from src.todo.manager import TodoManager
+from src.todo.models import Task
+
+
+class TestChangeFeed:
+    """Test cases for the ChangeFeed class and TodoManager change tracking."""
+
+    def setup_method(self):
+        """Set up a TodoManager with a change feed for each test."""
+        self.feed = ChangeFeed(capacity=100)
+        self.manager = TodoManager(changes=self.feed, history=History())
+
+    def test_every_mutation_gets_a_sequence_number(self):
+        """Test that adds, updates, completes and deletes are all published in order."""
+        self.manager.add_task("Task 1", "Description 1")
+        self.manager.update_task(1, title="Renamed")
+        self.manager.mark_complete(1)
+        # Completing it again changes nothing, so nothing is published
+        self.manager.mark_complete(1)
+        self.manager.delete_task(1)
+        self.manager.undo()
+
+        changes = self.manager.changes_since(0)
+        assert [c.seq for c in changes] == [1, 2, 3, 4, 5]
+        assert [c.op for c in changes] == ["add", "update", "complete", "delete", "add"]
+        assert changes[0].data == Task(1, "Task 1", "Description 1").to_dict()
+        assert changes[1].data == {"title": "Renamed"}
+        assert changes[3].data is None
+        assert changes[4].data["status"] == "completed"
+        assert self.manager.changes_seq() == 5
+
+    def test_changes_since_cursor_and_limit(self):
+        """Test incremental reads with a cursor and a page limit."""
+        self.manager.add_tasks([(f"Task {i}", "") for i in range(10)])
+
+        page = self.manager.changes_since(3, limit=4)
+        assert [c.task_id for c in page] == [4, 5, 6, 7]
+        assert self.manager.changes_since(10) == []
+
+    def test_expired_changes_raise(self):
+        """Test that a consumer behind the ring buffer must resynchronize."""
+        self.manager.add_tasks([(f"Task {i}", "") for i in range(150)])
+
+        with pytest.raises(ChangesExpiredError) as error:
+            self.manager.changes_since(10)
+        assert error.value.oldest == 51
+        assert len(self.manager.changes_since(50)) == 100
+
+    def test_subscribe_and_unsubscribe(self):
+        """Test callbacks, and that a failing callback does not break the mutation."""
+        seen = []
+        unsubscribe = self.manager.subscribe(seen.append)
+        self.manager.subscribe(lambda change: 1 / 0)
+
+        self.manager.add_task("Task 1")
+        unsubscribe()
+        self.manager.add_task("Task 2")
+
+        assert [c.task_id for c in seen] == [1]
+        assert self.manager.count() == 2
+
+    def test_async_watch(self):
+        """Test iterating over changes asynchronously as they happen."""
+        self.manager.add_task("Before")
+
+        async def scenario():
+            seen = []
+
+            async def consume():
+                async for change in self.feed.watch():
+                    seen.append(change.task_id)
+                    if len(seen) == 2:
+                        return
+
+            consumer = asyncio.create_task(consume())
+            await asyncio.sleep(0)
+            self.manager.add_task("Task 2")
+            await asyncio.sleep(0)
+            self.manager.add_task("Task 3")
+            await asyncio.wait_for(consumer, timeout=1)
+            return seen
+
+        assert asyncio.run(scenario()) == [2, 3]
+
+    def test_manager_without_feed(self):
+        """Test that change APIs require a feed."""
+        with pytest.raises(ValueError):
+            TodoManager().changes_since(0)
@@ -0,0 +1,149 @@
+"""Tests for the thread-safe ConcurrentTodoManager."""
+import threading
+import pytest
+from src.todo.concurrent import ConcurrentTodoManager, ReadWriteLock
+from src.todo.exceptions import TaskNotFoundError, VersionConflictError
+from src.todo.manager import TodoManager
+
+
+def run_threads(count, target):
+    """Start `count` threads running target(index) and wait for them."""
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestConcurrentTodoManager:
+    """Test cases for the ConcurrentTodoManager class."""
+
+    def setup_method(self):
+        """Set up a fresh ConcurrentTodoManager instance for each test."""
+        self.manager = ConcurrentTodoManager()
+
+    def test_concurrent_adds_get_unique_ids(self):
+        """Test that IDs allocated from many threads never collide."""
+        results = [[] for _ in range(8)]
+
+        def worker(index):
+            for i in range(500):
+                results[index].append(self.manager.add_task(f"Task {index}-{i}"))
+
+        run_threads(8, worker)
+
+        all_ids = [task_id for ids in results for task_id in ids]
+        assert len(set(all_ids)) == 4000
+        assert self.manager.count() == 4000
+        assert [t.id for t in self.manager.get_all_tasks()] == list(range(1, 4001))
+
+    def test_concurrent_deletes_remove_each_task_once(self):
+        """Test that racing deletes of the same tasks succeed exactly once per task."""
+        self.manager.add_tasks([(f"Task {i}", "") for i in range(200)])
+        successes = []
+
+        def worker(index):
+            for task_id in range(1, 201):
+                try:
+                    self.manager.delete_task(task_id)
+                    successes.append(task_id)
+                except TaskNotFoundError:
+                    pass
+
+        run_threads(4, worker)
+
+        assert sorted(successes) == list(range(1, 201))
+        assert self.manager.stats() == {"total": 0, "pending": 0, "completed": 0}
+
+    def test_iter_tasks_is_a_consistent_snapshot(self):
+        """Test that iteration is unaffected by later mutations."""
+        self.manager.add_tasks([("Task 1", ""), ("Task 2", "")])
+
+        tasks = self.manager.iter_tasks()
+        listed = self.manager.get_all_tasks()
+        self.manager.update_task(1, title="Changed")
+        self.manager.delete_task(2)
+        self.manager.add_task("Task 3")
+
+        assert [(t.id, t.title) for t in tasks] == [(1, "Task 1"), (2, "Task 2")]
+        assert [(t.id, t.title) for t in listed] == [(1, "Task 1"), (2, "Task 2")]
+        assert self.manager.get_all_tasks()[0].title == "Changed"
+
+    def test_first_queries_on_lazy_indexes_see_every_task(self):
+        """Test that readers racing to trigger a lazy index build never query a partial index."""
+        inner = TodoManager(lazy_indexes=True)
+        inner.add_tasks([(f"Report {i}", "") for i in range(30_000)])
+        manager = ConcurrentTodoManager(inner)
+        barrier = threading.Barrier(4)
+        counts = [None] * 4
+
+        def worker(index):
+            barrier.wait()
+            counts[index] = len(manager.search("report"))
+
+        run_threads(4, worker)
+
+        assert counts == [30_000] * 4
+
+    def test_compare_and_set_increments_are_never_lost(self):
+        """Test that racing read-modify-write loops with expected versions lose no update."""
+        self.manager.add_task("0")
+
+        def worker(index):
+            for _ in range(200):
+                while True:
+                    snapshot = self.manager.read_task(1)
+                    try:
+                        self.manager.update_task(1, title=str(int(snapshot.title) + 1),
+                                                 expected_version=snapshot.version)
+                        break
+                    except VersionConflictError:
+                        pass
+
+        run_threads(4, worker)
+
+        assert self.manager.get_task(1).title == "800"
+        assert self.manager.read_task(1).version == 801
+
+    def test_snapshot_reads_and_conflicts_do_not_wait_for_writers(self):
+        """Test that published snapshots are read, and conflicts raised, without the lock."""
+        self.manager.add_task("Task 1")
+        self.manager.update_task(1, title="Task 1 again")
+        snapshot = self.manager.read_task(1)
+        self.manager._lock.acquire_write()
+        try:
+            assert self.manager.read_task(1) is snapshot
+            with pytest.raises(VersionConflictError):
+                self.manager.mark_complete_if(1, 1)
+        finally:
+            self.manager._lock.release_write()
+        assert self.manager.mark_complete_if(1, 2) is True
+
+    def test_errors_propagate_and_release_lock(self):
+        """Test that exceptions from the wrapped manager release the lock."""
+        with pytest.raises(TaskNotFoundError):
+            self.manager.get_task(1)
+        with pytest.raises(ValueError):
+            self.manager.add_task("")
+        assert self.manager.add_task("Task 1") == 1
+
+
+def test_read_write_lock_excludes_writers():
+    """Test that readers share the lock while a writer holds it exclusively."""
+    lock = ReadWriteLock()
+    lock.acquire_read()
+    lock.acquire_read()
+    acquired = threading.Event()
+
+    def writer():
+        lock.acquire_write()
+        acquired.set()
+        lock.release_write()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    assert not acquired.wait(0.05)
+    lock.release_read()
+    lock.release_read()
+    assert acquired.wait(1)
+    thread.join()
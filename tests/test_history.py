@@ -0,0 +1,154 @@
+"""Tests for undo/redo history in the TodoManager."""
+import pytest
+from src.todo.exceptions import TaskNotFoundError
+from src.todo.history import History
+from src.todo.journal import Journal
+from src.todo.manager import TodoManager
+
+
+class TestHistory:
+    """Test cases for undo and redo."""
+
+    def setup_method(self):
+        """Set up a TodoManager with undo history for each test."""
+        self.manager = TodoManager(history=History())
+
+    def snapshot(self):
+        """Return every task as a comparable tuple."""
+        return [(t.id, t.title, t.description, t.status) for t in self.manager.get_all_tasks()]
+
+    def test_undo_and_redo_single_operations(self):
+        """Test that each single-task change can be undone and redone."""
+        self.manager.add_task("Task 1", "Description 1")
+        self.manager.add_task("Task 2", "Description 2")
+        self.manager.update_task(1, title="Renamed")
+        self.manager.mark_complete(2)
+        self.manager.delete_task(1)
+        states = [self.snapshot()]
+
+        for _ in range(5):
+            assert self.manager.undo()
+            states.append(self.snapshot())
+        assert not self.manager.undo()
+        assert states[-1] == []
+        assert states[1] == [(1, "Renamed", "Description 1", "pending"), (2, "Task 2", "Description 2", "completed")]
+        assert states[2][1][3] == "pending"
+        assert states[3][0][1] == "Task 1"
+
+        for expected in reversed(states[:-1]):
+            assert self.manager.redo()
+            assert self.snapshot() == expected
+        assert not self.manager.redo()
+
+    def test_undone_tasks_leave_search_index(self):
+        """Test that undo keeps the search index in step."""
+        self.manager.add_task("Deploy backend")
+        self.manager.update_task(1, title="Write docs")
+        self.manager.undo()
+
+        assert [t.id for t in self.manager.search("deploy")] == [1]
+        assert self.manager.search("docs") == []
+
+    def test_bulk_operations_are_single_entries(self):
+        """Test that each bulk operation is undone in one step."""
+        self.manager.add_tasks([(f"Task {i}", "") for i in range(10)])
+        self.manager.update_many({1: ("First", None), 2: (None, "Second")})
+        self.manager.mark_complete_many(range(1, 6))
+        self.manager.delete_many(range(3, 9))
+
+        self.manager.undo()
+        assert self.manager.count() == 10
+        self.manager.undo()
+        assert self.manager.count("completed") == 0
+        self.manager.undo()
+        assert self.manager.get_task(1).title == "Task 0"
+        assert self.manager.get_task(2).description == ""
+        self.manager.undo()
+        assert self.manager.count() == 0
+
+    def test_import_is_a_single_entry(self, tmp_path):
+        """Test that a chunked import is undone in one step."""
+        path = tmp_path / "tasks.csv"
+        path.write_text("title,description\n" + "".join(f"Task {i},\n" for i in range(25)))
+
+        assert self.manager.import_tasks(str(path), chunk_size=10) == 25
+        assert self.manager.undo()
+        assert self.manager.count() == 0
+        assert self.manager.redo()
+        assert [t.id for t in self.manager.get_all_tasks()] == list(range(1, 26))
+
+    def test_new_change_clears_redo(self):
+        """Test that making a change after undo discards the redo stack."""
+        self.manager.add_task("Task 1")
+        self.manager.undo()
+        self.manager.add_task("Task 2")
+
+        assert not self.manager.redo()
+        assert [t.id for t in self.manager.get_all_tasks()] == [2]
+
+    def test_entry_cap_bounds_history(self):
+        """Test that the oldest entries are evicted past the entry cap."""
+        history = History(max_entries=10)
+        manager = TodoManager(history=history)
+        manager.add_task("Task")
+        for i in range(1000):
+            manager.update_task(1, title=f"Title {i}")
+
+        assert len(history) == 10
+        while manager.undo():
+            pass
+        assert manager.get_task(1).title == "Title 989"
+
+    def test_byte_budget_bounds_history(self):
+        """Test that the byte budget evicts entries and drops oversized ones."""
+        history = History(max_bytes=2000)
+        manager = TodoManager(history=history)
+        manager.add_task("Task")
+        for i in range(100):
+            manager.update_task(1, description="x" * 100 + str(i))
+        assert history.size <= 2000
+
+        manager.add_tasks([("y" * 100, "") for _ in range(50)])
+        manager.delete_many(range(2, 52))
+        assert len(history) == 0
+        assert not manager.undo()
+
+    def test_undo_is_journaled(self, tmp_path):
+        """Test that undone changes survive a restart."""
+        manager = TodoManager(journal=Journal(str(tmp_path)), history=History())
+        manager.add_task("Task 1")
+        manager.mark_complete(1)
+        manager.add_task("Task 2")
+        manager.undo()
+        manager.undo()
+        manager.close()
+
+        recovered = TodoManager(journal=Journal(str(tmp_path)))
+        assert [(t.id, t.status) for t in recovered.get_all_tasks()] == [(1, "pending")]
+        with pytest.raises(TaskNotFoundError):
+            recovered.get_task(2)
+
+    def test_undo_of_bulk_delete_across_a_snapshot(self, tmp_path):
+        """Test that undoing and redoing a bulk change survives a snapshot falling due midway."""
+        manager = TodoManager(journal=Journal(str(tmp_path), snapshot_interval=4), history=History())
+        manager.add_tasks([(f"Task {i}", "") for i in range(1, 11)])
+        manager.delete_many(range(2, 8))
+        manager.undo()
+        manager.close()
+
+        recovered = TodoManager(journal=Journal(str(tmp_path), snapshot_interval=4), history=History())
+        assert [t.id for t in recovered.get_all_tasks()] == list(range(1, 11))
+        recovered.delete_many(range(2, 8))
+        recovered.undo()
+        recovered.redo()
+        recovered.close()
+
+        reopened = TodoManager(journal=Journal(str(tmp_path), snapshot_interval=4))
+        assert [t.id for t in reopened.get_all_tasks()] == [1, 8, 9, 10]
+
+    def test_without_history_nothing_to_undo(self):
+        """Test that a manager without history reports nothing to undo."""
+        manager = TodoManager()
+        manager.add_task("Task 1")
+        assert not manager.undo()
+        assert not manager.redo()
@@ -0,0 +1,120 @@
+"""Tests for journal persistence and recovery of the TodoManager."""
+import os
+import pytest
+from src.todo.journal import Journal
+from src.todo.manager import TodoManager
+from src.todo.exceptions import TaskNotFoundError
+
+
+class TestJournal:
+    """Test cases for the Journal persistence backend."""
+
+    def open_manager(self, tmp_path, **kwargs):
+        """Open a TodoManager backed by a journal in tmp_path."""
+        return TodoManager(journal=Journal(str(tmp_path), **kwargs))
+
+    def test_recover_all_operations(self, tmp_path):
+        """Test that every mutation survives a restart."""
+        manager = self.open_manager(tmp_path)
+        manager.add_task("Task 1", "Description 1")
+        manager.add_task("Task 2", "Description 2")
+        manager.add_task("Task 3", "Description 3")
+        manager.update_task(1, title="Updated Task 1")
+        manager.mark_complete(2)
+        manager.delete_task(3)
+        manager.close()
+
+        recovered = self.open_manager(tmp_path)
+
+        tasks = recovered.get_all_tasks()
+        assert [task.id for task in tasks] == [1, 2]
+        assert tasks[0].title == "Updated Task 1"
+        assert tasks[0].description == "Description 1"
+        assert tasks[1].status == "completed"
+        assert [task.version for task in tasks] == [2, 2]
+        with pytest.raises(TaskNotFoundError):
+            recovered.get_task(3)
+
+    def test_bulk_operations_across_a_snapshot(self, tmp_path):
+        """Test that a snapshot falling due within a bulk operation replays nothing twice."""
+        manager = self.open_manager(tmp_path, snapshot_interval=3)
+        manager.add_tasks([(f"Task {i}", "") for i in range(1, 6)])
+        manager.update_many({1: ("Renamed 1", None), 2: ("Renamed 2", None)})
+        manager.mark_complete_many([3, 4])
+        manager.close()
+
+        recovered = self.open_manager(tmp_path, snapshot_interval=3)
+        tasks = recovered.get_all_tasks()
+        assert [task.id for task in tasks] == [1, 2, 3, 4, 5]
+        assert [task.version for task in tasks] == [2, 2, 2, 2, 1]
+        recovered.add_tasks([(f"Task {i}", "") for i in range(6, 11)])
+        assert recovered.delete_many(range(2, 8)) == 6
+        recovered.close()
+
+        reopened = self.open_manager(tmp_path, snapshot_interval=3)
+        assert [task.id for task in reopened.get_all_tasks()] == [1, 8, 9, 10]
+        assert reopened.next_id == 11
+
+    def test_recovered_manager_continues_ids(self, tmp_path):
+        """Test that IDs are not reused after a restart, even for deleted tasks."""
+        manager = self.open_manager(tmp_path)
+        manager.add_task("Task 1")
+        manager.add_task("Task 2")
+        manager.delete_task(2)
+        manager.close()
+
+        recovered = self.open_manager(tmp_path)
+        assert recovered.add_task("Task 3") == 3
+
+    def test_snapshot_truncates_journal(self, tmp_path):
+        """Test that a snapshot is written periodically and the journal is compacted."""
+        manager = self.open_manager(tmp_path, snapshot_interval=3)
+        for i in range(4):
+            manager.add_task(f"Task {i}")
+        manager.close()
+
+        assert os.path.exists(tmp_path / Journal.SNAPSHOT_FILE)
+        with open(tmp_path / Journal.JOURNAL_FILE) as handle:
+            assert len(handle.readlines()) == 1
+
+        recovered = self.open_manager(tmp_path, snapshot_interval=3)
+        assert len(recovered.get_all_tasks()) == 4
+
+    def test_replay_skips_records_covered_by_snapshot(self, tmp_path):
+        """Test that records already in the snapshot are not applied twice."""
+        manager = self.open_manager(tmp_path)
+        manager.add_task("Task 1")
+        manager.close()
+        with open(tmp_path / Journal.JOURNAL_FILE) as handle:
+            stale_journal = handle.read()
+
+        manager = self.open_manager(tmp_path)
+        manager.snapshot()
+        manager.close()
+        # Simulate a crash between writing the snapshot and truncating the journal
+        with open(tmp_path / Journal.JOURNAL_FILE, "w") as handle:
+            handle.write(stale_journal)
+
+        recovered = self.open_manager(tmp_path)
+        assert len(recovered.get_all_tasks()) == 1
+        assert recovered.add_task("Task 2") == 2
+
+    def test_torn_record_is_discarded(self, tmp_path):
+        """Test that a partially written final record is ignored and truncated."""
+        manager = self.open_manager(tmp_path)
+        manager.add_task("Task 1")
+        manager.close()
+        with open(tmp_path / Journal.JOURNAL_FILE, "a") as handle:
+            handle.write('{"op":"add","task":{"id":2,"tit')
+
+        recovered = self.open_manager(tmp_path)
+        assert [task.id for task in recovered.get_all_tasks()] == [1]
+        recovered.add_task("Task 2")
+        recovered.close()
+
+        assert len(self.open_manager(tmp_path).get_all_tasks()) == 2
+
+    def test_negative_settings_rejected(self, tmp_path):
+        """Test that negative batching settings raise ValueError."""
+        with pytest.raises(ValueError):
+            Journal(str(tmp_path), fsync_batch=-1)
@@ -1,6 +1,7 @@
 """Integration tests for the main CLI functionality."""
 import io
 import sys
+import pytest
 from unittest.mock import patch, MagicMock
 from src.todo.main import main
 
@@ -124,4 +125,336 @@ def test_delete_task_via_cli():
         # Verify that the task was added, deleted, and no longer appears in the list
         assert "Added task #1: Task 1" in output
         assert "Task #1 deleted successfully" in output
-        assert "No tasks found." in output  # Since we deleted the only task
\ No newline at end of file
+        assert "No tasks found." in output  # Since we deleted the only task
+
+def test_search_tasks_via_cli():
+    """Test searching tasks through the CLI interface."""
+    user_inputs = [
+        'add "Deploy backend" "Roll out the API"',
+        'add "Write docs" "User guide"',
+        'search "deploy"',
+        'search "missing"',
+        'quit'
+    ]
+
+    with patch('src.todo.main.input', side_effect=user_inputs):
+        captured_output = io.StringIO()
+        with patch('sys.stdout', new=captured_output):
+            main()
+
+        output = captured_output.getvalue()
+
+        assert "1. [ ] Deploy backend - Roll out the API" in output
+        assert "2. [ ] Write docs" not in output
+        assert 'No tasks matching "missing".' in output
+
+
+def test_bulk_complete_and_delete_via_cli():
+    """Test completing and deleting ranges and lists of tasks through the CLI."""
+    user_inputs = [
+        'add "Task 1" "Description 1"',
+        'add "Task 2" "Description 2"',
+        'add "Task 3" "Description 3"',
+        'add "Task 4" "Description 4"',
+        'complete 1-3',
+        'delete 2,4',
+        'delete 1,9',
+        'list',
+        'quit'
+    ]
+
+    with patch('src.todo.main.input', side_effect=user_inputs):
+        captured_output = io.StringIO()
+        with patch('sys.stdout', new=captured_output):
+            main()
+
+        output = captured_output.getvalue()
+
+        assert "3 tasks marked as complete" in output
+        assert "2 tasks deleted successfully" in output
+        assert "Error: 1 of 2 items failed; no changes were made" in output
+        assert "  9: Task with ID 9 not found" in output
+        assert "1. [x] Task 1 - Description 1" in output
+        assert "3. [x] Task 3 - Description 3" in output
+
+
+def test_bulk_ids_are_separated_and_bounded():
+    """Test that spaces separate IDs rather than join them, and ranges stop at the last ID."""
+    user_inputs = [
+        *[f'add "Task {i}" ""' for i in range(1, 13)],
+        'complete 1 2',
+        'delete 1-1000000000',
+        'delete 3 -4',
+        'list',
+        'quit'
+    ]
+
+    with patch('src.todo.main.input', side_effect=user_inputs):
+        captured_output = io.StringIO()
+        with patch('sys.stdout', new=captured_output):
+            main()
+
+        output = captured_output.getvalue()
+
+        assert "2 tasks marked as complete" in output
+        assert "Invalid delete command format (Range 1-1000000000 goes past the last task ID (12))" in output
+        assert "Invalid delete command format (Invalid task ID: '-4')" in output
+        assert "1. [x] Task 1" in output
+        assert "2. [x] Task 2" in output
+        assert "12. [ ] Task 12" in output
+
+
+def test_export_and_import_via_cli(tmp_path):
+    """Test exporting and re-importing tasks through the CLI interface."""
+    path = tmp_path / "tasks.csv"
+    user_inputs = [
+        'add "Task 1" "Description 1"',
+        f'export {path}',
+        f'import "{path}"',
+        'list',
+        'import missing.csv',
+        'quit'
+    ]
+
+    with patch('src.todo.main.input', side_effect=user_inputs):
+        captured_output = io.StringIO()
+        with patch('sys.stdout', new=captured_output):
+            main()
+
+        output = captured_output.getvalue()
+
+        assert f"Exported 1 tasks to {path}" in output
+        assert f"Imported 1 tasks from {path}" in output
+        assert "2. [ ] Task 1 - Description 1" in output
+        assert "Error: [Errno 2] No such file or directory: 'missing.csv'" in output
+
+
+def test_script_mode_runs_without_prompts(tmp_path):
+    """Test running commands from a script file with --script."""
+    script = tmp_path / "commands.txt"
+    script.write_text(
+        '# set up tasks\n'
+        'add "Task 1" "Description 1"\n'
+        '\n'
+        'add "Task 2" "Description 2"\n'
+        'complete 2\n'
+        'list\n'
+        'quit\n'
+        'add "Task 3" "Never added"\n'
+    )
+
+    captured_output = io.StringIO()
+    with patch('sys.stdout', new=captured_output):
+        main(["--script", str(script)])
+
+    assert captured_output.getvalue() == (
+        "Added task #1: Task 1\n"
+        "Added task #2: Task 2\n"
+        "Task #2 marked as complete\n"
+        "1. [ ] Task 1 - Description 1\n"
+        "2. [x] Task 2 - Description 2\n"
+    )
+
+
+def test_script_mode_reads_stdin():
+    """Test that --script - reads commands from stdin."""
+    captured_output = io.StringIO()
+    with patch('sys.stdin', new=io.StringIO('add "Task 1" ""\nbogus\n')):
+        with patch('sys.stdout', new=captured_output):
+            main(["--script", "-"])
+
+    output = captured_output.getvalue()
+    assert "Added task #1: Task 1" in output
+    assert "Unknown command: bogus" in output
+    assert "Welcome" not in output
+
+
+def test_stats_command_and_profile_report(tmp_path):
+    """Test the stats command with --profile, which also writes a report on exit."""
+    report = tmp_path / "profile.txt"
+    captured_output = io.StringIO()
+    with patch('sys.stdin', new=io.StringIO('add "Task 1" ""\ncomplete 1\nstats\n')):
+        with patch('sys.stdout', new=captured_output):
+            main(["--script", "-", "--profile", str(report)])
+
+    output = captured_output.getvalue()
+    assert "Tasks: 1 total, 0 pending, 1 completed" in output
+    assert "cli.add" in output
+    assert "mark_complete" in output
+    assert "Call profile" in report.read_text()
+
+
+def test_stats_command_without_metrics():
+    """Test that stats reports counts and that metrics are off by default."""
+    captured_output = io.StringIO()
+    with patch('sys.stdin', new=io.StringIO('add "Task 1" ""\nstats\n')):
+        with patch('sys.stdout', new=captured_output):
+            main(["--script", "-"])
+
+    output = captured_output.getvalue()
+    assert "Tasks: 1 total, 1 pending, 0 completed" in output
+    assert "Operation metrics are off" in output
+
+
+def test_undo_and_redo_commands():
+    """Test the undo and redo commands."""
+    captured_output = io.StringIO()
+    commands = 'add "Task 1" ""\ndelete 1\nundo\nlist\nredo\nredo\nlist\nundo\nundo\nundo\n'
+    with patch('sys.stdin', new=io.StringIO(commands)):
+        with patch('sys.stdout', new=captured_output):
+            main(["--script", "-"])
+
+    assert captured_output.getvalue() == (
+        "Added task #1: Task 1\n"
+        "Task #1 deleted successfully\n"
+        "Undid the last change\n"
+        "1. [ ] Task 1 - \n"
+        "Redid the last undone change\n"
+        "Nothing to redo\n"
+        "No tasks found.\n"
+        "Undid the last change\n"
+        "Undid the last change\n"
+        "Nothing to undo\n"
+    )
+
+
+def test_priority_and_due_commands():
+    """Test the priority, due, next, overdue and due-between commands."""
+    captured_output = io.StringIO()
+    commands = (
+        'add "Task 1" ""\nadd "Task 2" ""\n'
+        'priority 2 high\ndue 1 2000-01-01\npriority 1 urgent\n'
+        'next 1\noverdue\ndue-between 1999-01-01 2000-12-31\n'
+    )
+    with patch('sys.stdin', new=io.StringIO(commands)):
+        with patch('sys.stdout', new=captured_output):
+            main(["--script", "-"])
+
+    assert captured_output.getvalue().splitlines()[2:] == [
+        "Task #2 priority set to high",
+        "Task #1 due date set to 2000-01-01",
+        "Error: Priority must be 0-3 or one of: none, low, medium, high",
+        "2. [ ] Task 2 -  (priority: high)",
+        "1. [ ] Task 1 -  (due: 2000-01-01)",
+        "1. [ ] Task 1 -  (due: 2000-01-01)",
+    ]
+
+
+def test_tag_project_and_filter_commands():
+    """Test the tag, untag, project and filter commands."""
+    captured_output = io.StringIO()
+    commands = (
+        'add "Task 1" ""\nadd "Task 2" ""\n'
+        'tag 1 urgent bug\ntag 2 urgent blocked\nuntag 1 bug\nproject 2 Ops\n'
+        'filter pending tag:urgent and not tag:blocked\nfilter project:ops\nfilter tag:\n'
+    )
+    with patch('sys.stdin', new=io.StringIO(commands)):
+        with patch('sys.stdout', new=captured_output):
+            main(["--script", "-"])
+
+    assert captured_output.getvalue().splitlines()[2:] == [
+        "Task #1 tags: bug urgent",
+        "Task #2 tags: blocked urgent",
+        "Task #1 tags: urgent",
+        "Task #2 moved to project ops",
+        "1. [ ] Task 1 -  #urgent",
+        "2. [ ] Task 2 -  @ops #blocked #urgent",
+        "Error: Missing a name after 'tag:'",
+    ]
+
+
+def test_archive_command(tmp_path):
+    """Test archiving completed tasks from the CLI, with and without an archive."""
+    captured_output = io.StringIO()
+    commands = 'add "Task 1" ""\nadd "Task 2" ""\ncomplete 1\narchive 0\narchive x\nlist\nstats\n'
+    with patch('sys.stdin', new=io.StringIO(commands)):
+        with patch('sys.stdout', new=captured_output):
+            main(["--script", "-", "--archive-dir", str(tmp_path)])
+
+    assert captured_output.getvalue().splitlines()[3:7] == [
+        "1 tasks archived",
+        "Invalid archive command format. Use: archive [days]",
+        "2. [ ] Task 2 - ",
+        "Tasks: 1 total, 1 pending, 0 completed, 1 archived",
+    ]
+
+    captured_output = io.StringIO()
+    with patch('sys.stdin', new=io.StringIO("archive\n")):
+        with patch('sys.stdout', new=captured_output):
+            main(["--script", "-"])
+    assert captured_output.getvalue() == "Error: This manager has no archive (start with --archive-dir)\n"
+
+
+def test_list_query_and_explain_commands():
+    """Test list queries and explain from the CLI."""
+    captured_output = io.StringIO()
+    commands = ('add "Deploy api" ""\nadd "Write docs" ""\nadd "Deploy web" ""\ncomplete 3\n'
+                'list where title~deploy order by id desc limit 1\nlist where status=done\n'
+                'explain list where id>=2 and status=pending\n')
+    with patch('sys.stdin', new=io.StringIO(commands)):
+        with patch('sys.stdout', new=captured_output):
+            main(["--script", "-"])
+
+    assert captured_output.getvalue().splitlines()[4:9] == [
+        "3. [x] Deploy web - ",
+        "Error: Status must be one of pending, completed",
+        "access:   ID range 2..3 (~2 of 3 tasks, cost ~2)",
+        "filter:   status=pending",
+        "order:    id asc, as produced by the access path",
+    ]
+
+
+def test_repeated_list_reuses_the_rendered_listing():
+    """Test that an unchanged listing is output in one piece, and changes show up."""
+    from src.todo.main import execute_command
+    from src.todo.manager import TodoManager
+    from src.todo.render import RenderCache
+
+    manager = TodoManager(render_cache=RenderCache())
+    manager.add_tasks([(f"Task {i}", "") for i in range(1, 2501)])
+    first, second, third = [], [], []
+    execute_command(manager, "list", first.append)
+    execute_command(manager, "list", second.append)
+    manager.mark_complete(2)
+    execute_command(manager, "list", third.append)
+
+    assert len(first) == 1 and second == first
+    assert third[0].splitlines()[1] == "2. [x] Task 2 - "
+    assert third[0].splitlines()[2:] == first[0].splitlines()[2:]
+
+
+def test_parse_args_fast_path_matches_argparse():
+    """Test that the table-driven option parser agrees with the argparse fallback."""
+    from src.todo.main import _parse_args_slow, parse_args
+
+    for argv in ([], ["--metrics", "--undo-limit", "5", "--script", "-"],
+                 ["--data-dir", "data", "--fsync-batch", "1", "--snapshot-interval", "0"], ["--db", "x.db"]):
+        assert vars(parse_args(argv)) == vars(_parse_args_slow(argv))
+    # Abbreviations are left to argparse
+    assert parse_args(["--undo", "7"]).undo_limit == 7
+
+
+def test_db_and_data_dir_are_exclusive(capsys):
+    """Test that a SQLite database cannot also be journaled."""
+    from src.todo.main import parse_args
+
+    with pytest.raises(SystemExit):
+        parse_args(["--db", "x.db", "--data-dir", "data"])
+    assert "--db and --data-dir cannot be used together" in capsys.readouterr().err
+
+
+def test_commands_with_wrong_arguments_are_unknown():
+    """Test that commands given (or missing) arguments they do not take are rejected."""
+    captured_output = io.StringIO()
+    commands = 'add\nLIST\noverdue all\nNext\nundo now\n'
+    with patch('sys.stdin', new=io.StringIO(commands)):
+        with patch('sys.stdout', new=captured_output):
+            main(["--script", "-"])
+
+    assert captured_output.getvalue().splitlines() == [
+        "Unknown command: add. Type 'help' for available commands.",
+        "No tasks found.",
+        "Unknown command: overdue. Type 'help' for available commands.",
+        "No tasks found.",
+        "Unknown command: undo. Type 'help' for available commands.",
+    ]
@@ -1,7 +1,8 @@
 """Unit tests for the TodoManager class."""
 import pytest
 from src.todo.manager import TodoManager
-from src.todo.exceptions import TaskNotFoundError
+from src.todo.exceptions import BulkOperationError, TaskNotFoundError, VersionConflictError
+from src.todo.history import History
 
 
 class TestTodoManager:
@@ -201,4 +202,265 @@ class TestTodoManager:
 
         # Add a new task - it should get the next ID
         task_id_2 = self.manager.add_task("Task 2", "Description 2")
-        assert task_id_2 == 2  # Next available ID after deletion
\ No newline at end of file
+        assert task_id_2 == 2  # Next available ID after deletion
+
+class TestStatusIndex:
+    """Test cases for status-filtered queries backed by the status index."""
+
+    def setup_method(self):
+        """Set up a TodoManager with a mix of pending and completed tasks."""
+        self.manager = TodoManager()
+        for i in range(1, 6):
+            self.manager.add_task(f"Task {i}")
+        self.manager.mark_complete(4)
+        self.manager.mark_complete(2)
+
+    def test_get_tasks_by_status(self):
+        """Test that get_tasks filters by status and keeps ID order."""
+        assert [t.id for t in self.manager.get_tasks(status="pending")] == [1, 3, 5]
+        assert [t.id for t in self.manager.get_tasks(status="completed")] == [2, 4]
+        assert [t.id for t in self.manager.get_tasks()] == [1, 2, 3, 4, 5]
+
+    def test_count_and_stats(self):
+        """Test that counts track adds, completions, and deletes."""
+        assert self.manager.count() == 5
+        assert self.manager.count(status="pending") == 3
+        assert self.manager.count(status="completed") == 2
+
+        self.manager.delete_task(1)
+        self.manager.delete_task(2)
+        self.manager.mark_complete(3)
+
+        assert self.manager.stats() == {"total": 3, "pending": 1, "completed": 2}
+
+    def test_mark_complete_twice_keeps_counts(self):
+        """Test that completing an already completed task does not double count."""
+        self.manager.mark_complete(2)
+        assert self.manager.count(status="completed") == 2
+
+    def test_invalid_status_error(self):
+        """Test that filtering by an unknown status raises ValueError."""
+        with pytest.raises(ValueError, match="Status must be one of"):
+            self.manager.count(status="archived")
+        with pytest.raises(ValueError, match="Status must be one of"):
+            self.manager.get_tasks(status="archived")
+
+
+class TestOrderedIteration:
+    """Test cases for ordered iteration and pagination."""
+
+    def setup_method(self):
+        """Set up a TodoManager with ten tasks."""
+        self.manager = TodoManager()
+        for i in range(1, 11):
+            self.manager.add_task(f"Task {i}")
+
+    def test_iter_tasks_is_lazy_and_ordered(self):
+        """Test that iter_tasks yields tasks in ID order without building a list."""
+        tasks = self.manager.iter_tasks()
+        assert not isinstance(tasks, list)
+        assert [t.id for t in tasks] == list(range(1, 11))
+
+    def test_offset_and_limit(self):
+        """Test offset/limit pagination."""
+        page = self.manager.get_tasks(offset=3, limit=4)
+        assert [t.id for t in page] == [4, 5, 6, 7]
+        assert self.manager.get_tasks(offset=20) == []
+
+    def test_cursor_pagination(self):
+        """Test that after_id pages through tasks, skipping deleted IDs."""
+        self.manager.delete_task(5)
+
+        first = self.manager.get_tasks(limit=4)
+        second = self.manager.get_tasks(limit=4, after_id=first[-1].id)
+
+        assert [t.id for t in first] == [1, 2, 3, 4]
+        assert [t.id for t in second] == [6, 7, 8, 9]
+
+    def test_cursor_pagination_by_status(self):
+        """Test that after_id combines with the status filter."""
+        for task_id in (2, 4, 6, 8):
+            self.manager.mark_complete(task_id)
+
+        page = self.manager.get_tasks(status="completed", after_id=3, limit=2)
+        assert [t.id for t in page] == [4, 6]
+
+    def test_delete_during_iteration(self):
+        """Test that tasks deleted mid-iteration are skipped."""
+        seen = []
+        for task in self.manager.iter_tasks():
+            seen.append(task.id)
+            if task.id == 2:
+                self.manager.delete_task(3)
+        assert seen == [1, 2, 4, 5, 6, 7, 8, 9, 10]
+
+    def test_negative_offset_error(self):
+        """Test that a negative offset raises ValueError."""
+        with pytest.raises(ValueError):
+            self.manager.get_tasks(offset=-1)
+
+
+class TestCompactStorage:
+    """Test cases for the compact task representation."""
+
+    def test_tasks_have_no_instance_dict(self):
+        """Test that tasks are slotted and share status objects."""
+        manager = TodoManager()
+        manager.add_task("Task 1")
+        manager.add_task("Task 2")
+        task_1, task_2 = manager.get_all_tasks()
+
+        assert not hasattr(task_1, "__dict__")
+        assert task_1.status is task_2.status
+        assert task_1.status == "pending"
+
+    def test_compact_mode_interns_strings(self):
+        """Test that compact mode stores repeated strings once."""
+        manager = TodoManager(compact=True)
+        title = "".join(["Repeated", " title"])
+        manager.add_task(title, "Same description")
+        manager.add_task("".join(["Repeated", " title"]), "Same description")
+        task_1, task_2 = manager.get_all_tasks()
+
+        assert task_1.title is task_2.title
+        assert task_1.description is task_2.description
+
+
+class TestBulkOperations:
+    """Test cases for the all-or-nothing bulk operations."""
+
+    def setup_method(self):
+        """Set up a fresh TodoManager instance for each test."""
+        self.manager = TodoManager()
+
+    def test_add_tasks(self):
+        """Test that add_tasks accepts pairs and mappings and returns new IDs."""
+        task_ids = self.manager.add_tasks([
+            ("Task 1", " Description 1 "),
+            {"title": "Task 2"},
+        ])
+
+        assert task_ids == [1, 2]
+        assert self.manager.get_task(1).description == "Description 1"
+        assert self.manager.get_task(2).description == ""
+        assert self.manager.count(status="pending") == 2
+
+    def test_add_tasks_reports_every_invalid_item(self):
+        """Test that one invalid item rejects the whole batch."""
+        with pytest.raises(BulkOperationError) as excinfo:
+            self.manager.add_tasks([("Task 1", ""), ("", ""), {"description": "no title"}])
+
+        assert set(excinfo.value.errors) == {1, 2}
+        assert excinfo.value.total == 3
+        assert self.manager.count() == 0
+
+    def test_mark_complete_and_delete_many(self):
+        """Test that bulk complete and delete update the indexes."""
+        self.manager.add_tasks([(f"Task {i}", "") for i in range(1, 201)])
+
+        assert self.manager.mark_complete_many([1, 2, 3, 3]) == 3
+        assert self.manager.delete_many(range(2, 102)) == 100
+
+        assert self.manager.stats() == {"total": 100, "pending": 99, "completed": 1}
+        assert [t.id for t in self.manager.get_tasks(limit=3)] == [1, 102, 103]
+
+    def test_bulk_unknown_ids_change_nothing(self):
+        """Test that unknown IDs are all reported and nothing is applied."""
+        self.manager.add_tasks([("Task 1", ""), ("Task 2", "")])
+
+        with pytest.raises(BulkOperationError) as excinfo:
+            self.manager.delete_many([1, 7, 9])
+
+        assert set(excinfo.value.errors) == {7, 9}
+        assert self.manager.count() == 2
+
+    def test_update_many(self):
+        """Test bulk updates, including partial and invalid ones."""
+        self.manager.add_tasks([("Task 1", "Description 1"), ("Task 2", "Description 2")])
+
+        with pytest.raises(BulkOperationError) as excinfo:
+            self.manager.update_many({1: ("New 1", None), 2: ("  ", None)})
+        assert excinfo.value.errors == {2: "Title cannot be empty"}
+        assert self.manager.get_task(1).title == "Task 1"
+
+        assert self.manager.update_many({1: ("New 1", None), 2: {"description": "New 2"}}) == 2
+        assert self.manager.get_task(1).title == "New 1"
+        assert self.manager.get_task(1).description == "Description 1"
+        assert self.manager.get_task(2).description == "New 2"
+        assert [t.id for t in self.manager.search("new")] == [1, 2]
+
+
+class TestVersions:
+    """Test cases for task versions, compare-and-set updates and snapshots."""
+
+    def setup_method(self):
+        """Set up a TodoManager with one task for each test."""
+        self.manager = TodoManager(history=History())
+        self.manager.add_task("Task 1", "Description 1")
+
+    def test_every_change_bumps_the_version(self):
+        """Test that versions start at 1 and go up once per change."""
+        assert self.manager.get_task(1).version == 1
+        self.manager.update_task(1, title="New title")
+        self.manager.set_priority(1, "high")
+        self.manager.tag_task(1, "urgent")
+        self.manager.mark_complete(1)
+        assert self.manager.get_task(1).version == 5
+
+        # Completing a completed task changes nothing
+        self.manager.mark_complete(1)
+        assert self.manager.get_task(1).version == 5
+
+    def test_update_with_expected_version(self):
+        """Test that a stale expected version fails without changing the task."""
+        self.manager.update_task(1, title="First", expected_version=1)
+
+        with pytest.raises(VersionConflictError) as excinfo:
+            self.manager.update_task(1, title="Second", expected_version=1)
+
+        assert (excinfo.value.expected, excinfo.value.actual) == (1, 2)
+        assert self.manager.get_task(1).title == "First"
+
+    def test_mark_complete_if(self):
+        """Test that mark_complete_if only completes the expected version."""
+        self.manager.update_task(1, description="Changed")
+
+        with pytest.raises(VersionConflictError):
+            self.manager.mark_complete_if(1, 1)
+        assert self.manager.get_task(1).status == "pending"
+
+        assert self.manager.mark_complete_if(1, 2) is True
+        assert self.manager.get_task(1).status == "completed"
+        with pytest.raises(TaskNotFoundError):
+            self.manager.mark_complete_if(99, 1)
+
+    def test_read_task_returns_immutable_snapshots(self):
+        """Test that snapshots are shared until the task changes and never change."""
+        snapshot = self.manager.read_task(1)
+        assert (snapshot.title, snapshot.version) == ("Task 1", 1)
+        assert self.manager.read_task(1) is snapshot
+        with pytest.raises(AttributeError):
+            snapshot.title = "Changed"
+
+        self.manager.update_task(1, title="Changed")
+
+        assert snapshot.title == "Task 1"
+        assert (self.manager.read_task(1).title, self.manager.read_task(1).version) == ("Changed", 2)
+        assert self.manager.read_task(1).to_dict() == self.manager.get_task(1).to_dict()
+
+    def test_deleted_tasks_have_no_snapshot(self):
+        """Test that read_task fails once a task is deleted."""
+        self.manager.read_task(1)
+        self.manager.delete_task(1)
+
+        with pytest.raises(TaskNotFoundError):
+            self.manager.read_task(1)
+
+    def test_undone_delete_comes_back_at_a_new_version(self):
+        """Test that a version read before a delete is stale after its undo."""
+        self.manager.delete_task(1)
+        self.manager.undo()
+
+        with pytest.raises(VersionConflictError):
+            self.manager.update_task(1, title="Stale", expected_version=1)
+        assert self.manager.get_task(1).version == 2
@@ -0,0 +1,131 @@
+"""Tests for memory-mapped snapshots and the MappedBackend."""
+import os
+import pytest
+from src.todo.history import History
+from src.todo.journal import Journal
+from src.todo.manager import TodoManager
+from src.todo.mapped import MappedBackend, MappedSnapshot, write_mapped_snapshot
+from src.todo.models import Task
+from src.todo.storage import MemoryBackend
+
+
+def sample_tasks():
+    """A few tasks exercising every field, with gaps in the IDs."""
+    return [
+        Task(1, "Write report", "Quarterly numbers"),
+        Task(2, "Café ☕", "", status="completed", priority="high", due="2026-03-01"),
+        Task(5, "Deploy", "to prod", tags="urgent ops", project="web"),
+        Task(9, "Plan", "", tags="later", version=4),
+    ]
+
+
+class TestMappedSnapshot:
+    """Test cases for writing and reading mapped snapshots."""
+
+    def setup_method(self):
+        self.tasks = sample_tasks()
+
+    def open(self, tmp_path, tasks=None, next_id=10):
+        path = str(tmp_path / "tasks.map")
+        write_mapped_snapshot(path, self.tasks if tasks is None else tasks, next_id, seq=7)
+        return MappedSnapshot(path)
+
+    def test_round_trip(self, tmp_path):
+        """Test that every field of every task survives a write and read."""
+        snapshot = self.open(tmp_path)
+        try:
+            assert (len(snapshot), snapshot.next_id, snapshot.seq) == (4, 10, 7)
+            assert [snapshot.get(task.id) for task in self.tasks] == self.tasks
+            assert snapshot.get(3) is None and 3 not in snapshot and 5 in snapshot
+            assert (snapshot.count(), snapshot.count("pending"), snapshot.count("completed")) == (4, 3, 1)
+        finally:
+            snapshot.close()
+
+    def test_pages_are_in_id_order(self, tmp_path):
+        """Test paging from a cursor across page boundaries."""
+        snapshot = self.open(tmp_path, [Task(i, f"Task {i}", "") for i in range(1, 3001)], 3001)
+        try:
+            ids = [task_id for _, page, _ in snapshot.pages(after_id=1500) for task_id in page]
+            assert ids == list(range(1501, 3001))
+        finally:
+            snapshot.close()
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that files that are not snapshots, or unordered input, are refused."""
+        path = tmp_path / "not.map"
+        path.write_bytes(b"x" * 100)
+        with pytest.raises(ValueError):
+            MappedSnapshot(str(path))
+        with pytest.raises(ValueError):
+            write_mapped_snapshot(str(path), [Task(2, "B", ""), Task(1, "A", "")], 3)
+
+
+class TestMappedBackend:
+    """Test cases for a TodoManager served from a mapped snapshot."""
+
+    def setup_method(self):
+        self.history = History()
+
+    def manager(self, tmp_path):
+        path = str(tmp_path / "tasks.map")
+        write_mapped_snapshot(path, sample_tasks(), next_id=10)
+        self.backend = MappedBackend.open(path)
+        return TodoManager(backend=self.backend, history=self.history, lazy_indexes=True)
+
+    def test_tasks_are_built_on_first_lookup(self, tmp_path):
+        """Test that only looked-up tasks are materialized, and kept."""
+        manager = self.manager(tmp_path)
+        assert manager.count() == 4 and not self.backend._live
+        task = manager.get_task(5)
+        assert manager.get_task(5) is task
+        assert list(self.backend._live) == [5]
+        assert manager.add_task("New") == 10
+
+    def test_changes_overlay_the_snapshot(self, tmp_path):
+        """Test updates, status changes, deletes and adds on top of the snapshot."""
+        manager = self.manager(tmp_path)
+        manager.update_task(1, title="Write the report")
+        manager.mark_complete(5)
+        manager.delete_task(9)
+        manager.add_task("New task")
+
+        assert [t.id for t in manager.get_all_tasks()] == [1, 2, 5, 10]
+        assert [t.id for t in manager.get_tasks(status="completed")] == [2, 5]
+        assert manager.stats() == {"total": 4, "pending": 2, "completed": 2}
+        assert manager.get_task(1).title == "Write the report"
+        assert [t.id for t in manager.filter_tasks("completed tag:urgent")] == [5]
+        assert [t.id for t in manager.search("report")] == [1]
+
+        manager.undo()
+        manager.undo()
+        assert [t.id for t in manager.get_all_tasks()] == [1, 2, 5, 9]
+        assert manager.get_task(9).tags == ("later",)
+
+
+def test_journal_restarts_from_a_mapped_snapshot(tmp_path):
+    """Test recovery from a mapped snapshot plus the journal tail, and format switches."""
+    directory = str(tmp_path / "data")
+    manager = TodoManager(journal=Journal(directory, snapshot_format="mapped"))
+    manager.add_tasks([(f"Task {i}", "") for i in range(1, 6)])
+    manager.snapshot()
+    manager.mark_complete(2)
+    manager.delete_task(3)
+    manager.close()
+    assert sorted(os.listdir(directory)) == ["journal.jsonl", "snapshot.map"]
+
+    manager = TodoManager(journal=Journal(directory, snapshot_format="mapped"), lazy_indexes=True)
+    assert isinstance(manager._tasks, MappedBackend)
+    assert [(t.id, t.status) for t in manager.get_all_tasks()] == [
+        (1, "pending"), (2, "completed"), (4, "pending"), (5, "pending")]
+    assert manager.add_task("Task 6") == 6
+    manager.snapshot()
+    manager.close()
+
+    # Switching back to JSON snapshots replaces the mapped one
+    manager = TodoManager(journal=Journal(directory))
+    assert isinstance(manager._tasks, MemoryBackend)
+    assert manager.count() == 5
+    manager.snapshot()
+    manager.close()
+    assert sorted(os.listdir(directory)) == ["journal.jsonl", "snapshot.jsonl"]
+    assert TodoManager(journal=Journal(directory)).count("completed") == 1
@@ -0,0 +1,54 @@
+"""Tests for operation metrics and their TodoManager instrumentation."""
+import pytest
+from src.todo.exceptions import TaskNotFoundError
+from src.todo.manager import TodoManager
+from src.todo.metrics import Metrics, format_metrics
+
+
+class TestMetrics:
+    """Test cases for the Metrics collector."""
+
+    def setup_method(self):
+        """Set up an empty Metrics instance for each test."""
+        self.metrics = Metrics()
+
+    def test_record_and_snapshot(self):
+        """Test that counts, totals and percentiles are derived from recorded calls."""
+        for _ in range(99):
+            self.metrics.record("op", 0.000010)
+        self.metrics.record("op", 0.005)
+
+        stats = self.metrics.snapshot()["op"]
+        assert stats["count"] == 100
+        assert stats["total_ms"] == pytest.approx(5.99)
+        assert stats["p50_us"] == 16
+        assert stats["p99_us"] == 16
+        assert stats["max_us"] == pytest.approx(5000)
+
+    def test_reset(self):
+        """Test that reset discards recorded operations."""
+        self.metrics.record("op", 0.001)
+        self.metrics.reset()
+        assert self.metrics.snapshot() == {}
+        assert format_metrics({}) == ["No operations recorded."]
+
+    def test_instrumented_manager_records_public_methods(self):
+        """Test that every public call is recorded, including ones that raise."""
+        manager = TodoManager(metrics=self.metrics)
+        manager.add_task("Task 1")
+        manager.get_task(1)
+        with pytest.raises(TaskNotFoundError):
+            manager.get_task(2)
+
+        snapshot = self.metrics.snapshot()
+        assert snapshot["add_task"]["count"] == 1
+        assert snapshot["get_task"]["count"] == 2
+        assert manager.metrics is self.metrics
+
+    def test_uninstrumented_manager_is_untouched(self):
+        """Test that instrumenting one manager leaves other instances alone."""
+        TodoManager(metrics=self.metrics)
+        manager = TodoManager()
+
+        assert manager.metrics is None
+        assert "add_task" not in vars(manager)
@@ -0,0 +1,128 @@
+"""Tests for the list query language and planner."""
+from itertools import islice
+
+import pytest
+from src.todo.concurrent import ConcurrentTodoManager
+from src.todo.manager import TodoManager
+from src.todo.models import Priority
+from src.todo.query import parse_query
+from src.todo.sqlite_backend import SQLiteBackend
+
+
+def test_parse_query():
+    """Test that queries parse into conditions, ordering and a limit."""
+    query = parse_query('WHERE status=pending and title~"Deploy API" order by due DESC limit 5')
+
+    assert [(c.field, c.op, c.value) for c in query.conditions] == [
+        ("status", "=", "pending"), ("title", "~", ("api", "deploy"))]
+    assert (query.order, query.descending, query.limit) == ("due", True, 5)
+    assert parse_query("") == parse_query("order by id asc")
+    assert parse_query("where priority>=medium").conditions[0].value is Priority.MEDIUM
+
+
+@pytest.mark.parametrize("text", [
+    "where", "where id", "where id=", "where name=x", "where title<x", "where id=x",
+    "where tag=", "order by size", "order id", "limit -1", "where id=1 or id=2",
+])
+def test_malformed_queries_rejected(text):
+    """Test that malformed queries raise ValueError."""
+    with pytest.raises(ValueError):
+        parse_query(text)
+
+
+class TestQueries:
+    """Test cases for TodoManager.query and explain."""
+
+    def setup_method(self):
+        """Set up 100 tasks: every third deploys, odd IDs are completed."""
+        self.manager = TodoManager()
+        self.manager.add_tasks([(f"Deploy service {i}" if i % 3 == 0 else f"Write docs {i}", "")
+                                for i in range(1, 101)])
+        self.manager.mark_complete_many(range(1, 101, 2))
+        self.manager.tag_task(6, ["urgent"])
+        self.manager.tag_task(9, ["urgent"])
+        self.manager.set_priority(30, "high")
+        self.manager.set_priority(60, "low")
+        self.manager.set_due(60, "2026-03-01")
+        self.manager.set_project(9, "web")
+
+    def ids(self, text):
+        """Run a query and return the IDs it yields."""
+        return [task.id for task in self.manager.query(text)]
+
+    def access(self, text):
+        """Return the access path explain reports for a query."""
+        return self.manager.explain(text)[0]
+
+    def test_results_match_a_full_filter(self):
+        """Test that every access path returns what filtering every task would."""
+        tasks = self.manager.get_all_tasks()
+        pending_deploys = [t.id for t in tasks if t.status == "pending" and t.title.startswith("Deploy")]
+
+        assert self.ids('where status=pending and title~"deploy"') == pending_deploys
+        assert self.ids('where title~"deploy" and status=pending order by id desc') == pending_deploys[::-1]
+        assert self.ids("where id>10 and id<=14 and id!=12") == [11, 13, 14]
+        assert self.ids("where tag=urgent and project=web") == [9]
+        assert self.ids("where tag!=urgent and id<8") == [1, 2, 3, 4, 5, 7]
+        assert self.ids("where status=completed order by id desc limit 3") == [99, 97, 95]
+        assert self.ids("where project=none and id>=99") == [99, 100]
+        assert self.ids("where id>500") == []
+
+    def test_ordering_and_limits(self):
+        """Test ordering by other fields, with and without a limit."""
+        assert self.ids("order by priority desc limit 3") == [30, 60, 100]
+        assert self.ids("where due!=none") == [60]
+        assert self.ids("where due>2026-01-01") == [60]
+        assert self.ids("where id>=59 and id<=61 order by due") == [60, 59, 61]
+        assert self.ids("where id<=4 order by title desc") == [4, 2, 1, 3]
+        assert self.ids("order by id desc limit 2") == [100, 99]
+        assert self.ids("limit 0") == []
+
+    def test_planner_picks_the_cheapest_path(self):
+        """Test the access paths chosen for selective and limited queries."""
+        assert self.access("where id>=10 and id<20").startswith("access:   ID range 10..19 ")
+        assert self.access("where status=pending limit 5").startswith("access:   status partition pending ")
+        assert self.access("where tag=urgent").startswith("access:   bitmap index tag:urgent ")
+        assert self.access('where title~"service 9"').startswith('access:   search index "9 service" ')
+        # Streaming in ID order reaches a limit sooner than reading an index
+        assert self.access("where title~deploy limit 1").startswith("access:   full scan ")
+        assert self.manager.explain("where status=pending order by id desc limit 5")[1:] == [
+            "filter:   status=pending",
+            "order:    id desc, as produced by the access path",
+            "limit:    5, stops reading once 5 tasks match",
+            "rejected: status partition pending (cost ~50)",
+        ]
+
+    def test_queries_are_lazy(self):
+        """Test that a query ordered by ID reads only as far as it is iterated."""
+        results = self.manager.query("where status=pending")
+        assert [task.id for task in islice(results, 2)] == [2, 4]
+        self.manager.delete_task(6)
+        assert next(results).id == 8
+
+    def test_indexes_are_built_only_when_useful(self):
+        """Test that lazily indexed managers plan without their indexes until needed."""
+        manager = TodoManager(lazy_indexes=True)
+        manager.add_tasks([("Deploy api", ""), ("Write docs", "")])
+
+        assert manager.explain("where status=pending")[0].startswith("access:   status partition ")
+        assert not manager._indexed
+        assert [task.id for task in manager.query("where title~deploy")] == [1]
+        assert manager._indexed
+
+
+def test_query_on_other_backends_and_wrappers(tmp_path):
+    """Test queries against SQLite, and through ConcurrentTodoManager."""
+    manager = TodoManager(backend=SQLiteBackend(str(tmp_path / "tasks.db")))
+    manager.add_tasks([(f"Task {i}", "") for i in range(1, 2501)])
+    manager.delete_many(range(1000, 2000))
+
+    # Descending scans step over the deleted IDs a window at a time
+    assert [t.id for t in manager.query("where id>=995 and id<=2001 order by id desc")] == [
+        2001, 2000, 999, 998, 997, 996, 995]
+    assert [t.id for t in manager.query("order by id desc limit 2")] == [2500, 2499]
+
+    wrapped = ConcurrentTodoManager(manager)
+    assert [t.id for t in wrapped.query("where id<3")] == [1, 2]
+    assert wrapped.explain("where id<3")[0].startswith("access:   ID range 1..2 ")
+    manager.close()
@@ -0,0 +1,87 @@
+"""Tests for task formatting and the render cache."""
+import pytest
+from src.todo.history import History
+from src.todo.manager import TodoManager
+from src.todo.models import Task
+from src.todo.render import RenderCache, format_task
+
+
+def test_format_task():
+    """Test the list line of a plain task and of a fully labelled one."""
+    assert format_task(Task(1, "Plain", "")) == "1. [ ] Plain - "
+    task = Task(2, "Ship", "v2", status="completed", priority="high", due="2026-01-31",
+                tags=["web", "urgent"], project="launch")
+    assert format_task(task) == "2. [x] Ship - v2 (priority: high, due: 2026-01-31) @launch #urgent #web"
+
+
+class TestRenderCache:
+    """Test cases for RenderCache."""
+
+    def test_lines_are_cached_and_bounded(self):
+        """Test that lines are reused until evicted, least recently used first."""
+        cache = RenderCache(max_lines=2)
+        first, second, third = Task(1, "One", ""), Task(2, "Two", ""), Task(3, "Three", "")
+        line = cache.line(first)
+        first.title = "Changed without invalidating"
+
+        assert cache.line(first) is line
+        cache.line(second)
+        cache.line(first)
+        cache.line(third)
+        assert len(cache) == 2
+        assert cache.line(first) is line
+        assert cache.line(second) == "2. [ ] Two - "
+
+    def test_pages_are_bounded(self):
+        """Test that only the most recent listings are kept."""
+        cache = RenderCache(max_pages=1)
+        cache.store_page("", "1. [ ] One - ")
+        cache.store_page("limit 1", "1. [ ] One - ")
+
+        assert cache.page("") is None
+        assert cache.page("limit 1") == "1. [ ] One - "
+
+    def test_invalid_sizes_rejected(self):
+        """Test that cache sizes must be positive."""
+        with pytest.raises(ValueError):
+            RenderCache(max_lines=0)
+
+
+class TestInvalidation:
+    """Test that the manager invalidates exactly the tasks it touches."""
+
+    def setup_method(self):
+        """Set up a manager with a render cache and three rendered tasks."""
+        self.cache = RenderCache()
+        self.manager = TodoManager(render_cache=self.cache, history=History())
+        self.manager.add_tasks([("Task 1", ""), ("Task 2", ""), ("Task 3", "")])
+        self.lines = [self.cache.line(task) for task in self.manager.get_all_tasks()]
+        self.cache.store_page("", "\n".join(self.lines))
+
+    def cached(self):
+        """Return which task lines are still the cached objects."""
+        return [self.cache.line(task) is line for task, line in zip(self.manager.get_all_tasks(), self.lines)]
+
+    def test_changes_invalidate_only_their_task(self):
+        """Test that update, complete and delete each drop one line and every page."""
+        self.manager.update_task(2, title="Task two")
+        assert self.cache.page("") is None
+        assert self.cached() == [True, False, True]
+        assert self.cache.line(self.manager.get_task(2)) == "2. [ ] Task two - "
+
+        self.manager.mark_complete(1)
+        assert self.cache.line(self.manager.get_task(1)) == "1. [x] Task 1 - "
+        self.cache.store_page("", "stale")
+        self.manager.delete_task(3)
+        assert self.cache.page("") is None
+        assert 3 not in self.cache._lines
+
+    def test_adds_and_undo_invalidate(self):
+        """Test that new tasks and undone changes drop the cached listings."""
+        self.manager.add_task("Task 4")
+        assert self.cache.page("") is None
+
+        self.manager.set_priority(1, "high")
+        self.cache.line(self.manager.get_task(1))
+        self.manager.undo()
+        assert self.cache.line(self.manager.get_task(1)) == "1. [ ] Task 1 - "
@@ -0,0 +1,178 @@
+"""Tests for log-shipping replication to read replicas."""
+import asyncio
+import pytest
+from src.todo.changes import Change, ChangeFeed
+from src.todo.history import History
+from src.todo.manager import TodoManager
+from src.todo.replication import Replica, ReplicationPrimary
+
+
+def contents(manager):
+    """Every task of a manager as dictionaries, in ID order."""
+    return [task.to_dict() for task in manager.iter_tasks()]
+
+
+async def caught_up(primary, replica, timeout=5.0):
+    """Wait until the replica has applied every change the primary made."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while replica.applied != primary.manager.changes_seq() or replica.epoch != primary.epoch:
+        assert asyncio.get_running_loop().time() < deadline, replica.status()
+        await asyncio.sleep(0.01)
+
+
+def test_apply_change_reproduces_the_primary():
+    """Test that applying a feed's changes rebuilds the same tasks and versions."""
+    primary = TodoManager(changes=ChangeFeed(), history=History())
+    primary.add_tasks([("Task 1", "a"), ("Task 2", "b"), ("Task 3", "")])
+    primary.update_task(1, title="Task one")
+    primary.mark_complete(2)
+    primary.set_priority(3, "high")
+    primary.set_due(3, "2026-01-31")
+    primary.tag_task(1, "urgent")
+    primary.set_project(1, "web")
+    primary.delete_task(3)
+    primary.undo()
+
+    replica = TodoManager()
+    for change in primary.changes_since(0):
+        replica.apply_change(change)
+
+    assert contents(replica) == contents(primary)
+    assert replica.filter_tasks("tag:urgent") == [replica.get_task(1)]
+    assert replica.next_tasks(1)[0].id == 3
+
+
+def test_replace_all_rebuilds_tasks_and_indexes():
+    """Test that replacing every task leaves no trace of the old ones in queries."""
+    manager = TodoManager()
+    manager.add_tasks([("Old report", ""), ("Old docs", "")])
+    manager.tag_task(1, "urgent")
+
+    incoming = TodoManager()
+    incoming.add_tasks([("New report", ""), ("New docs", ""), ("New plan", "")])
+    incoming.tag_task(3, "urgent")
+    manager.replace_all(incoming.iter_tasks())
+
+    assert contents(manager) == contents(incoming)
+    assert manager.search("old") == []
+    assert manager.search("report") == [manager.get_task(1)]
+    assert manager.filter_tasks("tag:urgent") == [manager.get_task(3)]
+    assert manager.next_id == 4
+
+
+class TestReplication:
+    """Test cases for a primary and replicas over local sockets."""
+
+    def setup_method(self):
+        self.primary_manager = TodoManager(changes=ChangeFeed(capacity=8))
+        self.primary_manager.add_tasks([("Existing 1", ""), ("Existing 2", "")])
+
+    def run(self, scenario, **primary_options):
+        """Run scenario(primary) against a started primary."""
+        async def runner():
+            primary = ReplicationPrimary(self.primary_manager, heartbeat_interval=0.01, **primary_options)
+            await primary.start()
+            try:
+                await scenario(primary)
+            finally:
+                await primary.close()
+        asyncio.run(runner())
+
+    def follow(self, primary, **options):
+        """Start a replica of primary, returning it and its task."""
+        replica = Replica(TodoManager(), port=primary.port, retry_interval=0.01, **options)
+        return replica, asyncio.create_task(replica.run())
+
+    def test_snapshot_then_streamed_changes(self):
+        """Test that a new replica loads a snapshot and then follows each change."""
+        async def scenario(primary):
+            replica, follower = self.follow(primary)
+            await caught_up(primary, replica)
+            assert contents(replica.manager) == contents(self.primary_manager)
+
+            manager = self.primary_manager
+            manager.add_task("New task")
+            manager.mark_complete(1)
+            manager.update_task(2, description="edited")
+            await caught_up(primary, replica)
+            await asyncio.sleep(0.05)
+
+            assert contents(replica.manager) == contents(manager)
+            assert replica.manager.search("edited") == [replica.manager.get_task(2)]
+            status = replica.status()
+            assert (status["connected"], status["lag"], status["seconds_behind"]) == (True, 0, 0.0)
+            assert primary.status()["replicas"][0]["lag"] == 0
+            follower.cancel()
+        self.run(scenario)
+
+    def test_long_task_lines_and_divergence(self):
+        """Test that tasks over the default stream limit load, and a diverged replica reloads."""
+        async def scenario(primary):
+            errors = []
+            manager = self.primary_manager
+            manager.update_task(1, description="x" * 200_000)
+            replica, follower = self.follow(primary, on_error=errors.append)
+            await caught_up(primary, replica)
+            assert replica.manager.get_task(1).description == "x" * 200_000
+
+            # A task the replica lost on its own makes the next change to it fail
+            replica.manager.apply_change(Change(0, "delete", 2))
+            manager.mark_complete(2)
+            await caught_up(primary, replica)
+            assert contents(replica.manager) == contents(manager)
+            assert [type(error) for error in errors] == [KeyError]
+            assert replica.status()["resyncs"] == 1
+            follower.cancel()
+        self.run(scenario)
+
+    def test_reconnecting_replica_resumes_or_resynchronizes(self):
+        """Test that a replica resumes after a short outage and reloads after a long one."""
+        async def scenario(primary):
+            replica, follower = self.follow(primary)
+            await caught_up(primary, replica)
+            follower.cancel()
+            manager = self.primary_manager
+
+            manager.add_task("While away")
+            follower = asyncio.create_task(replica.run())
+            await caught_up(primary, replica)
+            assert replica.manager.get_task(3).title == "While away"
+            follower.cancel()
+
+            # More changes than the feed holds, including a delete
+            manager.delete_task(1)
+            manager.add_tasks([(f"Bulk {i}", "") for i in range(10)])
+            follower = asyncio.create_task(replica.run())
+            await caught_up(primary, replica)
+            assert contents(replica.manager) == contents(manager)
+            follower.cancel()
+        self.run(scenario)
+
+    def test_replica_of_a_restarted_primary_reloads(self, tmp_path):
+        """Test that a new epoch makes the replica reload, over a Unix socket."""
+        path = str(tmp_path / "replication.sock")
+
+        async def scenario():
+            first = ReplicationPrimary(self.primary_manager, path=path, heartbeat_interval=0.01)
+            await first.start()
+            replica = Replica(TodoManager(), path=path, retry_interval=0.01)
+            follower = asyncio.create_task(replica.run())
+            await caught_up(first, replica)
+            await first.close()
+
+            restarted = TodoManager(changes=ChangeFeed())
+            restarted.add_task("Only task")
+            second = ReplicationPrimary(restarted, path=path, heartbeat_interval=0.01)
+            await second.start()
+            try:
+                await caught_up(second, replica)
+                assert [task.title for task in replica.manager.iter_tasks()] == ["Only task"]
+            finally:
+                follower.cancel()
+                await second.close()
+        asyncio.run(scenario())
+
+    def test_primary_requires_a_change_feed(self):
+        """Test that only a manager with a change feed can be replicated."""
+        with pytest.raises(ValueError):
+            ReplicationPrimary(TodoManager())
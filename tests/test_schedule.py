@@ -0,0 +1,111 @@
+"""Tests for task priorities, due dates and the "next up" queries."""
+from datetime import date
+import pytest
+from src.todo.exceptions import TaskNotFoundError
+from src.todo.history import History
+from src.todo.journal import Journal
+from src.todo.manager import TodoManager
+from src.todo.models import Priority, Task
+
+
+class TestSchedule:
+    """Test cases for priority and due-date handling in the TodoManager."""
+
+    def setup_method(self):
+        """Set up a fresh TodoManager instance for each test."""
+        self.manager = TodoManager(history=History())
+
+    def ids(self, tasks):
+        return [task.id for task in tasks]
+
+    def test_task_validates_priority_and_due(self):
+        """Test that priorities and due dates are normalized and validated."""
+        task = Task(id=1, title="Task", description="", priority="high", due="2026-03-01")
+        assert task.priority is Priority.HIGH
+        assert task.due == date(2026, 3, 1)
+        assert Task.from_dict(task.to_dict()) == task
+
+        with pytest.raises(ValueError):
+            Task(id=1, title="Task", description="", priority=7)
+        with pytest.raises(ValueError):
+            Task(id=1, title="Task", description="", due="next week")
+
+    def test_next_tasks_ranks_by_priority_then_due_then_id(self):
+        """Test the next-up ordering, with plain tasks last in ID order."""
+        self.manager.add_task("Plain 1")
+        self.manager.add_task("Low", priority="low")
+        self.manager.add_task("High late", priority="high", due="2026-05-01")
+        self.manager.add_task("Plain 2")
+        self.manager.add_task("High early", priority="high", due="2026-04-01")
+        self.manager.add_task("Due only", due="2026-01-01")
+
+        assert self.ids(self.manager.next_tasks(10)) == [5, 3, 2, 6, 1, 4]
+        assert self.ids(self.manager.next_tasks(2)) == [5, 3]
+        assert self.manager.next_tasks(0) == []
+
+    def test_next_tasks_follow_changes(self):
+        """Test that completing, deleting and re-prioritizing tasks updates the ranking."""
+        for i in range(5):
+            self.manager.add_task(f"Task {i}", priority=i % 4)
+        self.manager.mark_complete(4)
+        self.manager.delete_task(3)
+        self.manager.set_priority(1, "high")
+        self.manager.set_priority(2, "none")
+
+        assert self.ids(self.manager.next_tasks(5)) == [1, 2, 5]
+        self.manager.undo()
+        self.manager.undo()
+        assert self.ids(self.manager.next_tasks(5)) == [2, 1, 5]
+
+    def test_repeated_reprioritizing_keeps_results_unique(self):
+        """Test that stale heap entries never produce duplicates."""
+        self.manager.add_task("Task 1", priority="low")
+        self.manager.add_task("Task 2", priority="medium")
+        for _ in range(200):
+            self.manager.set_priority(1, "high")
+            self.manager.set_priority(1, "low")
+
+        assert self.ids(self.manager.next_tasks(5)) == [2, 1]
+
+    def test_overdue_and_due_between(self):
+        """Test due-date range queries over pending tasks."""
+        self.manager.add_task("Old", due="2026-01-10")
+        self.manager.add_task("Older", due="2026-01-05")
+        self.manager.add_task("Future", due="2026-02-01")
+        self.manager.add_task("Done", due="2026-01-01")
+        self.manager.mark_complete(4)
+        self.manager.set_due(1, "2026-01-03")
+
+        assert self.ids(self.manager.overdue(date(2026, 1, 10))) == [1, 2]
+        assert self.ids(self.manager.due_between("2026-01-05", "2026-02-01")) == [2, 3]
+        self.manager.set_due(2, None)
+        assert self.ids(self.manager.overdue("2026-12-31")) == [1, 3]
+        with pytest.raises(ValueError):
+            self.manager.due_between("2026-01-01", None)
+
+    def test_unknown_task(self):
+        """Test that scheduling an unknown task raises TaskNotFoundError."""
+        with pytest.raises(TaskNotFoundError):
+            self.manager.set_priority(9, "high")
+
+    def test_schedule_survives_restart(self, tmp_path):
+        """Test that priorities and due dates are journaled and re-indexed on recovery."""
+        manager = TodoManager(journal=Journal(str(tmp_path)))
+        manager.add_task("Task 1", due="2026-01-01")
+        manager.add_task("Task 2")
+        manager.set_priority(2, "high")
+        manager.close()
+
+        recovered = TodoManager(journal=Journal(str(tmp_path)))
+        assert self.ids(recovered.next_tasks(2)) == [2, 1]
+        assert self.ids(recovered.overdue("2026-06-01")) == [1]
+
+    def test_bulk_add_with_schedule_fields(self):
+        """Test that add_tasks accepts and validates priority and due fields."""
+        self.manager.add_tasks([
+            {"title": "Task 1", "priority": "2", "due": "2026-01-01"},
+            {"title": "Task 2", "priority": 3},
+        ])
+        assert self.ids(self.manager.next_tasks(2)) == [2, 1]
+        with pytest.raises(Exception):
+            self.manager.add_tasks([{"title": "Task 3", "due": "someday"}])
@@ -0,0 +1,86 @@
+"""Tests for the full-text search index."""
+import pytest
+from src.todo.manager import TodoManager
+from src.todo.search import SearchIndex, tokenize
+
+
+def test_tokenize_case_folds_and_splits():
+    """Test that tokenize lowercases text and splits on non-word characters."""
+    assert tokenize("Deploy the API, then re-test!") == {"deploy", "the", "api", "then", "re", "test"}
+
+
+class TestSearchIndex:
+    """Test cases for the SearchIndex class."""
+
+    def setup_method(self):
+        """Set up an index with a few documents."""
+        self.index = SearchIndex()
+        self.index.add(1, "Deploy backend", "Roll out the API")
+        self.index.add(2, "Write docs", "Deployment guide")
+        self.index.add(3, "Fix login bug", "")
+
+    def test_prefix_matching(self):
+        """Test that terms match word prefixes in titles and descriptions."""
+        assert self.index.search("dep") == [1, 2]
+        assert self.index.search("DEPLOYMENT") == [2]
+        assert self.index.search("api") == [1]
+
+    def test_all_terms_must_match(self):
+        """Test that multi-term queries intersect their matches."""
+        assert self.index.search("deploy api") == [1]
+        assert self.index.search("deploy login") == []
+
+    def test_limit(self):
+        """Test that limit returns the lowest matching IDs."""
+        assert self.index.search("d", limit=1) == [1]
+
+    def test_update_and_remove(self):
+        """Test that re-indexed and removed documents stop matching."""
+        self.index.update(1, "Deploy frontend", "")
+        self.index.remove(2)
+
+        assert self.index.search("api") == []
+        assert self.index.search("front") == [1]
+        assert self.index.search("dep") == [1]
+        assert len(self.index) == 2
+
+    def test_vocabulary_merge_keeps_results(self):
+        """Test that results are unchanged once new tokens are merged."""
+        for i in range(4, 2000):
+            self.index.add(i, f"word{i}")
+        self.index.remove(3)
+        self.index.add(3, "Fix login bug again")
+
+        assert self.index.search("word1999") == [1999]
+        assert self.index.search("login") == [3]
+        assert self.index.search("login") == [3]
+
+    def test_empty_query(self):
+        """Test that a query without terms matches nothing."""
+        assert self.index.search("  ,, ") == []
+
+
+class TestManagerSearch:
+    """Test cases for TodoManager.search."""
+
+    def setup_method(self):
+        """Set up a TodoManager with a few tasks."""
+        self.manager = TodoManager()
+        self.manager.add_task("Deploy backend", "Roll out the API")
+        self.manager.add_task("Write docs", "Deployment guide")
+
+    def test_search_tracks_mutations(self):
+        """Test that the index follows add, update, and delete."""
+        assert [t.id for t in self.manager.search("deploy")] == [1, 2]
+
+        self.manager.update_task(2, title="Write notes", description="")
+        assert [t.id for t in self.manager.search("deploy")] == [1]
+
+        self.manager.delete_task(1)
+        assert self.manager.search("deploy") == []
+        assert [t.id for t in self.manager.search("notes")] == [2]
+
+    def test_search_negative_limit_error(self):
+        """Test that a negative limit raises ValueError."""
+        with pytest.raises(ValueError):
+            self.manager.search("deploy", limit=-1)
@@ -0,0 +1,222 @@
+"""Tests for the asyncio HTTP/JSON service."""
+import asyncio
+import json
+from src.todo.archive import ColdStore
+from src.todo.changes import ChangeFeed
+from src.todo.manager import TodoManager
+from src.todo.replication import Replica, ReplicationPrimary
+from src.todo.server import TodoServer
+
+
+async def start_server():
+    """Start a server on a free port and return it."""
+    server = TodoServer(TodoManager(), port=0)
+    await server.start()
+    return server
+
+
+async def send(port, raw: bytes, responses: int = 1):
+    """Send raw bytes on one connection and read `responses` responses."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    results = []
+    for _ in range(responses):
+        head = (await reader.readuntil(b"\r\n\r\n")).decode()
+        status = int(head.split(" ")[1])
+        length = int(head.lower().split("content-length: ")[1].split("\r\n")[0])
+        body = await reader.readexactly(length)
+        results.append((status, json.loads(body) if body else None, head))
+    writer.close()
+    await writer.wait_closed()
+    return results
+
+
+def request(method, path, body=None, close=False):
+    """Format an HTTP/1.1 request."""
+    data = b"" if body is None else json.dumps(body).encode()
+    connection = "Connection: close\r\n" if close else ""
+    return (f"{method} {path} HTTP/1.1\r\nHost: test\r\n{connection}"
+            f"Content-Length: {len(data)}\r\n\r\n").encode() + data
+
+
+def run(coroutine_fn):
+    """Run a test coroutine against a fresh server."""
+    async def runner():
+        server = await start_server()
+        try:
+            await coroutine_fn(server)
+        finally:
+            await server.close()
+    asyncio.run(runner())
+
+
+def test_crud_over_keep_alive_connection():
+    """Test the task endpoints over a single pipelined keep-alive connection."""
+    async def scenario(server):
+        raw = b"".join([
+            request("POST", "/tasks", {"title": "Task 1", "description": "Description 1"}),
+            request("POST", "/tasks", {"title": "Task 2"}),
+            request("PATCH", "/tasks/1", {"title": "Updated Task 1"}),
+            request("POST", "/tasks/2/complete"),
+            request("GET", "/tasks?status=completed"),
+            request("DELETE", "/tasks/1"),
+            request("GET", "/stats", close=True),
+        ])
+        results = await send(server.port, raw, responses=7)
+        statuses = [status for status, _, _ in results]
+
+        assert statuses == [201, 201, 200, 200, 200, 204, 200]
+        assert results[0][1]["id"] == 1
+        assert results[2][1]["title"] == "Updated Task 1"
+        assert [t["id"] for t in results[4][1]] == [2]
+        assert results[6][1] == {"total": 1, "pending": 0, "completed": 1}
+        assert "Connection: keep-alive" in results[0][2]
+        assert "Connection: close" in results[6][2]
+
+    run(scenario)
+
+
+def test_errors():
+    """Test error statuses for unknown tasks, bad input, and bad routes."""
+    async def scenario(server):
+        raw = b"".join([
+            request("GET", "/tasks/99"),
+            request("POST", "/tasks", {"title": "  "}),
+            request("POST", "/tasks", {"description": "no title"}),
+            request("PUT", "/tasks"),
+            request("GET", "/nowhere"),
+            request("GET", "/tasks?status=archived", close=True),
+        ])
+        results = await send(server.port, raw, responses=6)
+
+        assert [status for status, _, _ in results] == [404, 400, 400, 405, 404, 400]
+        assert results[0][1] == {"error": "Task with ID 99 not found"}
+
+    run(scenario)
+
+
+def test_conditional_updates():
+    """Test that stale expected versions are answered with 409 Conflict."""
+    async def scenario(server):
+        raw = b"".join([
+            request("POST", "/tasks", {"title": "Task 1"}),
+            request("PATCH", "/tasks/1", {"title": "Task 1 again", "expected_version": 1}),
+            request("PATCH", "/tasks/1", {"title": "Lost update", "expected_version": 1}),
+            request("POST", "/tasks/1/complete", {"expected_version": 1}),
+            request("POST", "/tasks/1/complete", {"expected_version": "2"}),
+            request("POST", "/tasks/1/complete", {"expected_version": 2}, close=True),
+        ])
+        results = await send(server.port, raw, responses=6)
+
+        assert [status for status, _, _ in results] == [201, 200, 409, 409, 400, 200]
+        assert results[0][1]["version"] == 1
+        assert results[2][1]["version"] == 2
+        assert (results[5][1]["status"], results[5][1]["version"]) == ("completed", 3)
+
+    run(scenario)
+
+
+def test_batch_and_search():
+    """Test the batch endpoint and search."""
+    async def scenario(server):
+        batch = [
+            {"method": "POST", "path": "/tasks", "body": {"title": "Deploy backend"}},
+            {"method": "POST", "path": "/tasks", "body": {"title": "Write docs"}},
+            {"method": "GET", "path": "/tasks/7"},
+            {"method": "POST", "path": "/batch", "body": []},
+            {"method": 1, "path": "/tasks"},
+            {"method": "GET", "path": None},
+            {"method": "GET"},
+            "GET /tasks",
+        ]
+        raw = request("POST", "/batch", batch) + request("GET", "/search?q=depl", close=True)
+        (status, results, _), (_, found, _) = await send(server.port, raw, responses=2)
+
+        assert status == 200
+        assert [r["status"] for r in results] == [201, 201, 404, 400, 400, 400, 400, 400]
+        assert [t["title"] for t in found] == ["Deploy backend"]
+
+    run(scenario)
+
+
+def test_malformed_json_closes_connection():
+    """Test that an invalid body gets a 400 and the connection is closed."""
+    async def scenario(server):
+        raw = b"POST /tasks HTTP/1.1\r\nContent-Length: 3\r\n\r\n{x}"
+        (status, body, head), = await send(server.port, raw)
+
+        assert status == 400
+        assert body == {"error": "Body must be valid JSON"}
+        assert "Connection: close" in head
+
+    run(scenario)
+
+
+def test_changes_endpoint():
+    """Test reading the change feed, including an expired cursor."""
+    server = TodoServer(TodoManager(changes=ChangeFeed(capacity=3)))
+    server.dispatch("POST", "/tasks", {"title": "Task 1"})
+    server.dispatch("POST", "/tasks/1/complete", None)
+
+    status, payload = server.dispatch("GET", "/changes?since=0", None)
+    assert status == 200
+    assert payload["seq"] == 2
+    assert [(c["seq"], c["op"], c["id"]) for c in payload["changes"]] == [(1, "add", 1), (2, "complete", 1)]
+
+    server.dispatch("DELETE", "/tasks/1", None)
+    server.dispatch("POST", "/tasks", {"title": "Task 2"})
+    status, payload = server.dispatch("GET", "/changes?since=0", None)
+    assert status == 410
+    assert payload["oldest"] == 2
+    assert server.dispatch("GET", "/changes?since=4", None)[1] == {"seq": 4, "changes": []}
+
+
+def test_background_archiver(tmp_path):
+    """Test that the server archives old completed tasks and still serves them."""
+    async def scenario():
+        manager = TodoManager(archive=ColdStore(str(tmp_path)))
+        manager.add_tasks([("Task 1", ""), ("Task 2", "")])
+        manager.mark_complete(1)
+        server = TodoServer(manager, port=0, archive_after=0)
+        await server.start()
+        try:
+            await asyncio.sleep(0)
+            raw = request("GET", "/stats") + request("GET", "/tasks/1", close=True)
+            results = await send(server.port, raw, responses=2)
+        finally:
+            await server.close()
+
+        assert results[0][1] == {"total": 1, "pending": 1, "completed": 0, "archived": 1}
+        assert results[1][1]["status"] == "completed"
+
+    asyncio.run(scenario())
+
+
+def test_replica_is_read_only():
+    """Test that a replica server serves replicated reads and status, and rejects writes."""
+    async def scenario():
+        manager = TodoManager(changes=ChangeFeed())
+        manager.add_tasks([("Task 1", ""), ("Task 2", "")])
+        primary = ReplicationPrimary(manager, heartbeat_interval=0.01)
+        await primary.start()
+        replica = Replica(TodoManager(), port=primary.port, retry_interval=0.01)
+        server = TodoServer(replica.manager, port=0, replica=replica)
+        await server.start()
+        try:
+            while replica.applied != manager.changes_seq() or replica.epoch != primary.epoch:
+                await asyncio.sleep(0.01)
+            raw = (request("GET", "/tasks/2") + request("POST", "/tasks", {"title": "No"})
+                   + request("POST", "/batch", [{"method": "DELETE", "path": "/tasks/1"}])
+                   + request("GET", "/replication", close=True))
+            results = await send(server.port, raw, responses=4)
+        finally:
+            await server.close()
+            await primary.close()
+
+        assert results[0][1]["title"] == "Task 2"
+        assert results[1][0] == 403
+        assert results[2][1][0]["status"] == 403
+        assert (results[3][1]["role"], results[3][1]["applied"]) == ("replica", manager.changes_seq())
+
+    asyncio.run(scenario())
@@ -0,0 +1,79 @@
+"""Tests for the multi-process ShardedTodoManager."""
+import pytest
+from src.todo.exceptions import TaskNotFoundError
+from src.todo.sharded import ShardedTodoManager, shard_for
+
+
+class TestShardedTodoManager:
+    """Test cases for the ShardedTodoManager class."""
+
+    def setup_method(self):
+        """Start a two-shard manager for each test."""
+        self.manager = ShardedTodoManager(shards=2)
+
+    def teardown_method(self):
+        """Stop the worker processes."""
+        self.manager.close()
+
+    def test_tenants_have_separate_lists(self):
+        """Test that each tenant gets its own tasks and IDs."""
+        assert self.manager.call("alice", "add_task", "Buy milk") == 1
+        assert self.manager.call("bob", "add_task", "Fix bike") == 1
+        self.manager.call("alice", "add_task", "Call mom")
+
+        assert [t.title for t in self.manager.call("alice", "get_all_tasks")] == ["Buy milk", "Call mom"]
+        assert self.manager.call("bob", "get_task", 1).title == "Fix bike"
+        with pytest.raises(TaskNotFoundError) as error:
+            self.manager.call("bob", "get_task", 2)
+        assert error.value.task_id == 2
+
+    def test_batch_preserves_order_and_isolates_errors(self):
+        """Test that batch results come back in request order, with errors in place."""
+        tenants = [f"user{i}" for i in range(8)]
+        assert len({shard_for(tenant, 2) for tenant in tenants}) == 2
+
+        results = self.manager.batch([(tenant, "add_task", (f"Task for {tenant}",)) for tenant in tenants])
+        assert results == [1] * 8
+        results = self.manager.batch([
+            ("user0", "mark_complete", (1,)),
+            ("user1", "delete_task", (5,)),
+            ("user2", "get_tasks", (), {"status": "pending"}),
+        ])
+        assert results[0] is True
+        assert isinstance(results[1], TaskNotFoundError)
+        assert [t.title for t in results[2]] == ["Task for user2"]
+
+    def test_scatter_gather_queries(self):
+        """Test that counts and stats are combined across every shard."""
+        self.manager.batch([(f"user{i}", "add_tasks", ([(f"Task {j}", "") for j in range(i + 1)],))
+                            for i in range(6)])
+        self.manager.call("user3", "mark_complete_many", [1, 2])
+
+        assert self.manager.count() == 21
+        assert self.manager.count("completed") == 2
+        assert self.manager.stats()["pending"] == 19
+        assert self.manager.tenants() == [f"user{i}" for i in range(6)]
+        assert self.manager.gather("count", "completed")["user3"] == 2
+
+    def test_invalid_requests_are_rejected_before_sending(self):
+        """Test that bad tenant keys and unsupported methods raise ValueError."""
+        with pytest.raises(ValueError):
+            self.manager.call("../etc", "add_task", "Task")
+        with pytest.raises(ValueError):
+            self.manager.batch([("alice", "add_task", ("Task",)), ("alice", "subscribe", (print,))])
+        assert self.manager.count() == 0
+
+
+def test_journaled_tenants_are_reopened(tmp_path):
+    """Test that journaled tenants are recovered by the shard that owns them."""
+    manager = ShardedTodoManager(shards=3, journal_dir=str(tmp_path))
+    for tenant in ("alice", "bob", "carol"):
+        manager.call(tenant, "add_task", f"Task for {tenant}")
+    manager.close()
+
+    manager = ShardedTodoManager(shards=3, journal_dir=str(tmp_path))
+    try:
+        assert manager.tenants() == ["alice", "bob", "carol"]
+        assert manager.call("bob", "get_task", 1).title == "Task for bob"
+    finally:
+        manager.close()
@@ -0,0 +1,164 @@
+"""Tests for the storage backends behind TodoManager."""
+import pytest
+from src.todo.exceptions import BulkOperationError, TaskNotFoundError
+from src.todo.manager import TodoManager
+from src.todo.mapped import MappedBackend, write_mapped_snapshot
+from src.todo.sqlite_backend import SQLiteBackend
+from src.todo.storage import MemoryBackend, StorageBackend
+
+
+@pytest.fixture(params=["memory", "sqlite", "mapped"])
+def backend(request, tmp_path):
+    """Each backend implementation, freshly created."""
+    if request.param == "memory":
+        backend = MemoryBackend()
+    elif request.param == "sqlite":
+        backend = SQLiteBackend(str(tmp_path / "tasks.db"))
+    else:
+        write_mapped_snapshot(str(tmp_path / "tasks.map"), [], next_id=1)
+        backend = MappedBackend.open(str(tmp_path / "tasks.map"))
+    yield backend
+    backend.close()
+
+
+def test_backends_implement_protocol(backend):
+    """Test that every backend satisfies the StorageBackend protocol."""
+    assert isinstance(backend, StorageBackend)
+
+
+def test_manager_operations(backend):
+    """Test the core manager operations against each backend."""
+    manager = TodoManager(backend=backend)
+    manager.add_task("Task 1", "Description 1")
+    manager.add_tasks([("Task 2", ""), ("Task 3", ""), ("Task 4", "")])
+    manager.update_task(1, title="Updated Task 1")
+    manager.mark_complete(2)
+    manager.mark_complete_many([3])
+    manager.delete_task(4)
+
+    assert manager.get_task(1).title == "Updated Task 1"
+    assert manager.stats() == {"total": 3, "pending": 1, "completed": 2}
+    assert [t.id for t in manager.get_tasks(status="completed")] == [2, 3]
+    assert [t.id for t in manager.get_tasks(offset=1, limit=1)] == [2]
+    assert [t.id for t in manager.get_tasks(after_id=1)] == [2, 3]
+    assert [t.id for t in manager.search("updated")] == [1]
+    with pytest.raises(TaskNotFoundError):
+        manager.get_task(4)
+
+
+def test_bulk_failure_leaves_backend_untouched(backend):
+    """Test that a rejected batch writes nothing."""
+    manager = TodoManager(backend=backend)
+    manager.add_tasks([("Task 1", ""), ("Task 2", "")])
+
+    with pytest.raises(BulkOperationError):
+        manager.delete_many([1, 2, 3])
+
+    assert manager.count() == 2
+
+
+def test_scan_pages_across_page_boundaries(backend):
+    """Test ordered scans that span several internal pages."""
+    manager = TodoManager(backend=backend)
+    manager.add_tasks([(f"Task {i}", "") for i in range(2500)])
+    manager.delete_many(range(1, 2501, 2))
+
+    ids = [t.id for t in manager.iter_tasks()]
+    assert ids == list(range(2, 2501, 2))
+    assert [t.id for t in manager.get_tasks(after_id=2000, limit=3)] == [2002, 2004, 2006]
+
+
+def test_status_scans_after_out_of_order_completion(backend):
+    """Test status counts and ordered status scans when tasks complete out of order."""
+    manager = TodoManager(backend=backend)
+    manager.add_tasks([(f"Task {i}", "") for i in range(100)])
+    manager.mark_complete_many([50, 7, 90, 3])
+    manager.delete_many([7, 8])
+    manager.mark_complete(1)
+
+    assert manager.count("completed") == 4
+    assert manager.count("pending") == 94
+    assert [t.id for t in manager.get_tasks(status="completed")] == [1, 3, 50, 90]
+    assert [t.id for t in manager.get_tasks(status="completed", after_id=3, limit=1)] == [50]
+
+
+def test_schedule_fields_round_trip(backend):
+    """Test that priorities and due dates are stored and updated by the backend."""
+    manager = TodoManager(backend=backend)
+    manager.add_task("Task 1", priority="high", due="2026-01-01")
+    manager.add_task("Task 2")
+    manager.set_due(2, "2026-02-01")
+    manager.set_priority(1, "low")
+
+    task1, task2 = manager.get_all_tasks()
+    assert (task1.priority, str(task1.due)) == (1, "2026-01-01")
+    assert str(task2.due) == "2026-02-01"
+
+
+def test_labels_round_trip(backend):
+    """Test that tags and projects are stored and updated by the backend."""
+    manager = TodoManager(backend=backend)
+    manager.add_task("Task 1", tags="b a", project="web")
+    manager.add_task("Task 2")
+    manager.tag_task(2, "urgent")
+    manager.set_project(1, None)
+
+    task1, task2 = manager.get_all_tasks()
+    assert (task1.tags, task1.project) == (("a", "b"), "")
+    assert (task2.tags, task2.project) == (("urgent",), "")
+
+
+def test_versions_round_trip(backend):
+    """Test that task versions are stored and updated by the backend."""
+    manager = TodoManager(backend=backend)
+    manager.add_task("Task 1")
+    manager.update_task(1, title="Task 1 again")
+    manager.mark_complete(1)
+
+    assert manager.get_task(1).version == 3
+    assert manager.get_all_tasks()[0].version == 3
+
+
+def test_sqlite_backend_persists_across_reopen(tmp_path):
+    """Test that tasks and the ID counter survive reopening the database."""
+    path = str(tmp_path / "tasks.db")
+    manager = TodoManager(backend=SQLiteBackend(path))
+    manager.add_tasks([("Task 1", "Description 1"), ("Task 2", "")])
+    manager.mark_complete(1)
+    manager.delete_task(2)
+    manager.close()
+
+    reopened = TodoManager(backend=SQLiteBackend(path))
+    assert reopened.get_task(1).status == "completed"
+    assert [t.id for t in reopened.search("description")] == [1]
+    assert reopened.add_task("Task 3", priority="high") == 3
+    assert [t.id for t in reopened.next_tasks(1)] == [3]
+    reopened.close()
+
+
+def test_search_without_index_scans_backend():
+    """Test that search still works with the in-memory index disabled."""
+    manager = TodoManager(search_index=False)
+    manager.add_tasks([("Deploy backend", ""), ("Write docs", "deployment notes")])
+
+    assert [t.id for t in manager.search("depl")] == [1, 2]
+    assert [t.id for t in manager.search("deploy docs")] == [2]
+    assert [t.id for t in manager.search("depl", limit=1)] == [1]
+
+
+def test_memory_backend_compacts_after_mass_deletes():
+    """Test that deleting most tasks copies the dicts and keeps scans correct."""
+    backend = MemoryBackend()
+    manager = TodoManager(backend=backend)
+    manager.add_tasks([(f"Task {i}", "") for i in range(200)])
+    manager.mark_complete_many(range(1, 101))
+    tasks = backend._tasks
+    pages = backend.scan(limit=None)
+    first = next(pages)
+
+    manager.delete_many(range(2, 181))
+
+    assert backend._tasks is not tasks
+    assert [first.id] + [task.id for task in pages] == [1] + list(range(181, 201))
+    assert manager.stats() == {"total": 21, "pending": 20, "completed": 1}
+    assert [t.id for t in manager.search("task")] == [1] + list(range(181, 201))
@@ -0,0 +1,82 @@
+"""Tests for streaming bulk import and export."""
+import pytest
+from src.todo.exceptions import BulkOperationError
+from src.todo.manager import TodoManager
+from src.todo.transfer import chunked, resolve_format
+
+
+def test_resolve_format():
+    """Test that formats are inferred from extensions and validated."""
+    assert resolve_format("tasks.CSV") == "csv"
+    assert resolve_format("tasks.ndjson") == "jsonl"
+    assert resolve_format("tasks.txt", "jsonl") == "jsonl"
+    with pytest.raises(ValueError):
+        resolve_format("tasks.txt")
+    with pytest.raises(ValueError):
+        resolve_format("tasks.csv", "xml")
+
+
+def test_chunked():
+    """Test that chunked splits an iterable into bounded lists."""
+    assert list(chunked(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+
+
+@pytest.mark.parametrize("filename", ["tasks.csv", "tasks.jsonl"])
+def test_export_import_round_trip(tmp_path, filename):
+    """Test that exported tasks import back with titles, descriptions, and status."""
+    source = TodoManager()
+    source.add_task("Task 1", "Description, with comma")
+    source.add_task("Task 2", 'Quoted "text"\nand a newline')
+    source.add_task("Task 3")
+    source.mark_complete(2)
+    source.delete_task(3)
+    path = str(tmp_path / filename)
+
+    assert source.export_tasks(path) == 2
+
+    target = TodoManager()
+    target.add_task("Existing task")
+    assert target.import_tasks(path, chunk_size=1) == 2
+
+    tasks = target.get_all_tasks()
+    assert [t.id for t in tasks] == [1, 2, 3]
+    assert tasks[1].description == "Description, with comma"
+    assert tasks[2].description == 'Quoted "text"\nand a newline'
+    assert tasks[2].status == "completed"
+    assert target.count(status="completed") == 1
+
+
+def test_import_reports_invalid_rows(tmp_path):
+    """Test that invalid rows are reported by row number, per chunk."""
+    path = tmp_path / "tasks.jsonl"
+    path.write_text(
+        '{"title": "Task 1"}\n'
+        '{"title": "Task 2"}\n'
+        '{"title": "   "}\n'
+        '{"title": "Task 4", "status": "archived"}\n'
+    )
+    manager = TodoManager()
+
+    with pytest.raises(BulkOperationError) as excinfo:
+        manager.import_tasks(str(path), chunk_size=2)
+
+    assert set(excinfo.value.errors) == {3, 4}
+    # The first chunk was valid and stays imported
+    assert manager.count() == 2
+    assert excinfo.value.applied == 2
+
+
+def test_import_failure_counts_rows_of_the_whole_file(tmp_path):
+    """Test that a failure in a later chunk reports every row and what was imported."""
+    path = tmp_path / "tasks.jsonl"
+    rows = [f'{{"title": "Task {i}"}}' for i in range(1, 6)] + ['{"title": ""}', '{"title": "Task 7"}']
+    path.write_text("\n".join(rows) + "\n")
+    manager = TodoManager()
+
+    with pytest.raises(BulkOperationError) as excinfo:
+        manager.import_tasks(str(path), chunk_size=2)
+
+    error = excinfo.value
+    assert (set(error.errors), error.total, error.applied) == ({6}, 7, 4)
+    assert str(error) == "1 of 7 items failed; 4 were already applied"
+    assert manager.count() == 4